@@ -1,14 +1,11 @@
 import streamlit as st
 st.set_page_config(page_title="Dashboard de Fraudes", layout="wide", initial_sidebar_state="expanded")
 
+import hmac
+import importlib
 import os
 import sys
-import pandas as pd
-import sqlite3
-from PIL import Image
-import base64
 import traceback
-import gc
 import warnings
 
 # Suprimir warnings para melhor performance
@@ -18,14 +15,31 @@ warnings.filterwarnings('ignore', category=DeprecationWarning)
 # Adicionar o diretório atual ao path para importar módulos personalizados
 sys.path.append(os.path.dirname(__file__))
 
-# Define o caminho dinâmico para o banco de dados
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# Subir um nível para acessar a pasta Database na raiz do projeto
-PROJECT_ROOT = os.path.dirname(BASE_DIR)
-DB_PATH = os.path.join(PROJECT_ROOT, "Database", "walmart_fraudes.db")
+# Caminho do banco e modo de carregamento definidos em config/settings.py
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from config.settings import ADMIN_KEY, DB_PATH, LOAD_MODE, STREAMING_CHUNK_SIZE, SNAPSHOTS_ENABLED
 
 # Importar configurações de estilo
 from config.style_config import apply_style, get_custom_css
+from utils.aggregations import build_dashboard_frames
+from utils.streaming import stream_dashboard_frames
+from utils.summaries import (build_cube_frames_from_summaries, build_dashboard_frames_from_summaries,
+                             summaries_are_current, summaries_available)
+from utils.snapshots import db_content_version, load_snapshot, write_snapshot, prune_snapshots
+from utils.dtypes import apply_frame_schemas
+from utils.database import get_pool
+from utils.backends import get_backend
+from utils.cube import build_cube_frames
+from utils.filters import apply_global_filters
+from utils.datasets import with_version
+from utils.refresh import RefreshManager, session_view
+from utils.warmup import start_warmup
+from utils.perf import timed
+from utils.profiler import profile_run
+from utils.memory import start_memory_tracking
+from pages import ADMIN_PAGE, PAGES
+from pages.admin import show_profile_result
 st.markdown(
     """
     <style>
@@ -53,160 +67,118 @@ if 'category_filter' not in st.session_state:
 if 'region_filter' not in st.session_state:
     st.session_state['region_filter'] = "Todas"
 
-# Função para carregar dados - SUPER OTIMIZADA
-@st.cache_data(ttl=600, show_spinner=False)  # Cache por 10 minutos, sem spinner
+@st.cache_resource(show_spinner=False)
+def get_data_manager():
+    """
+    Retorna o gerenciador dos dados, compartilhado por todas as sessões.
+    
+    Returns:
+        RefreshManager que recarrega os dados quando o banco muda
+    """
+    # A versão identifica os DataFrames nos caches das páginas (ver utils/datasets.py)
+    return RefreshManager(
+        loader=load_version,
+        version_fn=lambda: db_content_version(DB_PATH, extra=LOAD_MODE)
+    )
+
+def load_version(version):
+    """
+    Carrega os dados de uma versão do banco para o RefreshManager.
+    
+    Fora da thread do script (atualização em segundo plano, aquecimento),
+    st.error não chega a nenhuma sessão: as falhas são levantadas e ficam
+    no status do RefreshManager.
+    
+    Args:
+        version: Versão de conteúdo do banco
+        
+    Returns:
+        Dicionário de dados com a versão registrada, ou None se a carga falhou
+    """
+    raise_errors = get_script_run_ctx() is None
+    return with_version(carregar_dados(raise_errors=raise_errors), version)
+
+# Função para carregar dados - versão atual do banco, atualizada em segundo plano
 def load_data():
     """Carrega e prepara os dados para uso na aplicação"""
     try:
-        data = carregar_dados()
+        data = get_data_manager().current()
         if data:
             st.session_state['data_loaded'] = True
-        return data
+        return session_view(data)
     except Exception as e:
         st.error(f"Erro ao carregar dados: {e}")
         return None
 
-def carregar_dados():
-    """Função otimizada de carregamento de dados"""
+@timed(name="app.carregar_dados")
+def carregar_dados(raise_errors=False):
+    """
+    Função otimizada de carregamento de dados
+    
+    Args:
+        raise_errors: Se True, levanta RuntimeError em vez de exibir o erro
+                      com st.error e devolver None
+    """
     
     if not os.path.exists(DB_PATH):
-        st.error(f"Arquivo de banco de dados não encontrado em {DB_PATH}")
+        message = f"Arquivo de banco de dados não encontrado em {DB_PATH}"
+        if raise_errors:
+            raise RuntimeError(message)
+        st.error(message)
         return None
 
+    # Snapshot Arrow da versão atual do banco: DataFrames prontos, sem SQLite
+    version = db_content_version(DB_PATH, extra=LOAD_MODE) if SNAPSHOTS_ENABLED else None
+    if version:
+        try:
+            data = load_snapshot(version)
+            if data:
+                return data
+        except Exception as e:
+            st.warning(f"Snapshot inválido, recarregando do banco: {e}")
+
     try:
-        # Conexão otimizada
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
-        
-        # Queries super otimizadas - apenas dados essenciais
-        orders_df = pd.read_sql_query("""
-            SELECT date, order_id, region, items_missing, 
-                   delivery_hour_only, driver_id, customer_id 
-            FROM orders 
-            LIMIT 10000
-        """, conn)
-        
-        drivers_df = pd.read_sql_query("SELECT driver_id, driver_name, age, Trips FROM drivers LIMIT 500", conn)
-        customers_df = pd.read_sql_query("SELECT customer_id, customer_name FROM customers LIMIT 1000", conn)
-        products_df = pd.read_sql_query("SELECT product_id, product_name, category FROM products LIMIT 200", conn)
-        missing_items_df = pd.read_sql_query("SELECT product_id_1, product_id_2, product_id_3 FROM missing_items LIMIT 5000", conn)
-        
-        conn.close()
-        
-        # Converter data apenas uma vez
-        orders_df['date'] = pd.to_datetime(orders_df['date'])
-        
-        # 1. fraud_trend: tendência temporal das fraudes
-        fraud_trend = orders_df.groupby(orders_df['date'].dt.date).agg({
-            'items_missing': 'sum',
-            'order_id': 'count'
-        }).reset_index()
-        fraud_trend.columns = ['date', 'itens_faltantes', 'total_pedidos']
-        fraud_trend['date'] = pd.to_datetime(fraud_trend['date'])
-        fraud_trend['casos_fraude'] = fraud_trend['itens_faltantes']
-        fraud_trend['percentual_fraude'] = (fraud_trend['itens_faltantes'] / fraud_trend['total_pedidos'] * 100).round(2)
-        
-        # 2. fraud_region: fraudes por região
-        fraud_region = orders_df.groupby('region').agg({
-            'items_missing': 'sum',
-            'order_id': 'count'
-        }).reset_index()
-        fraud_region.columns = ['region', 'casos_fraude', 'total_pedidos']
-        fraud_region['taxa_fraude'] = (fraud_region['casos_fraude'] / fraud_region['total_pedidos'] * 100).round(2)
-        fraud_region['percentual_fraude'] = fraud_region['taxa_fraude']
-        fraud_region['total_itens_faltantes'] = fraud_region['casos_fraude']
-        
-        # 3. missing_products: produtos mais reportados como faltantes
-        missing_list = []
-        for col in ['product_id_1', 'product_id_2', 'product_id_3']:
-            missing_list.extend(missing_items_df[col].dropna().tolist())
-        
-        # Processamento super otimizado - amostras menores
-        missing_products_count = pd.Series(missing_list).value_counts().head(50).reset_index()  # Apenas top 50
-        missing_products_count.columns = ['product_id', 'missing_count']
-        
-        missing_products = missing_products_count.merge(
-            products_df[['product_id', 'product_name', 'category']], 
-            on='product_id', 
-            how='left'
-        )
-        missing_products.rename(columns={'missing_count': 'itens_faltantes'}, inplace=True)
-        missing_products['total_relatos'] = missing_products['itens_faltantes']
-        
-        # 4. drivers: todos os motoristas
-        drivers = drivers_df.copy()
-        drivers.rename(columns={'Trips': 'total_entregas'}, inplace=True)
-        
-        # Criar coluna faixa_etaria que está sendo usada nas páginas
-        if 'age' in drivers.columns:
-            drivers['faixa_etaria'] = pd.cut(
-                drivers['age'], 
-                bins=[0, 25, 35, 45, 55, 100], 
-                labels=['18-25', '26-35', '36-45', '46-55', '55+'],
-                right=False
+        # Conexão somente leitura emprestada do pool compartilhado entre sessões
+        with get_pool().connection() as conn:
+            backend = get_backend(conn)
+            use_summaries = (
+                (LOAD_MODE == 'summary' and summaries_available(conn)) or
+                (LOAD_MODE == 'auto' and summaries_are_current(conn))
             )
-        else:
-            # Se não tiver age, criar faixa_etaria fictícia
-            drivers['faixa_etaria'] = '26-35'
-        
-        # 5. suspicious_drivers: motoristas com alta taxa de itens faltantes
-        driver_stats = orders_df.groupby('driver_id').agg({
-            'items_missing': 'sum',
-            'order_id': 'count'
-        }).reset_index()
-        driver_stats.columns = ['driver_id', 'relatos_fraude', 'total_entregas']
-        driver_stats['taxa_fraude'] = (driver_stats['relatos_fraude'] / driver_stats['total_entregas'] * 100).round(2)
-        driver_stats['percentual_fraude'] = driver_stats['taxa_fraude']
-        
-        # Limitar resultados para performance máxima
-        suspicious_drivers = driver_stats[
-            (driver_stats['taxa_fraude'] > 15) & 
-            (driver_stats['total_entregas'] > 5)
-        ].head(20).merge(drivers_df[['driver_id', 'driver_name']], on='driver_id', how='left')  # Apenas top 20
-        
-        # 6. fraud_time: fraudes por horário
-        fraud_time = orders_df.groupby('delivery_hour_only').agg({
-            'items_missing': 'sum',
-            'order_id': 'count'
-        }).reset_index()
-        fraud_time.columns = ['hour', 'casos_fraude', 'total_entregas']
-        
-        # 7. suspicious_customers: clientes com muitos relatos
-        customer_stats = orders_df.groupby('customer_id').agg({
-            'items_missing': 'sum',
-            'order_id': 'count',
-            'region': 'first'
-        }).reset_index()
-        customer_stats.columns = ['customer_id', 'relatos_fraude', 'total_pedidos', 'region']
-        customer_stats['taxa_fraude'] = (customer_stats['relatos_fraude'] / customer_stats['total_pedidos'] * 100).round(2)
-        customer_stats['percentual_fraude'] = customer_stats['taxa_fraude']
-        
-        # Limitar resultados para performance máxima
-        suspicious_customers = customer_stats[
-            (customer_stats['taxa_fraude'] > 20) & 
-            (customer_stats['total_pedidos'] > 3)
-        ].head(20).merge(customers_df[['customer_id', 'customer_name']], on='customer_id', how='left')  # Apenas top 20
-        
-        # Limpeza de memória
-        del orders_df, drivers_df, customers_df, products_df, missing_items_df
-        gc.collect()
-        
-        # Retornar dados no formato esperado
-        data = {
-            'fraud_trend': fraud_trend,
-            'fraud_region': fraud_region,
-            'missing_products': missing_products,
-            'drivers': drivers,
-            'suspicious_drivers': suspicious_drivers,
-            'fraud_time': fraud_time,
-            'suspicious_customers': suspicious_customers
-        }
+            if LOAD_MODE == 'streaming':
+                # Leitura em blocos com acumuladores - memória limitada pelo bloco
+                data = stream_dashboard_frames(conn, STREAMING_CHUNK_SIZE)
+            elif use_summaries:
+                # Tabelas de resumo materializadas - custo proporcional às linhas de resumo
+                data = build_dashboard_frames_from_summaries(conn)
+            else:
+                # Agregações executadas pelo backend configurado (SQLite ou
+                # DuckDB) - apenas os resultados resumidos chegam ao pandas
+                data = build_dashboard_frames(backend)
+
+            # Cubo OLAP pré-agregado: os filtros da barra lateral são
+            # respondidos por ele, sem voltar à tabela orders. Com as
+            # tabelas de resumo, o cubo também vem delas
+            if use_summaries:
+                data.update(build_cube_frames_from_summaries(conn))
+            else:
+                data.update(build_cube_frames(backend))
+            
+            # Tipos compactos (IDs em string Arrow, contagens em int32, horas em int8)
+            data = apply_frame_schemas(data)
+            
+            if version:
+                try:
+                    write_snapshot(version, data)
+                    prune_snapshots(version)
+                except Exception as e:
+                    st.warning(f"Não foi possível gravar o snapshot: {e}")
         
         return data
         
     except Exception as e:
+        if raise_errors:
+            raise RuntimeError(f"Erro ao carregar os dados do banco: {e}") from e
         st.error(f"Erro ao carregar os dados do banco: {e}")
         return None
 
@@ -256,26 +228,95 @@ def create_sidebar(data):
         
         st.markdown("---")
         
+        # Estado da atualização dos dados
+        status = get_data_manager().status()
+        if status['atualizando']:
+            st.caption("Atualizando os dados em segundo plano...")
+        if status['ultimo_erro']:
+            st.caption(f"⚠️ {status['ultimo_erro']}")
+        
+
+def get_query_param(name):
+    """Valor de um parâmetro da URL (ou None)."""
+    if hasattr(st, 'query_params'):
+        return st.query_params.get(name)
+    return (st.experimental_get_query_params().get(name) or [None])[0]
+
+def remove_query_param(name):
+    """Remove um parâmetro da URL, mantendo os demais."""
+    if hasattr(st, 'query_params'):
+        if name in st.query_params:
+            del st.query_params[name]
+        return
+    params = st.experimental_get_query_params()
+    if params.pop(name, None) is not None:
+        st.experimental_set_query_params(**params)
+
+def admin_mode():
+    """
+    Indica se o painel de administração foi pedido na URL.
+    
+    O painel liga a medição e o tracemalloc para todo o processo, então só
+    existe com uma chave definida em ADMIN_KEY.
+    
+    Returns:
+        True com ?admin=<chave>; sempre False sem ADMIN_KEY
+    """
+    value = get_query_param('admin')
+    return bool(ADMIN_KEY) and value is not None and hmac.compare_digest(value, ADMIN_KEY)
+
+def profile_requested():
+    """
+    Indica se esta execução deve ser perfilada.
+    
+    O pedido vale para uma única execução: pelo painel de administração
+    (próxima execução da sessão) ou por ?profile=1 na URL, parâmetro que é
+    removido em seguida. O parâmetro só é aceito junto com ?admin=<chave>
+    (ver admin_mode), pois cada perfil grava arquivos em PROFILE_DIR.
+    
+    Returns:
+        True se a execução deve rodar com o perfil por amostragem
+    """
+    if st.session_state.pop('profile_next', False):
+        return True
+    if get_query_param('profile') == '1' and admin_mode():
+        remove_query_param('profile')
+        return True
+    return False
 
 # Menu de navegação principal
 def create_navigation_menu():
-    """Cria o menu de navegação com abas personalizadas"""
-    tabs = st.tabs([
-        "Panorama Geral", 
-        "Análise Temporal", 
-        "Produtos & Categorias", 
-        "Regiões & Entregadores",
-        "Padrões Ocultos",
-        "Diagnóstico",
-        "Evolução",
-        "Recomendações"
-    ])
+    """
+    Cria o menu de navegação e retorna a página selecionada.
+    
+    Diferente de st.tabs, que executa o conteúdo de todas as abas a cada
+    interação, apenas a página selecionada é executada. O painel de
+    administração só aparece no menu quando pedido na URL (admin_mode).
     
-    return tabs
+    Returns:
+        Tupla (rótulo, módulo, DataFrames usados) da página ativa
+    """
+    pages = PAGES + [ADMIN_PAGE] if admin_mode() else PAGES
+    labels = [label for label, _, _ in pages]
+    selected = st.radio(
+        "Navegação",
+        labels,
+        horizontal=True,
+        key='active_page',
+        label_visibility="collapsed"
+    )
+    return pages[labels.index(selected)]
 
+@timed(name="app.main")
 def main():
     """Função principal que gerencia o fluxo da aplicação"""
     
+    # Aquecer os caches de todas as páginas em segundo plano (uma vez por processo)
+    start_warmup(get_data_manager())
+    
+    # Rastreamento de memória com tracemalloc, se ativado (uma vez por processo)
+    start_memory_tracking()
+    
     # Carregar dados
     data = load_data()
     
@@ -286,39 +327,37 @@ def main():
     create_sidebar(data)
     
     # Criar menu de navegação
-    tabs = create_navigation_menu()
-    
-    # Carregar módulos de páginas conforme a seleção da aba
-    from pages import panorama, analise_temporal, categorias_itens, regioes_entregadores
-    from pages import padroes_ocultos, diagnostico, evolucao, recomendacoes
-    
-    with tabs[0]:
-        panorama.show(data)
+    _, module_name, frames = create_navigation_menu()
     
-    with tabs[1]:
-        analise_temporal.show(data)
-        
-    with tabs[2]:
-        categorias_itens.show(data)
-        
-    with tabs[3]:
-        regioes_entregadores.show(data)
+    # Filtros globais recalculados na origem (cubo OLAP e consultas SQL),
+    # apenas para os DataFrames da página ativa
+    try:
+        data = apply_global_filters(
+            data,
+            st.session_state['date_filter'],
+            st.session_state['category_filter'],
+            st.session_state['region_filter'],
+            frames=frames
+        )
+    except Exception as e:
+        st.warning(f"Não foi possível aplicar os filtros globais: {e}")
     
-    with tabs[4]:
-        padroes_ocultos.show(data)
-        
-    with tabs[5]:
-        diagnostico.show(data)
-        
-    with tabs[6]:
-        evolucao.show(data)
-        
-    with tabs[7]:
-        recomendacoes.show(data)
+    # Importar e executar somente o módulo da página selecionada
+    page = importlib.import_module(f"pages.{module_name}")
+    page.show(data)
+
+def run_profiled():
+    """Executa main() com o perfil por amostragem e exibe as funções mais lentas."""
+    with profile_run(st.session_state.get('active_page') or "app") as result:
+        main()
+    show_profile_result(result)
 
 if __name__ == "__main__":
     try:
-        main()
+        if profile_requested():
+            run_profiled()
+        else:
+            main()
     except Exception as e:
         st.error(f"Ocorreu um erro na aplicação: {e}")
         st.text("Detalhes do erro:")
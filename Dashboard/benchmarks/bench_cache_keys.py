@@ -0,0 +1,67 @@
+"""
+Benchmark do custo da chave de cache do st.cache_data: DataFrame x DatasetHandle.
+
+A função em cache devolve apenas um inteiro, então o tempo de uma chamada
+com acerto no cache é praticamente o tempo de calcular a chave (hash dos
+argumentos). Com DataFrame, o Streamlit percorre o conteúdo; com
+DatasetHandle (utils/datasets.py), usa apenas o identificador da versão.
+
+Uso (a partir da pasta Dashboard):
+    python benchmarks/bench_cache_keys.py --rows 1000000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.datasets import HASH_FUNCS, DatasetHandle, frame_of
+
+
+@st.cache_data(hash_funcs=HASH_FUNCS)
+def count_rows(df):
+    """Função em cache mínima: o custo da chamada é o cálculo da chave."""
+    return len(frame_of(df))
+
+
+def timed_calls(arg, repeat):
+    """Executa count_rows repetidamente e retorna o tempo médio com acerto no cache."""
+    count_rows(arg)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        count_rows(arg)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Custo da chave de cache por tipo de argumento")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="Quantidades de linhas do DataFrame de teste")
+    parser.add_argument('--repeat', type=int, default=5, help="Chamadas medidas por caso")
+    args = parser.parse_args(argv)
+
+    # Fora de 'streamlit run' o Streamlit avisa a cada chamada em cache
+    logging.disable(logging.WARNING)
+
+    rng = np.random.default_rng(42)
+    print(f"{'linhas':>10}{'DataFrame':>14}{'handle':>14}")
+    for rows in args.rows:
+        df = pd.DataFrame({
+            'driver_id': pd.Series([f"WDID{i:05d}" for i in rng.integers(0, 2000, rows)], dtype='string[pyarrow]'),
+            'region': pd.Categorical(rng.choice(['Orlando', 'Sanford', 'Apopka'], rows)),
+            'itens_faltantes': rng.integers(0, 5, rows).astype('int32'),
+            'percentual_fraude': rng.random(rows),
+        })
+        frame_time = timed_calls(df, args.repeat)
+        handle_time = timed_calls(DatasetHandle('bench', f'v{rows}', df), args.repeat)
+        print(f"{rows:>10,}{frame_time * 1000:>12.2f}ms{handle_time * 1000:>12.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark da agregação de pedidos: consultas SQL por DataFrame x leitura única.
+
+Mede, sobre o mesmo banco:
+- as cinco consultas agregadas de utils.aggregations que percorrem orders
+  (uma varredura, ou um índice, por DataFrame);
+- a leitura única de utils.engine (scan_orders), separando o tempo de
+  leitura do SQLite do tempo de agregação.
+
+Uso (a partir da pasta Dashboard):
+    python benchmarks/bench_engine.py --db ../Database/walmart_fraudes.db
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import DB_PATH, STREAMING_CHUNK_SIZE
+from utils.aggregations import (query_fraud_region, query_fraud_time, query_fraud_trend,
+                                query_suspicious_customers, query_suspicious_drivers)
+from utils.dtypes import apply_schema
+from utils.engine import ORDER_SCAN_SQL, OrderScan, SCAN_DIMENSIONS
+
+
+def timed(func, *args):
+    """Executa a função e retorna (resultado, segundos)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da agregação em leitura única")
+    parser.add_argument('--db', default=DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--chunk-size', type=int, default=STREAMING_CHUNK_SIZE,
+                        help="Linhas por bloco na leitura única")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        rows = conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+        print(f"{rows:,} pedidos em {args.db}")
+
+        sql_total = 0.0
+        for query in [query_fraud_trend, query_fraud_region, query_suspicious_drivers,
+                      query_fraud_time, query_suspicious_customers]:
+            _, seconds = timed(query, conn)
+            sql_total += seconds
+            print(f"  sql  {query.__name__:<28}{seconds:>8.3f}s")
+        print(f"{'consultas SQL (5 passadas)':<35}{sql_total:>8.3f}s")
+
+        scan = OrderScan()
+        read_time = aggregate_time = 0.0
+        chunks = pd.read_sql_query(ORDER_SCAN_SQL, conn, chunksize=args.chunk_size)
+        while True:
+            chunk, seconds = timed(next, chunks, None)
+            read_time += seconds
+            if chunk is None:
+                break
+            _, seconds = timed(scan.add_chunk, apply_schema(chunk, 'orders'))
+            aggregate_time += seconds
+        for dim in SCAN_DIMENSIONS:
+            _, seconds = timed(scan.totals, dim)
+            aggregate_time += seconds
+
+        print(f"  leitura  (SQLite -> pandas)      {read_time:>8.3f}s")
+        print(f"  agregação (factorize + bincount) {aggregate_time:>8.3f}s")
+        print(f"{'leitura única (1 passada)':<35}{read_time + aggregate_time:>8.3f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Benchmark do tempo de importação do dashboard, com limite por módulo.
+
+Cada medição roda em um processo novo: o Streamlit e o pandas são
+importados antes (custo fixo de qualquer réplica) e, em seguida, o módulo
+alvo, ou seja, o que ele acrescenta à partida. O resultado de cada alvo é
+a mediana das execuções.
+
+Para que a verificação não dependa da máquina, o limite é relativo: o
+tempo do alvo como percentual do tempo de BASELINE_IMPORTS no mesmo
+processo. Os milissegundos aparecem apenas como informação. Além disso,
+nenhum alvo pode carregar os módulos de HEAVY_MODULES, que as páginas
+importam apenas quando usados (utils/lazy.py).
+
+Os limites ficam em benchmarks/import_budget.json; o script termina com
+código 1 se algum alvo passar do limite mais a tolerância ou carregar um
+módulo de HEAVY_MODULES, o que permite usá-lo como verificação de
+regressão. --audit usa 'python -X importtime' para detalhar um alvo.
+
+Uso (a partir da pasta Dashboard):
+    python benchmarks/bench_import_time.py                # mede e compara
+    python benchmarks/bench_import_time.py --update       # regrava os limites
+    python benchmarks/bench_import_time.py --audit pages.panorama
+"""
+import argparse
+import json
+import textwrap
+import os
+import statistics
+import subprocess
+import sys
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(DASHBOARD_DIR, 'benchmarks', 'import_budget.json')
+
+# Importados antes do alvo em todas as medições
+BASELINE_IMPORTS = "import streamlit, pandas"
+
+# Módulos que não podem ser carregados na importação de nenhum alvo
+HEAVY_MODULES = ['plotly.express', 'sklearn', 'matplotlib', 'seaborn']
+
+# Executado em um processo novo para cada medição; a última linha da saída
+# é o resultado em JSON
+MEASURE_SCRIPT = textwrap.dedent("""
+    import json, sys, time
+    start = time.perf_counter()
+    {baseline}
+    middle = time.perf_counter()
+    import {target}
+    end = time.perf_counter()
+    print(json.dumps({{
+        'base_ms': (middle - start) * 1000,
+        'alvo_ms': (end - middle) * 1000,
+        'pesados': [name for name in {heavy!r} if name in sys.modules],
+    }}))
+""")
+
+TARGETS = [
+    'app',
+    'utils.graphics',
+    'pages.panorama',
+    'pages.analise_temporal',
+    'pages.categorias_itens',
+    'pages.regioes_entregadores',
+    'pages.padroes_ocultos',
+    'pages.diagnostico',
+    'pages.evolucao',
+    'pages.recomendacoes',
+]
+
+
+def import_times(target):
+    """
+    Importa o alvo em um processo novo e retorna os tempos do -X importtime.
+
+    Args:
+        target: Módulo a importar
+
+    Returns:
+        Lista de (módulo, profundidade, microssegundos acumulados) na ordem
+        do relatório do Python
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"{BASELINE_IMPORTS}; import {target}"],
+        cwd=DASHBOARD_DIR, capture_output=True, text=True,
+        env={**os.environ, 'DASHBOARD_WARMUP': '0'}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {target}:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(cumulative)))
+    return rows
+
+
+def measure_target(target):
+    """
+    Importa o alvo em um processo novo, depois de BASELINE_IMPORTS.
+
+    Args:
+        target: Módulo a importar
+
+    Returns:
+        Dicionário com base_ms (custo fixo), alvo_ms (acréscimo do alvo) e
+        pesados (módulos de HEAVY_MODULES carregados)
+    """
+    script = MEASURE_SCRIPT.format(baseline=BASELINE_IMPORTS, target=target, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=DASHBOARD_DIR, capture_output=True, text=True,
+        env={**os.environ, 'DASHBOARD_WARMUP': '0'}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {target}:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def audit(target, top):
+    """Mostra os módulos que mais pesam na importação do alvo."""
+    rows = import_times(target)
+    start = next(i for i, (name, depth, _) in reversed(list(enumerate(rows)))
+                 if name == target and depth == 0)
+    # O -X importtime lista os submódulos antes do módulo que os importou
+    first = start
+    while first > 0 and rows[first - 1][1] > 0:
+        first -= 1
+    children = sorted(rows[first:start], key=lambda row: row[2], reverse=True)[:top]
+    print(f"Importação de {target}: {rows[start][2] / 1000:.1f} ms")
+    for name, depth, cumulative in children:
+        print(f"  {cumulative / 1000:8.1f} ms  {'  ' * (depth - 1)}{name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de importação dos módulos do dashboard")
+    parser.add_argument('--runs', type=int, default=5, help="Execuções por alvo (mediana)")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="Folga relativa sobre o limite antes de falhar (0.5 = +50%%)")
+    parser.add_argument('--update', action='store_true',
+                        help="Grava os percentuais medidos como novos limites")
+    parser.add_argument('--audit', metavar='MODULO', help="Lista os módulos mais pesados do alvo")
+    parser.add_argument('--top', type=int, default=15, help="Módulos listados em --audit")
+    args = parser.parse_args(argv)
+
+    if args.audit:
+        audit(args.audit, args.top)
+        return 0
+
+    budget = {}
+    if os.path.exists(BUDGET_PATH):
+        with open(BUDGET_PATH, encoding='utf-8') as f:
+            budget = json.load(f)
+
+    measured = {}
+    failures = []
+    print(f"{'módulo':<30}{'alvo':>10}{'custo fixo':>12}{'% do fixo':>11}{'limite':>9}")
+    for target in TARGETS:
+        runs = [measure_target(target) for _ in range(args.runs)]
+        percent = statistics.median(run['alvo_ms'] / run['base_ms'] * 100 for run in runs)
+        measured[target] = round(percent, 2)
+        limit = budget.get(target)
+        status = ""
+        if limit is not None and percent > limit * (1 + args.tolerance):
+            failures.append(target)
+            status = "  REGRESSÃO"
+        heavy = sorted({name for run in runs for name in run['pesados']})
+        if heavy:
+            failures.append(target)
+            status += f"  CARREGA {', '.join(heavy)}"
+        limit_text = f"{limit:.2f}" if limit is not None else "-"
+        print(
+            f"{target:<30}{statistics.median(run['alvo_ms'] for run in runs):>8.1f}ms"
+            f"{statistics.median(run['base_ms'] for run in runs):>10.1f}ms"
+            f"{percent:>10.2f}%{limit_text:>9}{status}"
+        )
+
+    if args.update:
+        with open(BUDGET_PATH, 'w', encoding='utf-8') as f:
+            json.dump(measured, f, indent=2)
+            f.write("\n")
+        print(f"Limites gravados em {BUDGET_PATH}")
+        return 0
+
+    if failures:
+        print(f"Importação acima do limite ou com módulos pesados: {', '.join(dict.fromkeys(failures))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
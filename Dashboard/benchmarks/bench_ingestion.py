@@ -0,0 +1,128 @@
+"""
+Benchmark da conversão dos campos textuais: código linha a linha x utils.ingestion.
+
+Gera colunas sintéticas no formato dos CSVs de origem ("$1,095.54",
+"8:37:28", "2023-01-15 00:00:00"), executa as duas versões, confere que
+os resultados são iguais e mostra o tempo de cada etapa.
+
+Uso (a partir da pasta Dashboard):
+    python benchmarks/bench_ingestion.py --rows 2000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ingestion import (DASHBOARD_DAY_PERIODS, parse_currency, parse_datetime,
+                             parse_time_of_day, period_of_day)
+
+
+def make_raw_columns(rows, seed=42):
+    """Gera colunas textuais com o formato dos CSVs de origem."""
+    rng = np.random.default_rng(seed)
+    amounts = rng.uniform(1, 5000, rows)
+    hours = rng.integers(0, 24, rows)
+    minutes = rng.integers(0, 60, rows)
+    seconds = rng.integers(0, 60, rows)
+    days = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+    return pd.DataFrame({
+        'order_amount': [f"${value:,.2f}" for value in amounts],
+        'delivery_hour': [f"{h}:{m:02d}:{s:02d}" for h, m, s in zip(hours, minutes, seconds)],
+        'date': days.strftime('%Y-%m-%d %H:%M:%S'),
+    })
+
+
+# Versões linha a linha, como no notebook de limpeza e em utils/loaders.py
+
+def rowwise_currency(values):
+    return values.str.replace('$', '').str.replace(',', '').astype(float)
+
+
+def rowwise_time_of_day(values):
+    return pd.DataFrame({
+        'hour': values.apply(lambda x: int(x.split(':')[0])),
+        'minute': values.apply(lambda x: int(x.split(':')[1])),
+        'second': values.apply(lambda x: int(x.split(':')[2])),
+    })
+
+
+def rowwise_period(hours):
+    def categorize_time(hour):
+        if 5 <= hour < 12:
+            return 'Manhã'
+        elif 12 <= hour < 18:
+            return 'Tarde'
+        else:
+            return 'Noite'
+    return hours.apply(categorize_time)
+
+
+def rowwise_dashboard_period(hours):
+    return hours.apply(lambda x:
+        'Madrugada' if 0 <= x < 6 else
+        'Manhã' if 6 <= x < 12 else
+        'Tarde' if 12 <= x < 18 else 'Noite')
+
+
+def rowwise_datetime(values):
+    for date_format in ['%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M', '%Y-%m-%dT%H:%M:%S',
+                        '%Y%m%d%H%M%S', '%Y-%m-%d %H:%M:%S']:
+        try:
+            return pd.to_datetime(values, format=date_format)
+        except (ValueError, TypeError):
+            continue
+    return pd.to_datetime(values, errors='coerce')
+
+
+def timed(func, *args):
+    """Executa a função e retorna (resultado, segundos)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da conversão vetorizada dos CSVs")
+    parser.add_argument('--rows', type=int, default=2_000_000, help="Quantidade de linhas")
+    args = parser.parse_args(argv)
+
+    print(f"Gerando {args.rows:,} linhas...")
+    raw = make_raw_columns(args.rows)
+    hours = raw['delivery_hour'].str.split(':').str[0].astype(int)
+
+    cases = [
+        ('order_amount', rowwise_currency, parse_currency, raw['order_amount'],
+         lambda a, b: np.allclose(a.to_numpy(), b.to_numpy())),
+        ('delivery_hour', rowwise_time_of_day, parse_time_of_day, raw['delivery_hour'],
+         lambda a, b: all((a[col].to_numpy() == b[col].to_numpy()).all() for col in a.columns)),
+        ('period_of_day', rowwise_period, period_of_day, hours,
+         lambda a, b: (a.to_numpy() == b.astype(str).to_numpy()).all()),
+        ('periodo_dia', rowwise_dashboard_period,
+         lambda values: period_of_day(values, DASHBOARD_DAY_PERIODS), hours,
+         lambda a, b: (a.to_numpy() == b.astype(str).to_numpy()).all()),
+        ('date', rowwise_datetime, parse_datetime, raw['date'],
+         lambda a, b: a.equals(b)),
+    ]
+
+    print(f"{'coluna':<15}{'linha a linha (s)':>20}{'vetorizado (s)':>18}{'ganho':>9}  resultado")
+    total_rowwise = total_vectorized = 0.0
+    for name, rowwise, vectorized, values, same in cases:
+        expected, rowwise_time = timed(rowwise, values)
+        result, vectorized_time = timed(vectorized, values)
+        total_rowwise += rowwise_time
+        total_vectorized += vectorized_time
+        status = 'igual' if same(expected, result) else 'DIFERENTE'
+        print(f"{name:<15}{rowwise_time:>20.3f}{vectorized_time:>18.3f}"
+              f"{rowwise_time / vectorized_time:>8.1f}x  {status}")
+
+    print(f"{'total':<15}{total_rowwise:>20.3f}{total_vectorized:>18.3f}"
+          f"{total_rowwise / total_vectorized:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+Suíte de benchmarks da carga, das agregações e das páginas em várias escalas.
+
+Para cada escala (10k, 1M e 10M pedidos por padrão), gera uma base
+sintética com utils/synthetic.py (reaproveitada entre execuções, pela
+semente e pela escala) e executa os casos em um processo novo apontado
+para ela (DASHBOARD_DB_PATH), sem snapshots e sem aquecimento:
+- carregar_dados (app.py) e load_data_from_db (utils/loaders.py);
+- as funções prepare_* de utils/loaders.py;
+- filters.cluster_data e detect_anomalies;
+- o show() de cada página de pages.PAGES, com os filtros padrão.
+
+As funções em st.cache_data são chamadas sem o cache (inspect.unwrap),
+ou seja, mede-se o cálculo. Cada execução recebe argumentos novos, como
+em produção: as funções prepare_* recebem cópias rasas dos DataFrames
+carregados (elas acrescentam colunas ao DataFrame recebido) e as páginas,
+a visão de sessão dos dados. Para cada caso são registrados:
+- tempo: mediana das execuções, após uma de aquecimento (importações
+  adiadas), em segundos. O st.cache_data e o cache de figuras são
+  esvaziados antes de cada execução, então mede-se sempre o cálculo a
+  frio (fora de 'streamlit run' os caches do Streamlit não guardam
+  resultados, mas a medida não depende disso);
+- pico_rss_mb: pico de memória residente do processo durante o caso
+  (VmHWM, zerado antes de cada caso pelo /proc/self/clear_refs);
+- alocado_mb e blocos: pico de memória alocada pelo Python e blocos ainda
+  alocados ao final do caso, medidos em uma execução extra a frio com
+  tracemalloc.
+
+Os resultados são comparados com benchmarks/suite_baseline.json; o script
+termina com código 1 se algum caso ficar acima da referência mais a
+tolerância (--threshold), em tempo ou em pico de memória.
+
+Uso (a partir da pasta Dashboard):
+    python benchmarks/bench_suite.py                      # 10k, 1M e 10M
+    python benchmarks/bench_suite.py --scales 10k 1m --update
+    python benchmarks/bench_suite.py --scales 1m --cases panorama prepare_driver_data
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(DASHBOARD_DIR, 'benchmarks', 'suite_baseline.json')
+
+sys.path.append(DASHBOARD_DIR)
+
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Diferenças absolutas abaixo destes valores não contam como regressão
+# (ruído de medição em casos de poucos milissegundos)
+MIN_TIME_DELTA = 0.01
+MIN_RSS_DELTA_MB = 16
+
+
+def _peak_rss_mb():
+    """Pico de memória residente do processo (VmHWM), em MB."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Fora do Linux: pico desde o início do processo
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _reset_peak_rss():
+    """Zera o pico de memória residente do processo (Linux 4.0+)."""
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def ensure_dataset(scale, data_dir, seed):
+    """
+    Gera a base sintética da escala, se ainda não existir.
+
+    Args:
+        scale: Chave de SCALES
+        data_dir: Pasta das bases geradas
+        seed: Semente do gerador
+
+    Returns:
+        Caminho do banco SQLite
+    """
+    from utils.schema import analyze, migrate
+    from utils.synthetic import SyntheticDataset, write_sqlite
+
+    os.makedirs(data_dir, exist_ok=True)
+    db_path = os.path.join(data_dir, f"sintetico_{scale}_s{seed}.db")
+    if os.path.exists(db_path):
+        return db_path
+
+    print(f"Gerando base sintética de {SCALES[scale]:,} pedidos em {db_path}...", flush=True)
+    start = time.perf_counter()
+    partial = db_path + '.parcial'
+    write_sqlite(SyntheticDataset(SCALES[scale], seed=seed), partial)
+    conn = sqlite3.connect(partial)
+    try:
+        migrate(conn, rebuild=True)
+        analyze(conn)
+    finally:
+        conn.close()
+    # Só renomeia ao final: uma geração interrompida não é reaproveitada
+    os.replace(partial, db_path)
+    print(f"Base gerada em {time.perf_counter() - start:.1f} s", flush=True)
+    return db_path
+
+
+def build_cases():
+    """
+    Monta os casos do benchmark.
+
+    Deve ser chamada no processo filho, com DASHBOARD_DB_PATH já definido.
+
+    Returns:
+        Lista de (nome, função de preparo, função medida); a função de
+        preparo recebe os dados carregados e devolve argumentos novos a
+        cada chamada
+    """
+    import importlib
+    import inspect
+
+    import app
+    from pages import PAGES
+    from utils import loaders
+    from utils.filters import cluster_data
+    from utils.refresh import session_view
+
+    def uncached(func):
+        # Remove o st.cache_data e a medição de utils/perf.py
+        return inspect.unwrap(func)
+
+    def frames(*names):
+        # Cópias rasas, como as da visão de sessão: as colunas criadas
+        # pelas funções prepare_* não ficam nos DataFrames carregados
+        return lambda data: tuple(data[name].copy(deep=False) for name in names)
+
+    def driver_features(data):
+        df = data['drivers'].merge(
+            data['suspicious_drivers'][['driver_id', 'relatos_fraude', 'taxa_fraude']],
+            on='driver_id', how='left'
+        ).fillna({'relatos_fraude': 0, 'taxa_fraude': 0})
+        return (df, ['age', 'total_entregas', 'relatos_fraude', 'taxa_fraude'], 3)
+
+    cases = [
+        ('carregar_dados', lambda data: (), app.carregar_dados),
+        ('load_data_from_db', lambda data: (), loaders.load_data_from_db),
+        ('prepare_data_for_time_analysis', frames('fraud_time'),
+         uncached(loaders.prepare_data_for_time_analysis)),
+        ('prepare_fraud_trend_data', frames('fraud_trend'),
+         uncached(loaders.prepare_fraud_trend_data)),
+        ('prepare_region_data', frames('fraud_region'),
+         uncached(loaders.prepare_region_data)),
+        ('prepare_driver_data', frames('drivers', 'suspicious_drivers'),
+         uncached(loaders.prepare_driver_data)),
+        ('prepare_product_data', frames('missing_products'),
+         uncached(loaders.prepare_product_data)),
+        ('cluster_data', driver_features, cluster_data),
+        ('detect_anomalies', lambda data: (*frames('fraud_trend')(data), 'percentual_fraude', 2.0),
+         uncached(loaders.detect_anomalies)),
+    ]
+    for _, module_name, _ in PAGES:
+        page = importlib.import_module(f"pages.{module_name}")
+        cases.append((module_name, lambda data: (session_view(data),), page.show))
+    return cases
+
+
+def clear_caches():
+    """Esvazia o st.cache_data e o cache de figuras antes de uma execução."""
+    import streamlit as st
+
+    from utils.figure_cache import get_figure_cache
+
+    st.cache_data.clear()
+    get_figure_cache().clear()
+
+
+def measure(func, make_args, repeat, allocations):
+    """
+    Mede um caso.
+
+    Args:
+        func: Função medida
+        make_args: Função sem argumentos que devolve argumentos novos
+        repeat: Execuções cronometradas, após uma execução de aquecimento
+        allocations: Se True, faz uma execução extra com tracemalloc
+
+    Returns:
+        Dicionário com tempo, pico_rss_mb e, se pedido, alocado_mb e blocos
+    """
+    # Execução de aquecimento fora da medição (importações adiadas, cache de páginas do SO)
+    clear_caches()
+    func(*make_args())
+    times = []
+    _reset_peak_rss()
+    for _ in range(repeat):
+        clear_caches()
+        args = make_args()
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    result = {'tempo': round(statistics.median(times), 4), 'pico_rss_mb': round(_peak_rss_mb(), 1)}
+
+    if allocations:
+        clear_caches()
+        args = make_args()
+        tracemalloc.start()
+        try:
+            before = len(tracemalloc.take_snapshot().traces)
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            after = len(tracemalloc.take_snapshot().traces)
+        finally:
+            tracemalloc.stop()
+        result['alocado_mb'] = round(peak / (1024 * 1024), 1)
+        result['blocos'] = after - before
+    return result
+
+
+def run_child(repeat, allocations, selected):
+    """Executa os casos no processo filho e imprime o resultado em JSON."""
+    # Fora de 'streamlit run' o Streamlit avisa a cada chamada de exibição
+    logging.disable(logging.WARNING)
+
+    from app import carregar_dados
+
+    cases = build_cases()
+    data = carregar_dados()
+    if not data:
+        raise RuntimeError("carregar_dados não retornou dados")
+
+    results = {}
+    for name, setup, func in cases:
+        if selected and name not in selected:
+            continue
+        results[name] = measure(func, lambda: setup(data), repeat, allocations)
+    print(json.dumps(results))
+
+
+def run_scale(db_path, repeat, allocations, selected):
+    """
+    Executa os casos em um processo novo apontado para o banco.
+
+    Returns:
+        Dicionário {caso: medidas}
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--repeat', str(repeat)]
+    if not allocations:
+        command.append('--no-allocations')
+    if selected:
+        command += ['--cases', *selected]
+    env = {
+        **os.environ,
+        'DASHBOARD_DB_PATH': db_path,
+        'DASHBOARD_SNAPSHOTS': '0',
+        'DASHBOARD_WARMUP': '0',
+    }
+    result = subprocess.run(command, cwd=DASHBOARD_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha na execução dos casos:\n{result.stderr[-3000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(measured, reference, threshold):
+    """
+    Compara um caso com a referência.
+
+    Returns:
+        Lista com as métricas acima da referência mais a tolerância
+    """
+    regressions = []
+    checks = (('tempo', MIN_TIME_DELTA), ('pico_rss_mb', MIN_RSS_DELTA_MB))
+    for metric, min_delta in checks:
+        base = reference.get(metric)
+        value = measured.get(metric)
+        if base is None or value is None:
+            continue
+        if value > base * (1 + threshold) and value - base > min_delta:
+            regressions.append(metric)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks da carga, agregações e páginas")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=list(SCALES),
+                        help="Escalas da base sintética")
+    parser.add_argument('--cases', nargs='+', help="Executa apenas os casos indicados")
+    parser.add_argument('--repeat', type=int, default=3, help="Execuções por caso (mediana)")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Folga relativa sobre a referência antes de falhar (0.25 = +25%%)")
+    parser.add_argument('--seed', type=int, default=42, help="Semente das bases sintéticas")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'dashboard-bench'),
+                        help="Pasta das bases sintéticas geradas")
+    parser.add_argument('--no-allocations', action='store_true',
+                        help="Não mede as alocações (sem a execução extra com tracemalloc)")
+    parser.add_argument('--update', action='store_true',
+                        help="Grava os resultados como nova referência")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.repeat, not args.no_allocations, args.cases)
+        return 0
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    failures = []
+    for scale in args.scales:
+        db_path = ensure_dataset(scale, args.data_dir, args.seed)
+        measured = run_scale(db_path, args.repeat, not args.no_allocations, args.cases)
+
+        print(f"\nEscala {scale} ({SCALES[scale]:,} pedidos)")
+        print(f"{'caso':<32}{'tempo':>10}{'ref.':>10}{'pico RSS':>11}{'alocado':>10}{'blocos':>9}")
+        for name, result in measured.items():
+            reference = baseline.get(scale, {}).get(name, {})
+            regressions = compare(result, reference, args.threshold)
+            if regressions:
+                failures.append(f"{scale}/{name} ({', '.join(regressions)})")
+            ref_text = f"{reference['tempo']:.3f}s" if 'tempo' in reference else "-"
+            alloc_text = f"{result['alocado_mb']:.1f}MB" if 'alocado_mb' in result else "-"
+            blocks_text = f"{result['blocos']:,}" if 'blocos' in result else "-"
+            status = "  REGRESSÃO" if regressions else ""
+            print(f"{name:<32}{result['tempo']:>9.3f}s{ref_text:>10}{result['pico_rss_mb']:>9.0f}MB"
+                  f"{alloc_text:>10}{blocks_text:>9}{status}")
+        if args.update:
+            baseline.setdefault(scale, {}).update(measured)
+
+    if args.update:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\nReferência gravada em {BASELINE_PATH}")
+        return 0
+
+    if failures:
+        print(f"\nAcima da referência: {'; '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import os
+
+# Carregar variáveis de um arquivo .env, se existir
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+# Caminhos do projeto
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+DB_PATH = os.environ.get(
+    'DASHBOARD_DB_PATH',
+    os.path.join(PROJECT_ROOT, "Database", "walmart_fraudes.db")
+)
+
+# Modo de carregamento dos dados do dashboard:
+#   'auto'      - tabelas de resumo quando atualizadas, senão agregações SQL (padrão)
+#   'summary'   - sempre as tabelas de resumo materializadas
+#   'sql'       - agregações executadas pelo SQLite sobre orders
+#   'streaming' - leitura de orders/missing_items em blocos com acumuladores
+LOAD_MODE = os.environ.get('DASHBOARD_LOAD_MODE', 'auto')
+
+# Quantidade de linhas lidas por bloco no modo 'streaming'
+STREAMING_CHUNK_SIZE = int(os.environ.get('DASHBOARD_CHUNK_SIZE', 100_000))
+
+# Snapshots Arrow IPC dos DataFrames derivados, chaveados pela versão do banco
+SNAPSHOTS_ENABLED = os.environ.get('DASHBOARD_SNAPSHOTS', '1') == '1'
+SNAPSHOT_DIR = os.environ.get(
+    'DASHBOARD_SNAPSHOT_DIR',
+    os.path.join(PROJECT_ROOT, "Database", "snapshots")
+)
+
+# Pool de conexões somente leitura usado pelo dashboard (utils/database.py)
+DB_POOL_SIZE = int(os.environ.get('DASHBOARD_DB_POOL_SIZE', 4))
+# immutable=1 dispensa verificações de alteração e bloqueio; usar apenas
+# quando o arquivo do banco não é alterado com o dashboard no ar
+DB_IMMUTABLE = os.environ.get('DASHBOARD_DB_IMMUTABLE', '0') == '1'
+DB_MMAP_SIZE = int(os.environ.get('DASHBOARD_DB_MMAP_SIZE', 256 * 1024 * 1024))
+DB_CACHE_SIZE_KB = int(os.environ.get('DASHBOARD_DB_CACHE_KB', 64 * 1024))
+# Instruções preparadas mantidas em cache por conexão
+DB_STATEMENT_CACHE = int(os.environ.get('DASHBOARD_DB_STATEMENT_CACHE', 256))
+
+# Backend das consultas agregadas (utils/backends.py):
+#   'sqlite' - executadas pelo próprio SQLite (padrão)
+#   'duckdb' - executor vetorizado e multi-thread do DuckDB (pip install duckdb)
+QUERY_BACKEND = os.environ.get('DASHBOARD_QUERY_BACKEND', 'sqlite')
+# Fonte do DuckDB: sem pasta, lê walmart_fraudes.db pela extensão sqlite; com
+# pasta, lê as exportações Parquet (python -m utils.backends --export-parquet PASTA).
+# O ganho vem do Parquet: pela extensão sqlite as linhas ainda são lidas
+# uma a uma pelo SQLite e as consultas ficam mais lentas que no SQLite com índices.
+DUCKDB_PARQUET_DIR = os.environ.get('DASHBOARD_DUCKDB_PARQUET_DIR') or None
+# Threads do DuckDB (0 = todos os núcleos)
+DUCKDB_THREADS = int(os.environ.get('DASHBOARD_DUCKDB_THREADS', 0))
+# Pasta de extensões do DuckDB, para servidores sem acesso à internet
+DUCKDB_EXTENSION_DIR = os.environ.get('DASHBOARD_DUCKDB_EXTENSION_DIR') or None
+
+# Cache das figuras Plotly (utils/figure_cache.py), compartilhado pelas
+# sessões: tamanho máximo em MB dos JSONs guardados
+FIGURE_CACHE_MAX_MB = int(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', 64))
+
+# Intervalo mínimo, em segundos, entre verificações de mudança no banco
+# (utils/refresh.py); a reconstrução dos dados só ocorre quando ele muda
+REFRESH_CHECK_SECONDS = float(os.environ.get('DASHBOARD_REFRESH_SECONDS', 5))
+# Espera máxima, em segundos, antes de tentar de novo uma versão cuja
+# reconstrução falhou (a espera dobra a cada falha da mesma versão)
+REFRESH_RETRY_MAX_SECONDS = float(os.environ.get('DASHBOARD_REFRESH_RETRY_MAX_SECONDS', 300))
+
+# Aquecimento dos caches na partida do servidor (utils/warmup.py): executa
+# cada página uma vez, em segundo plano, com os filtros padrão
+WARMUP_ENABLED = os.environ.get('DASHBOARD_WARMUP', '1') == '1'
+WARMUP_WORKERS = int(os.environ.get('DASHBOARD_WARMUP_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Medição do tempo das páginas, cargas, consultas e gráficos (utils/perf.py):
+# desativada por padrão; pode ser ligada no painel de administração
+PERF_ENABLED = os.environ.get('DASHBOARD_PERF', '0') == '1'
+# Reexecuções mantidas no buffer circular da medição
+PERF_MAX_RUNS = int(os.environ.get('DASHBOARD_PERF_RUNS', 200))
+# Arquivo JSON lines que recebe cada reexecução medida (opcional)
+PERF_EXPORT_PATH = os.environ.get('DASHBOARD_PERF_EXPORT') or None
+# Painel de administração, oculto no menu: aberto com ?admin=<chave> na URL.
+# Sem chave definida, o painel não existe
+ADMIN_KEY = os.environ.get('DASHBOARD_ADMIN_KEY', '')
+
+# Perfil por amostragem de uma execução (utils/profiler.py), pedido pelo
+# painel de administração ou com ?profile=1 junto com ?admin=<chave>
+PROFILE_DIR = os.environ.get('DASHBOARD_PROFILE_DIR', os.path.join(PROJECT_ROOT, "profiles"))
+PROFILE_INTERVAL_MS = float(os.environ.get('DASHBOARD_PROFILE_INTERVAL_MS', 5))
+# Funções listadas na tabela do perfil
+PROFILE_TOP = int(os.environ.get('DASHBOARD_PROFILE_TOP', 30))
+# Perfis mantidos em PROFILE_DIR; os mais antigos são removidos a cada gravação
+PROFILE_KEEP = int(os.environ.get('DASHBOARD_PROFILE_KEEP', 20))
+
+# Rastreamento de memória com tracemalloc (utils/memory.py): compara
+# snapshots periodicamente e grava o que mais cresceu na saída do servidor.
+# Deixa as alocações mais lentas; também pode ser ligado pelo painel
+MEMORY_TRACKING = os.environ.get('DASHBOARD_MEMORY_TRACKING', '0') == '1'
+MEMORY_SNAPSHOT_SECONDS = float(os.environ.get('DASHBOARD_MEMORY_SNAPSHOT_SECONDS', 300))
+# Quadros de pilha guardados por alocação (mais quadros, mais memória)
+MEMORY_TRACE_FRAMES = int(os.environ.get('DASHBOARD_MEMORY_TRACE_FRAMES', 1))
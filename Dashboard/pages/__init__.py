@@ -0,0 +1,22 @@
+"""
+Páginas do dashboard, executadas uma por vez por app.py.
+"""
+
+# Páginas do dashboard: rótulo, módulo em pages/ e DataFrames usados pela página
+PAGES = [
+    ("Panorama Geral", "panorama",
+     ['fraud_trend', 'fraud_region', 'missing_products', 'suspicious_drivers', 'driver_products']),
+    ("Análise Temporal", "analise_temporal", ['fraud_trend', 'fraud_time']),
+    ("Produtos & Categorias", "categorias_itens", ['missing_products']),
+    ("Regiões & Entregadores", "regioes_entregadores", ['fraud_region', 'drivers', 'suspicious_drivers']),
+    ("Padrões Ocultos", "padroes_ocultos",
+     ['fraud_trend', 'drivers', 'missing_products', 'suspicious_drivers', 'suspicious_customers']),
+    ("Diagnóstico", "diagnostico",
+     ['fraud_region', 'drivers', 'missing_products', 'suspicious_drivers', 'suspicious_customers']),
+    ("Evolução", "evolucao", ['fraud_trend']),
+    ("Recomendações", "recomendacoes",
+     ['fraud_trend', 'fraud_region', 'drivers', 'missing_products', 'suspicious_drivers']),
+]
+
+# Painel de administração: fora do menu, aberto com ?admin=<chave> na URL (ver app.admin_mode)
+ADMIN_PAGE = ("Administração", "admin", [])
@@ -0,0 +1,201 @@
+import json
+import streamlit as st
+from datetime import datetime
+
+# Importar funções utilitárias
+from utils import memory, perf
+from utils.profiler import recent_profiles
+
+
+def show_perf_panel():
+    """Exibe a medição de tempo por intervalo (utils/perf.py)."""
+    st.markdown("<h3> Desempenho</h3>", unsafe_allow_html=True)
+
+    enabled = st.checkbox(
+        "Medir o tempo das páginas, cargas, consultas e gráficos",
+        value=perf.is_enabled(),
+        help="Vale para todas as sessões a partir da próxima interação."
+    )
+    if enabled != perf.is_enabled():
+        perf.set_enabled(enabled)
+
+    runs = perf.recorder.runs()
+    if not runs:
+        st.info("Nenhuma execução medida. Ative a medição e navegue pelas páginas.")
+        return
+
+    st.caption(f"{len(runs)} execuções no buffer (as mais recentes primeiro na lista abaixo).")
+
+    # p50/p95 por intervalo, do maior tempo total para o menor
+    st.dataframe(perf.span_stats(runs), use_container_width=True, hide_index=True)
+
+    # Árvore de uma execução
+    options = list(range(len(runs) - 1, -1, -1))
+    selected = st.selectbox(
+        "Execução",
+        options,
+        format_func=lambda i: (
+            f"{datetime.fromtimestamp(runs[i]['inicio']):%H:%M:%S} · {runs[i]['execucao']} · "
+            f"{runs[i]['duracao_ms']:.0f} ms · {runs[i]['thread']}"
+        )
+    )
+    st.dataframe(perf.run_tree(runs[selected]), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Exportar execuções (JSON lines)",
+            data=perf.export_jsonl(runs),
+            file_name=f"dashboard_perf_{datetime.now():%Y%m%d_%H%M%S}.jsonl",
+            mime="application/jsonl"
+        )
+    with col2:
+        if st.button("Limpar medições"):
+            perf.recorder.clear()
+            rerun = getattr(st, 'rerun', None) or st.experimental_rerun
+            rerun()
+
+
+def show_profile_result(result, key_prefix="perfil"):
+    """
+    Exibe as funções com mais tempo de um perfil e os arquivos gerados.
+
+    Args:
+        result: ProfileResult de utils/profiler.py
+        key_prefix: Prefixo das chaves dos botões (um por perfil exibido)
+    """
+    started = datetime.fromtimestamp(result.started_at)
+    with st.expander(f"Perfil da execução · {result.label} · {started:%H:%M:%S}", expanded=True):
+        st.caption(
+            f"{result.elapsed * 1000:.0f} ms · {result.sample_count} amostras. "
+            "Tempo próprio: na própria função; acumulado: incluindo as funções chamadas."
+        )
+        if result.error:
+            st.warning(result.error)
+        elif result.files:
+            st.caption("Arquivos: " + " · ".join(result.files))
+        st.dataframe(result.hotspots(), use_container_width=True, hide_index=True)
+
+        stamp = f"{started:%Y%m%d_%H%M%S}"
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="Baixar perfil (speedscope)",
+                data=json.dumps(result.profiler.to_speedscope(f"{result.label} {stamp}")),
+                file_name=f"perfil_{stamp}.speedscope.json",
+                mime="application/json",
+                key=f"{key_prefix}_speedscope"
+            )
+        with col2:
+            st.download_button(
+                label="Baixar pilhas colapsadas (flame graph)",
+                data=result.profiler.to_collapsed(),
+                file_name=f"perfil_{stamp}.collapsed.txt",
+                mime="text/plain",
+                key=f"{key_prefix}_collapsed"
+            )
+
+
+def show_profiler_panel():
+    """Exibe o pedido de perfil e os perfis recentes (utils/profiler.py)."""
+    st.markdown("<h3> Perfil de execução</h3>", unsafe_allow_html=True)
+    st.caption(
+        "Perfila uma única execução completa do app (também com ?profile=1 junto com ?admin na URL). "
+        "Escolha a página e os filtros em seguida: a próxima interação é perfilada."
+    )
+    if st.button("Perfilar a próxima execução"):
+        st.session_state['profile_next'] = True
+    if st.session_state.get('profile_next'):
+        st.info("A próxima execução desta sessão será perfilada.")
+
+    profiles = recent_profiles()
+    if not profiles:
+        return
+    selected = st.selectbox(
+        "Perfis recentes",
+        range(len(profiles)),
+        format_func=lambda i: (
+            f"{datetime.fromtimestamp(profiles[i].started_at):%H:%M:%S} · {profiles[i].label} · "
+            f"{profiles[i].elapsed * 1000:.0f} ms"
+        )
+    )
+    show_profile_result(profiles[selected], key_prefix="perfil_recente")
+
+
+def _mb(value):
+    """Bytes em MB para exibição."""
+    return "-" if value is None else f"{value / 2**20:,.1f} MB"
+
+
+def show_memory_panel(data):
+    """
+    Exibe a memória dos DataFrames, caches e sessões (utils/memory.py).
+
+    Args:
+        data: Dicionário com os DataFrames carregados
+    """
+    st.markdown("<h3> Memória</h3>", unsafe_allow_html=True)
+
+    process = memory.process_memory()
+    frames = memory.frame_sizes(data)
+    caches = memory.cache_data_sizes()
+    sessions = memory.session_state_sizes()
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("RSS do processo", _mb(process['rss_bytes']))
+    col2.metric("Pico de RSS", _mb(process['pico_bytes']))
+    col3.metric("DataFrames carregados", _mb(frames['bytes'].sum()))
+    col4.metric("Caches", _mb(caches['bytes'].sum()))
+
+    for title, report in (("DataFrames carregados (memory_usage deep)", frames),
+                          ("Caches por função (st.cache_data e figuras)", caches),
+                          (f"st.session_state por sessão ({len(sessions)} ativas)", sessions)):
+        st.markdown(f"**{title}**")
+        report = report.assign(mb=(report['bytes'] / 2**20).round(2))
+        st.dataframe(report, use_container_width=True, hide_index=True)
+
+    # Comparação de snapshots do tracemalloc
+    st.markdown("**Rastreamento de alocações (tracemalloc)**")
+    tracker = memory.tracker
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if tracker.running:
+            if st.button("Parar rastreamento"):
+                tracker.stop()
+        elif st.button("Iniciar rastreamento"):
+            tracker.start()
+    with col2:
+        if tracker.running and st.button("Comparar agora"):
+            diff = tracker.compare()
+            if diff is not None:
+                print(memory.format_diff(diff), flush=True)
+    with col3:
+        st.caption(
+            f"Comparação automática a cada {tracker.interval:.0f} s, gravada na saída do servidor."
+            if tracker.running else "Rastreamento parado (as alocações ficam mais lentas quando ativo)."
+        )
+
+    if tracker.history:
+        diff = tracker.history[-1]
+        st.caption(
+            f"Última comparação: {datetime.fromtimestamp(diff['momento']):%H:%M:%S} · "
+            f"rastreado {_mb(diff['rastreado_bytes'])} · pico {_mb(diff['pico_rastreado_bytes'])}"
+        )
+        st.dataframe(diff['linhas'], use_container_width=True, hide_index=True)
+
+
+def show(data):
+    """
+    Exibe o painel de administração (oculto no menu, ver app.admin_mode).
+
+    Args:
+        data: Dicionário com DataFrames (usado na contabilidade de memória)
+    """
+    st.markdown("<h2 style='text-align: center;'> Administração</h2>", unsafe_allow_html=True)
+    st.markdown("<hr>", unsafe_allow_html=True)
+
+    show_perf_panel()
+    st.markdown("<hr>", unsafe_allow_html=True)
+    show_profiler_panel()
+    st.markdown("<hr>", unsafe_allow_html=True)
+    show_memory_panel(data)
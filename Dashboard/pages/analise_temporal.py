@@ -3,18 +3,23 @@ import pandas as pd
 import numpy as np
 import traceback
 from datetime import datetime, timedelta
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import calendar
 from typing import Dict, Optional, Tuple, List
 
 # Importar funções utilitárias
+from utils.lazy import lazy_import
+from utils.perf import timed
 from utils.loaders import prepare_data_for_time_analysis, prepare_fraud_trend_data
+from utils.datasets import dataset
 from utils.graphics import create_time_heatmap, create_time_series, create_bar_chart
 from utils.filters import create_date_range_filter
 from config.style_config import create_kpi_card, create_insight_box, create_tooltip
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
 
 class TemporalAnalyzer:
     """Classe para análise temporal de fraudes com métodos organizados e reutilizáveis."""
@@ -29,11 +34,11 @@ class TemporalAnalyzer:
         """Prepara e valida os dados para análise."""
         try:
             self.df_fraud_time = prepare_data_for_time_analysis(
-                self.data.get('fraud_time')
+                dataset(self.data, 'fraud_time')
             ) if 'fraud_time' in self.data else None
             
             self.df_fraud_trend = prepare_fraud_trend_data(
-                self.data.get('fraud_trend')
+                dataset(self.data, 'fraud_trend')
             ) if 'fraud_trend' in self.data else None
             
             # Enriquecer dados com colunas temporais
@@ -400,6 +405,7 @@ def create_export_functionality(analyzer: TemporalAnalyzer):
                 mime="text/markdown"
             )
 
+@timed
 def show(data):
     """
     Função principal para exibir a análise temporal de fraudes.
@@ -1,7 +1,10 @@
 import streamlit as st
-import plotly.express as px
+from utils.lazy import lazy_import
 from utils.loaders import load_data_from_db  # Corrigido para usar a função correta
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
 def carregar():
     st.title(" Análises Avançadas de Entregas")
 
@@ -1,14 +1,19 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 
 # Utilitários customizados do seu projeto
+from utils.lazy import lazy_import
+from utils.perf import timed
 from utils.graphics import create_pie_chart, create_bar_chart, create_treemap, create_scatter_plot
 from utils.filters import create_category_filter
 from config.style_config import create_kpi_card, create_insight_box
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
+@timed
 def show(data):
     """
     Exibe análise avançada de produtos e categorias com maior incidência de fraudes.
@@ -1,14 +1,19 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 
 # Importar funções utilitárias
+from utils.lazy import lazy_import
+from utils.perf import timed
 from utils.graphics import create_sankey_diagram, create_bar_chart, create_pie_chart
 from utils.filters import create_category_filter, create_region_filter
 from config.style_config import create_kpi_card, create_insight_box, create_tooltip
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
+@timed
 def show(data):
     """
     Exibe o diagnóstico detalhado de responsabilidade e impacto das fraudes.
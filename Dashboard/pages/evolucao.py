@@ -4,16 +4,22 @@ import numpy as np
 import traceback
 
 from datetime import datetime, timedelta
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 # Importar funções utilitárias
+from utils.lazy import lazy_import
+from utils.perf import timed
 from utils.loaders import prepare_fraud_trend_data
+from utils.datasets import dataset
 from utils.graphics import create_time_series, create_bar_chart
 from utils.filters import create_date_range_filter
 from config.style_config import create_kpi_card, create_insight_box, create_tooltip
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
+@timed
 def show(data):
     """
     Exibe a evolução e tendências das fraudes ao longo do tempo.
@@ -34,7 +40,7 @@ def show(data):
             return
         
         # Preparar dados
-        df_trend = prepare_fraud_trend_data(data['fraud_trend'])
+        df_trend = prepare_fraud_trend_data(dataset(data, 'fraud_trend'))
         
         # Verificar se temos a coluna de data
         if 'date' not in df_trend.columns:
@@ -1,16 +1,283 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 # Importar funções utilitárias
-from utils.loaders import detect_anomalies
+from utils.lazy import lazy_import
+from utils.perf import timed
+from utils.loaders import cluster_dataset, detect_anomalies
+from utils.datasets import dataset
+from utils.fragments import fragment
 from utils.graphics import create_correlation_matrix, create_scatter_plot, create_bar_chart
-from utils.filters import cluster_data, filter_suspicious_entries
+from utils.filters import filter_suspicious_entries
 from config.style_config import create_kpi_card, create_insight_box, create_tooltip
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
+@fragment
+def show_cluster_analysis(data, datasets):
+    """
+    Exibe a análise de clusters do conjunto de dados selecionado.
+    
+    Args:
+        data: Dicionário com DataFrames para análise
+        datasets: Conjuntos de dados disponíveis para seleção
+    """
+    df_drivers = data.get('drivers')
+    df_suspicious_drivers = data.get('suspicious_drivers')
+    df_missing_products = data.get('missing_products')
+    df_suspicious_customers = data.get('suspicious_customers')
+    
+    # Seleção do dataset
+    selected_dataset = st.selectbox("Conjunto de Dados", datasets, key="cluster_dataset")
+    
+    # Preparar dataframe conforme seleção
+    if selected_dataset == "Entregadores (Todos)" and df_drivers is not None:
+        source = 'drivers'
+        df_for_cluster = df_drivers
+        id_col = 'driver_id' if 'driver_id' in df_drivers.columns else None
+        name_col = 'driver_name' if 'driver_name' in df_drivers.columns else None
+    elif selected_dataset == "Entregadores (Suspeitos)" and df_suspicious_drivers is not None:
+        source = 'suspicious_drivers'
+        df_for_cluster = df_suspicious_drivers
+        id_col = 'driver_id' if 'driver_id' in df_suspicious_drivers.columns else None
+        name_col = 'driver_name' if 'driver_name' in df_suspicious_drivers.columns else None
+    elif selected_dataset == "Produtos" and df_missing_products is not None:
+        source = 'missing_products'
+        df_for_cluster = df_missing_products
+        id_col = 'product_id' if 'product_id' in df_missing_products.columns else None
+        name_col = 'product_name' if 'product_name' in df_missing_products.columns else None
+    elif selected_dataset == "Clientes Suspeitos" and df_suspicious_customers is not None:
+        source = 'suspicious_customers'
+        df_for_cluster = df_suspicious_customers
+        id_col = 'customer_id' if 'customer_id' in df_suspicious_customers.columns else None
+        name_col = 'customer_name' if 'customer_name' in df_suspicious_customers.columns else None
+    else:
+        source = None
+        df_for_cluster = None
+        id_col = None
+        name_col = None
+    
+    if df_for_cluster is None or df_for_cluster.empty:
+        st.warning(f"O conjunto de dados '{selected_dataset}' não possui dados suficientes para clusterização.")
+    else:
+        # Selecionar variáveis numéricas
+        numeric_cols = df_for_cluster.select_dtypes(include='number').columns.tolist()
+        
+        if len(numeric_cols) < 2:
+            st.warning(f"O conjunto de dados '{selected_dataset}' não possui variáveis numéricas suficientes para clusterização.")
+        else:
+            # Seleção de variáveis para clusterização
+            st.markdown("<h4>Selecione as variáveis para clusterização:</h4>", unsafe_allow_html=True)
+            
+            # Remover colunas de ID da lista de opções
+            id_cols_to_remove = ['driver_id', 'product_id', 'customer_id', 'id']
+            cluster_vars = [col for col in numeric_cols if col not in id_cols_to_remove]
+            
+            if len(cluster_vars) < 2:
+                st.warning("Não há variáveis numéricas suficientes para clusterização após remover colunas de ID.")
+            else:
+                # Limitar a 4 variáveis para simplicidade
+                max_vars = min(4, len(cluster_vars))
+                
+                # Sugerir variáveis relevantes baseadas no dataset
+                default_vars = []
+                
+                if selected_dataset == "Entregadores (Todos)" or selected_dataset == "Entregadores (Suspeitos)":
+                    potential_vars = ['percentual_fraude', 'media_itens_faltantes', 'total_entregas', 'age', 
+                                    'missing_ratio', 'problem_order_ratio', 'avg_missing_items']
+                    for var in potential_vars:
+                        if var in cluster_vars and len(default_vars) < max_vars:
+                            default_vars.append(var)
+                elif selected_dataset == "Produtos":
+                    potential_vars = ['total_relatos', 'price', 'valor_total_perdido']
+                    for var in potential_vars:
+                        if var in cluster_vars and len(default_vars) < max_vars:
+                            default_vars.append(var)
+                elif selected_dataset == "Clientes Suspeitos":
+                    potential_vars = ['percentual_fraude', 'media_itens_faltantes', 'total_pedidos', 'customer_age']
+                    for var in potential_vars:
+                        if var in cluster_vars and len(default_vars) < max_vars:
+                            default_vars.append(var)
+                
+                # Se não conseguimos preencher com variáveis sugeridas, pegar as primeiras disponíveis
+                while len(default_vars) < 2:
+                    for var in cluster_vars:
+                        if var not in default_vars:
+                            default_vars.append(var)
+                            if len(default_vars) == 2:
+                                break
+                
+                # Variáveis e número de clusters aplicados juntos ao enviar o
+                # formulário: a clusterização só é refeita no envio
+                with st.form("cluster_params"):
+                    selected_vars = st.multiselect(
+                        "Variáveis para Clusterização",
+                        options=cluster_vars,
+                        default=default_vars[:2]
+                    )
+                    
+                    num_clusters = st.slider("Número de Clusters", min_value=2, max_value=7, value=3)
+                    
+                    st.form_submit_button("Aplicar clusterização")
+                
+                if len(selected_vars) < 2:
+                    st.warning("Selecione pelo menos 2 variáveis para clusterização.")
+                else:
+                    # Aplicar clusterização (resultado em cache por conjunto, variáveis e clusters)
+                    try:
+                        df_clustered = cluster_dataset(dataset(data, source), tuple(selected_vars), num_clusters)
+                        
+                        if 'cluster' not in df_clustered.columns:
+                            st.error("Falha ao criar clusters. Verifique os dados e tente novamente.")
+                        else:
+                            # Visualizar resultados da clusterização
+                            st.markdown("<h4>Resultados da Clusterização:</h4>", unsafe_allow_html=True)
+                            
+                            # Mostrar contagem por cluster
+                            cluster_counts = df_clustered['cluster'].value_counts().reset_index()
+                            cluster_counts.columns = ['Cluster', 'Contagem']
+                            
+                            # Criar gráfico de barras para contagem de clusters
+                            fig = create_bar_chart(
+                                cluster_counts,
+                                'Cluster',
+                                'Contagem',
+                                'Distribuição por Cluster'
+                            )
+                            
+                            st.plotly_chart(fig, use_container_width=True)
+                            
+                            # Mostrar médias das variáveis por cluster
+                            cluster_means = df_clustered.groupby('cluster')[selected_vars].mean().reset_index()
+                            
+                            # Formatar tabela para exibição
+                            st.markdown("<h4>Características dos Clusters:</h4>", unsafe_allow_html=True)
+                            
+                            # Adicionar percentual do total para cada cluster
+                            total_items = len(df_clustered)
+                            cluster_means['percentual'] = cluster_counts['Contagem'] / total_items * 100
+                            
+                            # Renomear colunas para exibição
+                            display_cols = ['cluster'] + selected_vars + ['percentual']
+                            display_df = cluster_means[display_cols].copy()
+                            
+                            rename_map = {
+                                'cluster': 'Cluster',
+                                'percentual': 'Percentual (%)'
+                            }
+                            
+                            for var in selected_vars:
+                                rename_map[var] = var.replace('_', ' ').title()
+                            
+                            display_df = display_df.rename(columns=rename_map)
+                            
+                            # Formatar números
+                            for col in display_df.columns:
+                                if col != 'Cluster':
+                                    display_df[col] = display_df[col].apply(lambda x: f"{x:.2f}")
+                            
+                            st.dataframe(display_df, use_container_width=True)
+                            
+                            # Visualização 2D dos clusters
+                            if len(selected_vars) >= 2:
+                                st.markdown("<h4>Visualização dos Clusters:</h4>", unsafe_allow_html=True)
+                                
+                                # Seleção de variáveis para visualização
+                                col1, col2 = st.columns(2)
+                                
+                                with col1:
+                                    x_var = st.selectbox("Variável X", selected_vars, index=0)
+                                
+                                with col2:
+                                    remaining_vars = [var for var in selected_vars if var != x_var]
+                                    y_var = st.selectbox("Variável Y", remaining_vars, index=0)
+                                
+                                # Criar scatter plot com clusters
+                                fig = px.scatter(
+                                    df_clustered,
+                                    x=x_var,
+                                    y=y_var,
+                                    color='cluster',
+                                    hover_name=name_col if name_col in df_clustered.columns else None,
+                                    title=f'Visualização de Clusters: {x_var.replace("_", " ").title()} vs {y_var.replace("_", " ").title()}',
+                                    color_continuous_scale=px.colors.sequential.Viridis
+                                )
+                                
+                                fig.update_layout(
+                                    xaxis_title=x_var.replace("_", " ").title(),
+                                    yaxis_title=y_var.replace("_", " ").title(),
+                                    legend_title="Cluster",
+                                    font=dict(family="sans serif"),
+                                    paper_bgcolor='rgba(0,0,0,0)',
+                                    plot_bgcolor='rgba(0,0,0,0)',
+                                )
+                                
+                                st.plotly_chart(fig, use_container_width=True)
+                                
+                                # Identificar características de cada cluster
+                                st.markdown("<h4>Interpretação dos Clusters:</h4>", unsafe_allow_html=True)
+                                
+                                for i in range(num_clusters):
+                                    cluster_data = cluster_means[cluster_means['cluster'] == i]
+                                    
+                                    if not cluster_data.empty:
+                                        # Criar uma descrição do cluster
+                                        cluster_size = cluster_counts[cluster_counts['Cluster'] == i]['Contagem'].values[0]
+                                        cluster_pct = cluster_size / total_items * 100
+                                        
+                                        description = f"**Cluster {i}** ({cluster_size} itens, {cluster_pct:.1f}% do total):"
+                                        
+                                        # Determinar características distintivas
+                                        traits = []
+                                        
+                                        for var in selected_vars:
+                                            var_mean = cluster_data[var].values[0]
+                                            overall_mean = df_clustered[var].mean()
+                                            
+                                            # Verificar se o valor é significativamente diferente da média geral
+                                            if var_mean > overall_mean * 1.2:
+                                                traits.append(f"**{var.replace('_', ' ').title()}** é **alto** ({var_mean:.2f} vs média de {overall_mean:.2f})")
+                                            elif var_mean < overall_mean * 0.8:
+                                                traits.append(f"**{var.replace('_', ' ').title()}** é **baixo** ({var_mean:.2f} vs média de {overall_mean:.2f})")
+                                        
+                                        # Criar interpretação baseada no dataset
+                                        interpretation = ""
+                                        
+                                        if selected_dataset == "Entregadores (Todos)" or selected_dataset == "Entregadores (Suspeitos)":
+                                            if any("fraude" in trait.lower() for trait in traits) or any("faltantes" in trait.lower() for trait in traits):
+                                                if any("alto" in trait for trait in traits):
+                                                    interpretation = "Este grupo de entregadores apresenta **alto risco** e merece atenção prioritária."
+                                                else:
+                                                    interpretation = "Este grupo de entregadores apresenta **baixo risco** e parece seguir os procedimentos corretamente."
+                                        elif selected_dataset == "Produtos":
+                                            if any("relatos" in trait.lower() for trait in traits):
+                                                if any("alto" in trait for trait in traits):
+                                                    interpretation = "Esta categoria de produtos é **frequentemente alvo** de fraudes e requer protocolos especiais de verificação."
+                                                else:
+                                                    interpretation = "Esta categoria de produtos é **raramente alvo** de fraudes."
+                                        elif selected_dataset == "Clientes Suspeitos":
+                                            if any("fraude" in trait.lower() for trait in traits) or any("faltantes" in trait.lower() for trait in traits):
+                                                if any("alto" in trait for trait in traits):
+                                                    interpretation = "Este grupo de clientes apresenta **padrão suspeito** de reclamações de itens não entregues."
+                                                else:
+                                                    interpretation = "Este grupo de clientes apresenta **padrão normal** de reclamações."
+                                        
+                                        # Exibir descrição completa
+                                        st.markdown(description)
+                                        for trait in traits:
+                                            st.markdown(f"- {trait}")
+                                        if interpretation:
+                                            st.markdown(f"- *{interpretation}*")
+                                        st.markdown("")  # Linha em branco entre clusters
+                    except Exception as e:
+                        st.error(f"Erro ao realizar clusterização: {e}")
+                        st.info("Tente selecionar outras variáveis ou reduzir o número de clusters.")
+
+@timed
 def show(data):
     """
     Exibe padrões ocultos e anomalias nos dados de fraude.
@@ -81,19 +348,19 @@ def show(data):
             
             # Preparar dataframe conforme seleção
             if selected_dataset == "Entregadores (Todos)" and df_drivers is not None:
-                df_for_corr = df_drivers.select_dtypes(include=['int64', 'float64'])
+                df_for_corr = df_drivers.select_dtypes(include='number')
             elif selected_dataset == "Entregadores (Suspeitos)" and df_suspicious_drivers is not None:
-                df_for_corr = df_suspicious_drivers.select_dtypes(include=['int64', 'float64'])
+                df_for_corr = df_suspicious_drivers.select_dtypes(include='number')
             elif selected_dataset == "Produtos" and df_missing_products is not None:
-                df_for_corr = df_missing_products.select_dtypes(include=['int64', 'float64'])
+                df_for_corr = df_missing_products.select_dtypes(include='number')
             elif selected_dataset == "Tendências Temporais" and df_fraud_trend is not None:
                 # Excluir a coluna de data para correlação
                 if 'date' in df_fraud_trend.columns:
-                    df_for_corr = df_fraud_trend.drop('date', axis=1).select_dtypes(include=['int64', 'float64'])
+                    df_for_corr = df_fraud_trend.drop('date', axis=1).select_dtypes(include='number')
                 else:
-                    df_for_corr = df_fraud_trend.select_dtypes(include=['int64', 'float64'])
+                    df_for_corr = df_fraud_trend.select_dtypes(include='number')
             elif selected_dataset == "Clientes Suspeitos" and df_suspicious_customers is not None:
-                df_for_corr = df_suspicious_customers.select_dtypes(include=['int64', 'float64'])
+                df_for_corr = df_suspicious_customers.select_dtypes(include='number')
             else:
                 df_for_corr = None
             
@@ -225,243 +492,7 @@ def show(data):
         if not datasets:
             st.warning("Nenhum conjunto de dados disponível para análise de clusters.")
         else:
-            # Seleção do dataset
-            selected_dataset = st.selectbox("Conjunto de Dados", datasets, key="cluster_dataset")
-            
-            # Preparar dataframe conforme seleção
-            if selected_dataset == "Entregadores (Todos)" and df_drivers is not None:
-                df_for_cluster = df_drivers.copy()
-                id_col = 'driver_id' if 'driver_id' in df_drivers.columns else None
-                name_col = 'driver_name' if 'driver_name' in df_drivers.columns else None
-            elif selected_dataset == "Entregadores (Suspeitos)" and df_suspicious_drivers is not None:
-                df_for_cluster = df_suspicious_drivers.copy()
-                id_col = 'driver_id' if 'driver_id' in df_suspicious_drivers.columns else None
-                name_col = 'driver_name' if 'driver_name' in df_suspicious_drivers.columns else None
-            elif selected_dataset == "Produtos" and df_missing_products is not None:
-                df_for_cluster = df_missing_products.copy()
-                id_col = 'product_id' if 'product_id' in df_missing_products.columns else None
-                name_col = 'product_name' if 'product_name' in df_missing_products.columns else None
-            elif selected_dataset == "Clientes Suspeitos" and df_suspicious_customers is not None:
-                df_for_cluster = df_suspicious_customers.copy()
-                id_col = 'customer_id' if 'customer_id' in df_suspicious_customers.columns else None
-                name_col = 'customer_name' if 'customer_name' in df_suspicious_customers.columns else None
-            else:
-                df_for_cluster = None
-                id_col = None
-                name_col = None
-            
-            if df_for_cluster is None or df_for_cluster.empty:
-                st.warning(f"O conjunto de dados '{selected_dataset}' não possui dados suficientes para clusterização.")
-            else:
-                # Selecionar variáveis numéricas
-                numeric_cols = df_for_cluster.select_dtypes(include=['int64', 'float64']).columns.tolist()
-                
-                if len(numeric_cols) < 2:
-                    st.warning(f"O conjunto de dados '{selected_dataset}' não possui variáveis numéricas suficientes para clusterização.")
-                else:
-                    # Seleção de variáveis para clusterização
-                    st.markdown("<h4>Selecione as variáveis para clusterização:</h4>", unsafe_allow_html=True)
-                    
-                    # Remover colunas de ID da lista de opções
-                    id_cols_to_remove = ['driver_id', 'product_id', 'customer_id', 'id']
-                    cluster_vars = [col for col in numeric_cols if col not in id_cols_to_remove]
-                    
-                    if len(cluster_vars) < 2:
-                        st.warning("Não há variáveis numéricas suficientes para clusterização após remover colunas de ID.")
-                    else:
-                        # Limitar a 4 variáveis para simplicidade
-                        max_vars = min(4, len(cluster_vars))
-                        
-                        # Sugerir variáveis relevantes baseadas no dataset
-                        default_vars = []
-                        
-                        if selected_dataset == "Entregadores (Todos)" or selected_dataset == "Entregadores (Suspeitos)":
-                            potential_vars = ['percentual_fraude', 'media_itens_faltantes', 'total_entregas', 'age', 
-                                            'missing_ratio', 'problem_order_ratio', 'avg_missing_items']
-                            for var in potential_vars:
-                                if var in cluster_vars and len(default_vars) < max_vars:
-                                    default_vars.append(var)
-                        elif selected_dataset == "Produtos":
-                            potential_vars = ['total_relatos', 'price', 'valor_total_perdido']
-                            for var in potential_vars:
-                                if var in cluster_vars and len(default_vars) < max_vars:
-                                    default_vars.append(var)
-                        elif selected_dataset == "Clientes Suspeitos":
-                            potential_vars = ['percentual_fraude', 'media_itens_faltantes', 'total_pedidos', 'customer_age']
-                            for var in potential_vars:
-                                if var in cluster_vars and len(default_vars) < max_vars:
-                                    default_vars.append(var)
-                        
-                        # Se não conseguimos preencher com variáveis sugeridas, pegar as primeiras disponíveis
-                        while len(default_vars) < 2:
-                            for var in cluster_vars:
-                                if var not in default_vars:
-                                    default_vars.append(var)
-                                    if len(default_vars) == 2:
-                                        break
-                        
-                        # Permitir seleção de variáveis
-                        selected_vars = st.multiselect(
-                            "Variáveis para Clusterização",
-                            options=cluster_vars,
-                            default=default_vars[:2]
-                        )
-                        
-                        if len(selected_vars) < 2:
-                            st.warning("Selecione pelo menos 2 variáveis para clusterização.")
-                        else:
-                            # Seleção do número de clusters
-                            num_clusters = st.slider("Número de Clusters", min_value=2, max_value=7, value=3)
-                            
-                            # Aplicar clusterização
-                            try:
-                                df_clustered = cluster_data(df_for_cluster, selected_vars, n_clusters=num_clusters)
-                                
-                                if 'cluster' not in df_clustered.columns:
-                                    st.error("Falha ao criar clusters. Verifique os dados e tente novamente.")
-                                else:
-                                    # Visualizar resultados da clusterização
-                                    st.markdown("<h4>Resultados da Clusterização:</h4>", unsafe_allow_html=True)
-                                    
-                                    # Mostrar contagem por cluster
-                                    cluster_counts = df_clustered['cluster'].value_counts().reset_index()
-                                    cluster_counts.columns = ['Cluster', 'Contagem']
-                                    
-                                    # Criar gráfico de barras para contagem de clusters
-                                    fig = create_bar_chart(
-                                        cluster_counts,
-                                        'Cluster',
-                                        'Contagem',
-                                        'Distribuição por Cluster'
-                                    )
-                                    
-                                    st.plotly_chart(fig, use_container_width=True)
-                                    
-                                    # Mostrar médias das variáveis por cluster
-                                    cluster_means = df_clustered.groupby('cluster')[selected_vars].mean().reset_index()
-                                    
-                                    # Formatar tabela para exibição
-                                    st.markdown("<h4>Características dos Clusters:</h4>", unsafe_allow_html=True)
-                                    
-                                    # Adicionar percentual do total para cada cluster
-                                    total_items = len(df_clustered)
-                                    cluster_means['percentual'] = cluster_counts['Contagem'] / total_items * 100
-                                    
-                                    # Renomear colunas para exibição
-                                    display_cols = ['cluster'] + selected_vars + ['percentual']
-                                    display_df = cluster_means[display_cols].copy()
-                                    
-                                    rename_map = {
-                                        'cluster': 'Cluster',
-                                        'percentual': 'Percentual (%)'
-                                    }
-                                    
-                                    for var in selected_vars:
-                                        rename_map[var] = var.replace('_', ' ').title()
-                                    
-                                    display_df = display_df.rename(columns=rename_map)
-                                    
-                                    # Formatar números
-                                    for col in display_df.columns:
-                                        if col != 'Cluster':
-                                            display_df[col] = display_df[col].apply(lambda x: f"{x:.2f}")
-                                    
-                                    st.dataframe(display_df, use_container_width=True)
-                                    
-                                    # Visualização 2D dos clusters
-                                    if len(selected_vars) >= 2:
-                                        st.markdown("<h4>Visualização dos Clusters:</h4>", unsafe_allow_html=True)
-                                        
-                                        # Seleção de variáveis para visualização
-                                        col1, col2 = st.columns(2)
-                                        
-                                        with col1:
-                                            x_var = st.selectbox("Variável X", selected_vars, index=0)
-                                        
-                                        with col2:
-                                            remaining_vars = [var for var in selected_vars if var != x_var]
-                                            y_var = st.selectbox("Variável Y", remaining_vars, index=0)
-                                        
-                                        # Criar scatter plot com clusters
-                                        fig = px.scatter(
-                                            df_clustered,
-                                            x=x_var,
-                                            y=y_var,
-                                            color='cluster',
-                                            hover_name=name_col if name_col in df_clustered.columns else None,
-                                            title=f'Visualização de Clusters: {x_var.replace("_", " ").title()} vs {y_var.replace("_", " ").title()}',
-                                            color_continuous_scale=px.colors.sequential.Viridis
-                                        )
-                                        
-                                        fig.update_layout(
-                                            xaxis_title=x_var.replace("_", " ").title(),
-                                            yaxis_title=y_var.replace("_", " ").title(),
-                                            legend_title="Cluster",
-                                            font=dict(family="sans serif"),
-                                            paper_bgcolor='rgba(0,0,0,0)',
-                                            plot_bgcolor='rgba(0,0,0,0)',
-                                        )
-                                        
-                                        st.plotly_chart(fig, use_container_width=True)
-                                        
-                                        # Identificar características de cada cluster
-                                        st.markdown("<h4>Interpretação dos Clusters:</h4>", unsafe_allow_html=True)
-                                        
-                                        for i in range(num_clusters):
-                                            cluster_data = cluster_means[cluster_means['cluster'] == i]
-                                            
-                                            if not cluster_data.empty:
-                                                # Criar uma descrição do cluster
-                                                cluster_size = cluster_counts[cluster_counts['Cluster'] == i]['Contagem'].values[0]
-                                                cluster_pct = cluster_size / total_items * 100
-                                                
-                                                description = f"**Cluster {i}** ({cluster_size} itens, {cluster_pct:.1f}% do total):"
-                                                
-                                                # Determinar características distintivas
-                                                traits = []
-                                                
-                                                for var in selected_vars:
-                                                    var_mean = cluster_data[var].values[0]
-                                                    overall_mean = df_clustered[var].mean()
-                                                    
-                                                    # Verificar se o valor é significativamente diferente da média geral
-                                                    if var_mean > overall_mean * 1.2:
-                                                        traits.append(f"**{var.replace('_', ' ').title()}** é **alto** ({var_mean:.2f} vs média de {overall_mean:.2f})")
-                                                    elif var_mean < overall_mean * 0.8:
-                                                        traits.append(f"**{var.replace('_', ' ').title()}** é **baixo** ({var_mean:.2f} vs média de {overall_mean:.2f})")
-                                                
-                                                # Criar interpretação baseada no dataset
-                                                interpretation = ""
-                                                
-                                                if selected_dataset == "Entregadores (Todos)" or selected_dataset == "Entregadores (Suspeitos)":
-                                                    if any("fraude" in trait.lower() for trait in traits) or any("faltantes" in trait.lower() for trait in traits):
-                                                        if any("alto" in trait for trait in traits):
-                                                            interpretation = "Este grupo de entregadores apresenta **alto risco** e merece atenção prioritária."
-                                                        else:
-                                                            interpretation = "Este grupo de entregadores apresenta **baixo risco** e parece seguir os procedimentos corretamente."
-                                                elif selected_dataset == "Produtos":
-                                                    if any("relatos" in trait.lower() for trait in traits):
-                                                        if any("alto" in trait for trait in traits):
-                                                            interpretation = "Esta categoria de produtos é **frequentemente alvo** de fraudes e requer protocolos especiais de verificação."
-                                                        else:
-                                                            interpretation = "Esta categoria de produtos é **raramente alvo** de fraudes."
-                                                elif selected_dataset == "Clientes Suspeitos":
-                                                    if any("fraude" in trait.lower() for trait in traits) or any("faltantes" in trait.lower() for trait in traits):
-                                                        if any("alto" in trait for trait in traits):
-                                                            interpretation = "Este grupo de clientes apresenta **padrão suspeito** de reclamações de itens não entregues."
-                                                        else:
-                                                            interpretation = "Este grupo de clientes apresenta **padrão normal** de reclamações."
-                                                
-                                                # Exibir descrição completa
-                                                st.markdown(description)
-                                                for trait in traits:
-                                                    st.markdown(f"- {trait}")
-                                                if interpretation:
-                                                    st.markdown(f"- *{interpretation}*")
-                                                st.markdown("")  # Linha em branco entre clusters
-                            except Exception as e:
-                                st.error(f"Erro ao realizar clusterização: {e}")
-                                st.info("Tente selecionar outras variáveis ou reduzir o número de clusters.")
+            show_cluster_analysis(data, datasets)
     
     # Aba 3: Padrões Sequenciais
     with tab3:
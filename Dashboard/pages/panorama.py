@@ -2,15 +2,21 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 # Importar funções utilitárias
+from utils.lazy import lazy_import
+from utils.perf import timed
 from utils.loaders import prepare_fraud_trend_data, prepare_region_data
+from utils.datasets import dataset
+from utils.fragments import fragment
 from utils.graphics import create_time_series, create_pie_chart, create_gauge_chart, create_bar_chart
 from config.style_config import create_kpi_card, create_insight_box, create_tooltip
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
 def create_case_introduction():
     """
     Cria uma introdução completa sobre o case de detecção de fraudes do Walmart
@@ -457,7 +463,7 @@ def create_driver_product_analysis(df_drivers, df_products=None, df_fraud_detail
         text=fraud_matrix_filtered.values,
         texttemplate="%{text}",
         textfont={"size": 10},
-        hoveremplate='<b>Motorista:</b> %{y}<br><b>Produto:</b> %{x}<br><b>Fraudes:</b> %{z}<extra></extra>'
+        hovertemplate='<b>Motorista:</b> %{y}<br><b>Produto:</b> %{x}<br><b>Fraudes:</b> %{z}<extra></extra>'
     ))
     
     fig_heatmap.update_layout(
@@ -578,6 +584,303 @@ def create_individual_driver_report(df_fraud_details, selected_driver):
     
     return fig, product_summary
 
+@fragment
+def show_driver_details(driver_details_df):
+    """
+    Exibe a tabela detalhada por motorista com seus filtros.
+    
+    Args:
+        driver_details_df: DataFrame de detalhes por motorista
+    """
+    st.markdown("#### Tabela Detalhada por Motorista")
+    
+    # Filtros (aplicados juntos ao enviar o formulário)
+    with st.form("driver_details_filters"):
+        col_filter1, col_filter2 = st.columns(2)
+        
+        with col_filter1:
+            min_frauds = st.number_input(
+                "Mínimo de fraudes totais",
+                min_value=0,
+                max_value=int(driver_details_df['Total de Fraudes'].max()),
+                value=0,
+                key="details_min_frauds"
+            )
+        
+        with col_filter2:
+            min_variety = st.number_input(
+                "Mínimo de produtos diferentes",
+                min_value=1,
+                max_value=int(driver_details_df['Variedade de Produtos'].max()),
+                value=1,
+                key="details_min_variety"
+            )
+        
+        st.form_submit_button("Aplicar filtros")
+    
+    # Filtrar dados
+    filtered_details = driver_details_df[
+        (driver_details_df['Total de Fraudes'] >= min_frauds) &
+        (driver_details_df['Variedade de Produtos'] >= min_variety)
+    ]
+    
+    if not filtered_details.empty:
+        st.dataframe(filtered_details, use_container_width=True, height=400)
+        
+        # Download
+        csv_details = filtered_details.to_csv(index=False)
+        st.download_button(
+            label=" Baixar Detalhes (CSV)",
+            data=csv_details,
+            file_name=f"detalhes_fraudes_motoristas_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+        
+        # Insights automáticos
+        st.markdown("---")
+        st.markdown("#### Insights Automáticos")
+        
+        # Motorista com mais fraudes
+        top_fraudster = filtered_details.iloc[0]
+        st.markdown(f"""
+        <div style='background-color: #fff3cd; padding: 10px; border-radius: 5px; margin: 10px 0;'>
+            <strong>Motorista com maior índice de fraudes:</strong> {top_fraudster['Motorista']}<br>
+            <strong>Total de Fraudes:</strong> {top_fraudster['Total de Fraudes']}<br>
+            <strong>Produto Favorito:</strong> {top_fraudster['Produto Mais Fraudado']} ({top_fraudster['Qtd do Produto Principal']} unidades)<br>
+            <strong>Variedade:</strong> Frauda {top_fraudster['Variedade de Produtos']} tipos diferentes de produtos
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Motorista mais diversificado
+        most_diverse = filtered_details.loc[filtered_details['Variedade de Produtos'].idxmax()]
+        st.markdown(f"""
+        <div style='background-color: #d1ecf1; padding: 10px; border-radius: 5px; margin: 10px 0;'>
+            <strong> Mais Diversificado:</strong> {most_diverse['Motorista']}<br>
+            <strong>Variedade:</strong> {most_diverse['Variedade de Produtos']} tipos de produtos diferentes<br>
+            <strong>Total de Fraudes:</strong> {most_diverse['Total de Fraudes']}<br>
+            <strong>Estratégia:</strong> Este motorista espalha as fraudes por muitos produtos diferentes
+        </div>
+        """, unsafe_allow_html=True)
+    
+    else:
+        st.info("Nenhum motorista encontrado com os filtros aplicados.")
+
+@fragment
+def show_individual_driver(df_fraud_details, driver_details_df):
+    """
+    Exibe a análise individual do motorista selecionado.
+    
+    Args:
+        df_fraud_details: DataFrame com fraudes por motorista e produto
+        driver_details_df: DataFrame de detalhes por motorista
+    """
+    st.markdown("#### Análise Individual de Motorista")
+    
+    # Seletor de motorista (aplicado ao enviar o formulário)
+    available_drivers = driver_details_df['Motorista'].tolist()
+    with st.form("individual_driver_form"):
+        selected_driver = st.selectbox(
+            "Selecione um motorista para análise detalhada:",
+            options=available_drivers,
+            key="individual_driver_analysis"
+        )
+        st.form_submit_button("Analisar motorista")
+    
+    if selected_driver:
+        # Criar análise individual
+        individual_fig, individual_data = create_individual_driver_report(df_fraud_details, selected_driver)
+        
+        if individual_fig and individual_data is not None:
+            
+            # Métricas do motorista
+            driver_info = driver_details_df[driver_details_df['Motorista'] == selected_driver].iloc[0]
+            
+            col_metric1, col_metric2, col_metric3, col_metric4 = st.columns(4)
+            
+            with col_metric1:
+                st.metric("Total de Fraudes", driver_info['Total de Fraudes'])
+            with col_metric2:
+                st.metric("Produto Principal", driver_info['Produto Mais Fraudado'])
+            with col_metric3:
+                st.metric("Qtd do Principal", driver_info['Qtd do Produto Principal'])
+            with col_metric4:
+                st.metric("Variedade", f"{driver_info['Variedade de Produtos']} produtos")
+            
+            # Gráfico de pizza
+            col_chart, col_table = st.columns([2, 1])
+            
+            with col_chart:
+                st.plotly_chart(individual_fig, use_container_width=True)
+            
+            with col_table:
+                st.markdown("##### Produtos Fraudados")
+                st.dataframe(
+                    individual_data.rename(columns={
+                        individual_data.columns[0]: 'Produto',
+                        individual_data.columns[1]: 'Quantidade'
+                    }),
+                    hide_index=True
+                )
+            
+            # Recomendações específicas
+            st.markdown("---")
+            st.markdown("#### Recomendações Específicas")
+            
+            total_frauds = driver_info['Total de Fraudes']
+            variety = driver_info['Variedade de Produtos']
+            main_product = driver_info['Produto Mais Fraudado']
+            main_qty = driver_info['Qtd do Produto Principal']
+            
+            if total_frauds >= 20:
+                st.error(f"🔴 **AÇÃO IMEDIATA**: {selected_driver} possui {total_frauds} fraudes confirmadas. Suspender e investigar imediatamente.")
+            elif total_frauds >= 10:
+                st.warning(f"🟠 **MONITORAMENTO**: {selected_driver} precisa de supervisão próxima em todas as entregas.")
+            
+            if variety >= 5:
+                st.warning(f" **PADRÃO DIVERSIFICADO**: Este motorista frauda {variety} tipos de produtos diferentes. Possível estratégia para evitar detecção.")
+            
+            concentration_rate = (main_qty / total_frauds) * 100
+            if concentration_rate >= 50:
+                st.info(f" **FOCO EM {main_product}**: {concentration_rate:.1f}% das fraudes são deste produto. Revisar procedimentos específicos para este item.")
+        
+        else:
+            st.error("Não foi possível gerar análise individual para este motorista.")
+
+@fragment
+def show_driver_ranking(drivers_sorted, driver_name_column, fraud_rate_column):
+    """
+    Exibe o ranking de motoristas por taxa de fraude com seus filtros.
+    
+    Args:
+        drivers_sorted: DataFrame de motoristas ordenado pela taxa de fraude
+        driver_name_column: Coluna com o nome do motorista
+        fraud_rate_column: Coluna com a taxa de fraude
+    """
+    st.markdown("####  Ranking de Motoristas por Taxa de Fraude")
+    
+    # Filtros para a lista (aplicados juntos ao enviar o formulário)
+    with st.form("driver_ranking_filters"):
+        col_filter1, col_filter2 = st.columns(2)
+        
+        with col_filter1:
+            min_fraud_rate = st.slider(
+                "Taxa mínima de fraude (%)", 
+                min_value=0.0, 
+                max_value=float(drivers_sorted[fraud_rate_column].max()), 
+                value=0.0,
+                step=0.1,
+                key="ranking_min_fraud_rate"
+            )
+        
+        with col_filter2:
+            show_top_n = st.selectbox(
+                "Mostrar top N motoristas",
+                options=[10, 20, 50, 100, "Todos"],
+                index=4,
+                key="ranking_top_n"
+            )
+        
+        st.form_submit_button("Aplicar filtros")
+    
+    # Filtrar dados
+    filtered_drivers = drivers_sorted[drivers_sorted[fraud_rate_column] >= min_fraud_rate]
+    
+    if show_top_n != "Todos":
+        filtered_drivers = filtered_drivers.head(show_top_n)
+    
+    # Exibir lista ranqueada
+    if not filtered_drivers.empty:
+        st.markdown(f"**Total de motoristas exibidos: {len(filtered_drivers)}**")
+        
+        for idx, (_, row) in enumerate(filtered_drivers.iterrows(), 1):
+            driver_name = row[driver_name_column]
+            fraud_rate = row[fraud_rate_column]
+            
+            # Definir cor baseada na taxa de fraude
+            if fraud_rate >= 10:
+                color = "🔴"
+                alert_level = "CRÍTICO"
+                border_color = "#dc3545"
+            elif fraud_rate >= 5:
+                color = "🟠"
+                alert_level = "ALTO"
+                border_color = "#fd7e14"
+            elif fraud_rate >= 2:
+                color = "🟡"
+                alert_level = "MÉDIO"
+                border_color = "#ffc107"
+            else:
+                color = "🟢"
+                alert_level = "BAIXO"
+                border_color = "#28a745"
+            
+            # Criar card para cada motorista
+            st.markdown(f"""
+            <div style='
+                background-color: #f8f9fa; 
+                padding: 10px; 
+                margin: 5px 0; 
+                border-left: 4px solid {border_color}; 
+                border-radius: 5px;
+            '>
+                <strong>#{idx} - {driver_name}</strong><br>
+                {color} Taxa de Fraude: <strong>{fraud_rate:.2f}%</strong> - Nível: <strong>{alert_level}</strong>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("Nenhum motorista encontrado com os filtros aplicados.")
+
+@fragment
+def show_driver_ranking_chart(drivers_sorted, driver_name_column, fraud_rate_column):
+    """
+    Exibe o gráfico de barras dos motoristas com maior taxa de fraude.
+    
+    Args:
+        drivers_sorted: DataFrame de motoristas ordenado pela taxa de fraude
+        driver_name_column: Coluna com o nome do motorista
+        fraud_rate_column: Coluna com a taxa de fraude
+    """
+    st.markdown("####  Gráfico de Barras - Taxa de Fraude por Motorista")
+    
+    # Opção para escolher quantos motoristas mostrar no gráfico
+    with st.form("driver_chart_options"):
+        top_n_chart = st.selectbox(
+            "Número de motoristas no gráfico",
+            options=[10, 20, 30, 50],
+            index=1,
+            key="chart_top_n"
+        )
+        st.form_submit_button("Atualizar gráfico")
+    
+    chart_data = drivers_sorted.head(top_n_chart)
+    
+    if not chart_data.empty:
+        # Criar gráfico de barras horizontal
+        fig = create_bar_chart(
+            chart_data,
+            driver_name_column,
+            fraud_rate_column,
+            f'Top {top_n_chart} Motoristas por Taxa de Fraude (%)',
+            orientation='h',
+            height=max(400, top_n_chart * 25)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Estatísticas do gráfico
+        avg_fraud = chart_data[fraud_rate_column].mean()
+        max_fraud = chart_data[fraud_rate_column].max()
+        min_fraud = chart_data[fraud_rate_column].min()
+        
+        col_stat1, col_stat2, col_stat3 = st.columns(3)
+        
+        with col_stat1:
+            st.metric("Taxa Média", f"{avg_fraud:.2f}%")
+        with col_stat2:
+            st.metric("Taxa Máxima", f"{max_fraud:.2f}%")
+        with col_stat3:
+            st.metric("Taxa Mínima", f"{min_fraud:.2f}%")
+
+@timed
 def show(data):
     """
     Exibe o panorama geral de fraudes em entregas com introdução completa do case.
@@ -594,8 +897,8 @@ def show(data):
         return
     
     # Preparar dados
-    df_fraud_trend = prepare_fraud_trend_data(data['fraud_trend'])
-    df_fraud_region = prepare_region_data(data['fraud_region']) if 'fraud_region' in data else None
+    df_fraud_trend = prepare_fraud_trend_data(dataset(data, 'fraud_trend'))
+    df_fraud_region = prepare_region_data(dataset(data, 'fraud_region')) if 'fraud_region' in data else None
     df_missing_products = data.get('missing_products')
     df_suspicious_drivers = data.get('suspicious_drivers')
     df_driver_products = data.get('driver_products')  # Nova fonte de dados para relacionar motoristas e produtos
@@ -816,7 +1119,13 @@ def show(data):
     st.markdown("<h3> Análise Detalhada: Quais Produtos Cada Motorista Está Fraudando</h3>", unsafe_allow_html=True)
     
     # Tentar usar dados específicos de fraude ou produtos
-    df_fraud_details = data.get('fraud_details') or data.get('driver_products') or df_missing_products
+    # (DataFrames não podem ser encadeados com 'or': usar o primeiro não vazio)
+    df_fraud_details = df_missing_products
+    for key in ['fraud_details', 'driver_products']:
+        candidate = data.get(key)
+        if candidate is not None and not candidate.empty:
+            df_fraud_details = candidate
+            break
     
     # Criar análise detalhada
     heatmap_fig, driver_details_df, stacked_fig = create_driver_product_analysis(
@@ -848,73 +1157,7 @@ def show(data):
             """)
         
         with tab2:
-            st.markdown("#### Tabela Detalhada por Motorista")
-            
-            # Filtros
-            col_filter1, col_filter2 = st.columns(2)
-            
-            with col_filter1:
-                min_frauds = st.number_input(
-                    "Mínimo de fraudes totais",
-                    min_value=0,
-                    max_value=int(driver_details_df['Total de Fraudes'].max()),
-                    value=0
-                )
-            
-            with col_filter2:
-                min_variety = st.number_input(
-                    "Mínimo de produtos diferentes",
-                    min_value=1,
-                    max_value=int(driver_details_df['Variedade de Produtos'].max()),
-                    value=1
-                )
-            
-            # Filtrar dados
-            filtered_details = driver_details_df[
-                (driver_details_df['Total de Fraudes'] >= min_frauds) &
-                (driver_details_df['Variedade de Produtos'] >= min_variety)
-            ]
-            
-            if not filtered_details.empty:
-                st.dataframe(filtered_details, use_container_width=True, height=400)
-                
-                # Download
-                csv_details = filtered_details.to_csv(index=False)
-                st.download_button(
-                    label=" Baixar Detalhes (CSV)",
-                    data=csv_details,
-                    file_name=f"detalhes_fraudes_motoristas_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-                
-                # Insights automáticos
-                st.markdown("---")
-                st.markdown("#### Insights Automáticos")
-                
-                # Motorista com mais fraudes
-                top_fraudster = filtered_details.iloc[0]
-                st.markdown(f"""
-                <div style='background-color: #fff3cd; padding: 10px; border-radius: 5px; margin: 10px 0;'>
-                    <strong>Motorista com maior índice de fraudes:</strong> {top_fraudster['Motorista']}<br>
-                    <strong>Total de Fraudes:</strong> {top_fraudster['Total de Fraudes']}<br>
-                    <strong>Produto Favorito:</strong> {top_fraudster['Produto Mais Fraudado']} ({top_fraudster['Qtd do Produto Principal']} unidades)<br>
-                    <strong>Variedade:</strong> Frauda {top_fraudster['Variedade de Produtos']} tipos diferentes de produtos
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Motorista mais diversificado
-                most_diverse = filtered_details.loc[filtered_details['Variedade de Produtos'].idxmax()]
-                st.markdown(f"""
-                <div style='background-color: #d1ecf1; padding: 10px; border-radius: 5px; margin: 10px 0;'>
-                    <strong> Mais Diversificado:</strong> {most_diverse['Motorista']}<br>
-                    <strong>Variedade:</strong> {most_diverse['Variedade de Produtos']} tipos de produtos diferentes<br>
-                    <strong>Total de Fraudes:</strong> {most_diverse['Total de Fraudes']}<br>
-                    <strong>Estratégia:</strong> Este motorista espalha as fraudes por muitos produtos diferentes
-                </div>
-                """, unsafe_allow_html=True)
-            
-            else:
-                st.info("Nenhum motorista encontrado com os filtros aplicados.")
+            show_driver_details(driver_details_df)
         
         with tab3:
             st.markdown("####  Distribuição de Fraudes por Motorista e Produto")
@@ -933,75 +1176,7 @@ def show(data):
                 st.info("Dados insuficientes para criar o gráfico empilhado.")
         
         with tab4:
-            st.markdown("#### Análise Individual de Motorista")
-            
-            # Seletor de motorista
-            available_drivers = driver_details_df['Motorista'].tolist()
-            selected_driver = st.selectbox(
-                "Selecione um motorista para análise detalhada:",
-                options=available_drivers,
-                key="individual_driver_analysis"
-            )
-            
-            if selected_driver:
-                # Criar análise individual
-                individual_fig, individual_data = create_individual_driver_report(df_fraud_details, selected_driver)
-                
-                if individual_fig and individual_data is not None:
-                    
-                    # Métricas do motorista
-                    driver_info = driver_details_df[driver_details_df['Motorista'] == selected_driver].iloc[0]
-                    
-                    col_metric1, col_metric2, col_metric3, col_metric4 = st.columns(4)
-                    
-                    with col_metric1:
-                        st.metric("Total de Fraudes", driver_info['Total de Fraudes'])
-                    with col_metric2:
-                        st.metric("Produto Principal", driver_info['Produto Mais Fraudado'])
-                    with col_metric3:
-                        st.metric("Qtd do Principal", driver_info['Qtd do Produto Principal'])
-                    with col_metric4:
-                        st.metric("Variedade", f"{driver_info['Variedade de Produtos']} produtos")
-                    
-                    # Gráfico de pizza
-                    col_chart, col_table = st.columns([2, 1])
-                    
-                    with col_chart:
-                        st.plotly_chart(individual_fig, use_container_width=True)
-                    
-                    with col_table:
-                        st.markdown("##### Produtos Fraudados")
-                        st.dataframe(
-                            individual_data.rename(columns={
-                                individual_data.columns[0]: 'Produto',
-                                individual_data.columns[1]: 'Quantidade'
-                            }),
-                            hide_index=True
-                        )
-                    
-                    # Recomendações específicas
-                    st.markdown("---")
-                    st.markdown("#### Recomendações Específicas")
-                    
-                    total_frauds = driver_info['Total de Fraudes']
-                    variety = driver_info['Variedade de Produtos']
-                    main_product = driver_info['Produto Mais Fraudado']
-                    main_qty = driver_info['Qtd do Produto Principal']
-                    
-                    if total_frauds >= 20:
-                        st.error(f"🔴 **AÇÃO IMEDIATA**: {selected_driver} possui {total_frauds} fraudes confirmadas. Suspender e investigar imediatamente.")
-                    elif total_frauds >= 10:
-                        st.warning(f"🟠 **MONITORAMENTO**: {selected_driver} precisa de supervisão próxima em todas as entregas.")
-                    
-                    if variety >= 5:
-                        st.warning(f" **PADRÃO DIVERSIFICADO**: Este motorista frauda {variety} tipos de produtos diferentes. Possível estratégia para evitar detecção.")
-                    
-                    concentration_rate = (main_qty / total_frauds) * 100
-                    if concentration_rate >= 50:
-                        st.info(f" **FOCO EM {main_product}**: {concentration_rate:.1f}% das fraudes são deste produto. Revisar procedimentos específicos para este item.")
-                
-                else:
-                    st.error("Não foi possível gerar análise individual para este motorista.")
+            show_individual_driver(df_fraud_details, driver_details_df)
     
     else:
         st.warning("""
@@ -1054,113 +1229,10 @@ def show(data):
             drivers_sorted = df_suspicious_drivers.sort_values(fraud_rate_column, ascending=False).copy()
             
             with tab1:
-                st.markdown("####  Ranking de Motoristas por Taxa de Fraude")
-                
-                # Filtros para a lista
-                col_filter1, col_filter2 = st.columns(2)
-                
-                with col_filter1:
-                    min_fraud_rate = st.slider(
-                        "Taxa mínima de fraude (%)", 
-                        min_value=0.0, 
-                        max_value=float(drivers_sorted[fraud_rate_column].max()), 
-                        value=0.0,
-                        step=0.1
-                    )
-                
-                with col_filter2:
-                    show_top_n = st.selectbox(
-                        "Mostrar top N motoristas",
-                        options=[10, 20, 50, 100, "Todos"],
-                        index=4
-                    )
-                
-                # Filtrar dados
-                filtered_drivers = drivers_sorted[drivers_sorted[fraud_rate_column] >= min_fraud_rate]
-                
-                if show_top_n != "Todos":
-                    filtered_drivers = filtered_drivers.head(show_top_n)
-                
-                # Exibir lista ranqueada
-                if not filtered_drivers.empty:
-                    st.markdown(f"**Total de motoristas exibidos: {len(filtered_drivers)}**")
-                    
-                    for idx, (_, row) in enumerate(filtered_drivers.iterrows(), 1):
-                        driver_name = row[driver_name_column]
-                        fraud_rate = row[fraud_rate_column]
-                        
-                        # Definir cor baseada na taxa de fraude
-                        if fraud_rate >= 10:
-                            color = "🔴"
-                            alert_level = "CRÍTICO"
-                            border_color = "#dc3545"
-                        elif fraud_rate >= 5:
-                            color = "🟠"
-                            alert_level = "ALTO"
-                            border_color = "#fd7e14"
-                        elif fraud_rate >= 2:
-                            color = "🟡"
-                            alert_level = "MÉDIO"
-                            border_color = "#ffc107"
-                        else:
-                            color = "🟢"
-                            alert_level = "BAIXO"
-                            border_color = "#28a745"
-                        
-                        # Criar card para cada motorista
-                        st.markdown(f"""
-                        <div style='
-                            background-color: #f8f9fa; 
-                            padding: 10px; 
-                            margin: 5px 0; 
-                            border-left: 4px solid {border_color}; 
-                            border-radius: 5px;
-                        '>
-                            <strong>#{idx} - {driver_name}</strong><br>
-                            {color} Taxa de Fraude: <strong>{fraud_rate:.2f}%</strong> - Nível: <strong>{alert_level}</strong>
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.info("Nenhum motorista encontrado com os filtros aplicados.")
+                show_driver_ranking(drivers_sorted, driver_name_column, fraud_rate_column)
             
             with tab2:
-                st.markdown("####  Gráfico de Barras - Taxa de Fraude por Motorista")
-                
-                # Opção para escolher quantos motoristas mostrar no gráfico
-                top_n_chart = st.selectbox(
-                    "Número de motoristas no gráfico",
-                    options=[10, 20, 30, 50],
-                    index=1,
-                    key="chart_top_n"
-                )
-                
-                chart_data = drivers_sorted.head(top_n_chart)
-                
-                if not chart_data.empty:
-                    # Criar gráfico de barras horizontal
-                    fig = create_bar_chart(
-                        chart_data,
-                        driver_name_column,
-                        fraud_rate_column,
-                        f'Top {top_n_chart} Motoristas por Taxa de Fraude (%)',
-                        orientation='h',
-                        height=max(400, top_n_chart * 25)
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Estatísticas do gráfico
-                    avg_fraud = chart_data[fraud_rate_column].mean()
-                    max_fraud = chart_data[fraud_rate_column].max()
-                    min_fraud = chart_data[fraud_rate_column].min()
-                    
-                    col_stat1, col_stat2, col_stat3 = st.columns(3)
-                    
-                    with col_stat1:
-                        st.metric("Taxa Média", f"{avg_fraud:.2f}%")
-                    with col_stat2:
-                        st.metric("Taxa Máxima", f"{max_fraud:.2f}%")
-                    with col_stat3:
-                        st.metric("Taxa Mínima", f"{min_fraud:.2f}%")
+                show_driver_ranking_chart(drivers_sorted, driver_name_column, fraud_rate_column)
             
             with tab3:
                 st.markdown("#### Tabela Completa de Motoristas")
@@ -1,13 +1,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 
 # Importar funções utilitárias
+from utils.lazy import lazy_import
+from utils.perf import timed
 from utils.graphics import create_bar_chart
 from config.style_config import create_kpi_card, create_insight_box, create_tooltip
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
+@timed
 def show(data):
     """
     Exibe recomendações baseadas na análise de fraudes.
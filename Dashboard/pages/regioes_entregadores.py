@@ -1,15 +1,20 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 
 # Importar funções utilitárias
+from utils.lazy import lazy_import
+from utils.perf import timed
 from utils.loaders import prepare_region_data, prepare_driver_data, detect_anomalies
+from utils.datasets import dataset
 from utils.graphics import create_bar_chart, create_scatter_plot, create_map
 from utils.filters import create_region_filter, filter_suspicious_entries
 from config.style_config import create_kpi_card, create_insight_box, create_tooltip
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
 def get_coordinates_data():
     """
     Retorna DataFrame com coordenadas geográficas das regiões.
@@ -45,6 +50,7 @@ def get_coordinates_data():
     })
     return df_coords
 
+@timed
 def show(data):
     """
     Exibe análise de regiões e entregadores com maior incidência de fraudes.
@@ -60,10 +66,10 @@ def show(data):
         return
 
     # Preparar dados
-    df_region = prepare_region_data(data.get('fraud_region')) if 'fraud_region' in data else None
+    df_region = prepare_region_data(dataset(data, 'fraud_region')) if 'fraud_region' in data else None
     df_drivers = prepare_driver_data(
-        data.get('drivers'),
-        data.get('suspicious_drivers')
+        dataset(data, 'drivers'),
+        dataset(data, 'suspicious_drivers')
     ) if 'drivers' in data or 'suspicious_drivers' in data else None
     
     # Verificar se temos pelo menos um conjunto de dados
@@ -0,0 +1,426 @@
+import pandas as pd
+
+from utils.normalization import missing_products_relation
+from utils.perf import timed
+
+# Parâmetros padrão das consultas de agregação. Os limiares definem
+# quando um motorista ou cliente é considerado suspeito.
+DEFAULT_PARAMS = {
+    'top_products': 50,
+    'top_suspects': 20,
+    'driver_rate_threshold': 15,
+    'driver_min_deliveries': 5,
+    'customer_rate_threshold': 20,
+    'customer_min_orders': 3,
+    'top_driver_products': 100,
+}
+
+FRAUD_TREND_SQL = """
+    SELECT DATE(date) AS date,
+           SUM(items_missing) AS itens_faltantes,
+           COUNT(order_id) AS total_pedidos,
+           SUM(items_missing) AS casos_fraude,
+           ROUND(SUM(items_missing) * 100.0 / COUNT(order_id), 2) AS percentual_fraude
+    FROM orders
+    WHERE date IS NOT NULL
+    GROUP BY DATE(date)
+    ORDER BY DATE(date)
+"""
+
+FRAUD_REGION_SQL = """
+    SELECT region,
+           SUM(items_missing) AS casos_fraude,
+           COUNT(order_id) AS total_pedidos,
+           ROUND(SUM(items_missing) * 100.0 / COUNT(order_id), 2) AS taxa_fraude,
+           ROUND(SUM(items_missing) * 100.0 / COUNT(order_id), 2) AS percentual_fraude,
+           SUM(items_missing) AS total_itens_faltantes
+    FROM orders
+    WHERE region IS NOT NULL
+    GROUP BY region
+    ORDER BY region
+"""
+
+# {relation} é a tabela longa order_missing_product (ou o UNION ALL
+# equivalente sobre missing_items), ver utils/normalization.py
+MISSING_PRODUCTS_SQL = """
+    WITH contagem AS (
+        SELECT product_id, COUNT(*) AS itens_faltantes
+        FROM {relation}
+        GROUP BY product_id
+        ORDER BY itens_faltantes DESC, product_id
+        LIMIT :top_products
+    )
+    SELECT c.product_id,
+           c.itens_faltantes,
+           p.product_name,
+           p.category,
+           c.itens_faltantes AS total_relatos
+    FROM contagem c
+    LEFT JOIN products p ON p.product_id = c.product_id
+    ORDER BY c.itens_faltantes DESC, c.product_id
+"""
+
+MISSING_CATEGORIES_SQL = """
+    SELECT p.category,
+           COUNT(*) AS total_relatos,
+           COUNT(DISTINCT r.product_id) AS produtos_distintos
+    FROM {relation} r
+    LEFT JOIN products p ON p.product_id = r.product_id
+    GROUP BY p.category
+    ORDER BY total_relatos DESC
+"""
+
+# Itens faltantes por motorista e produto, limitado aos motoristas com
+# mais relatos para que o resultado não cresça com o total de motoristas
+DRIVER_PRODUCTS_SQL = """
+    WITH contagem AS (
+        SELECT o.driver_id, r.product_id, COUNT(*) AS itens_faltantes
+        FROM {relation} r
+        JOIN orders o ON o.order_id = r.order_id
+        WHERE o.driver_id IS NOT NULL
+        GROUP BY o.driver_id, r.product_id
+    ),
+    motoristas AS (
+        SELECT driver_id, SUM(itens_faltantes) AS total_motorista
+        FROM contagem
+        GROUP BY driver_id
+        ORDER BY total_motorista DESC, driver_id
+        LIMIT :top_driver_products
+    )
+    SELECT c.driver_id,
+           d.driver_name,
+           c.product_id,
+           p.product_name,
+           p.category,
+           c.itens_faltantes
+    FROM contagem c
+    JOIN motoristas m ON m.driver_id = c.driver_id
+    LEFT JOIN drivers d ON d.driver_id = c.driver_id
+    LEFT JOIN products p ON p.product_id = c.product_id
+    ORDER BY m.total_motorista DESC, c.driver_id, c.itens_faltantes DESC, c.product_id
+"""
+
+
+DRIVERS_SQL = """
+    SELECT driver_id, driver_name, age, Trips AS total_entregas
+    FROM drivers
+"""
+
+SUSPICIOUS_DRIVERS_SQL = """
+    WITH stats AS (
+        SELECT driver_id,
+               SUM(items_missing) AS relatos_fraude,
+               COUNT(order_id) AS total_entregas,
+               ROUND(SUM(items_missing) * 100.0 / COUNT(order_id), 2) AS taxa_fraude
+        FROM orders
+        WHERE driver_id IS NOT NULL
+        GROUP BY driver_id
+        HAVING taxa_fraude > :driver_rate_threshold
+           AND total_entregas > :driver_min_deliveries
+        ORDER BY driver_id
+        LIMIT :top_suspects
+    )
+    SELECT s.driver_id,
+           s.relatos_fraude,
+           s.total_entregas,
+           s.taxa_fraude,
+           s.taxa_fraude AS percentual_fraude,
+           d.driver_name
+    FROM stats s
+    LEFT JOIN drivers d ON d.driver_id = s.driver_id
+    ORDER BY s.driver_id
+"""
+
+FRAUD_TIME_SQL = """
+    SELECT delivery_hour_only AS hour,
+           SUM(items_missing) AS casos_fraude,
+           COUNT(order_id) AS total_entregas
+    FROM orders
+    WHERE delivery_hour_only IS NOT NULL
+    GROUP BY delivery_hour_only
+    ORDER BY delivery_hour_only
+"""
+
+# A coluna 'region' fica fora de agregação: no SQLite, quando a consulta
+# contém um único MIN(), colunas soltas vêm da linha do mínimo, ou seja,
+# da primeira linha do cliente (equivalente ao 'first' do pandas).
+SUSPICIOUS_CUSTOMERS_SQL = """
+    WITH stats AS (
+        SELECT customer_id,
+               SUM(items_missing) AS relatos_fraude,
+               COUNT(order_id) AS total_pedidos,
+               MIN(rowid) AS primeira_linha,
+               region,
+               ROUND(SUM(items_missing) * 100.0 / COUNT(order_id), 2) AS taxa_fraude
+        FROM orders
+        WHERE customer_id IS NOT NULL
+        GROUP BY customer_id
+        HAVING taxa_fraude > :customer_rate_threshold
+           AND total_pedidos > :customer_min_orders
+        ORDER BY customer_id
+        LIMIT :top_suspects
+    )
+    SELECT s.customer_id,
+           s.relatos_fraude,
+           s.total_pedidos,
+           s.region,
+           s.taxa_fraude,
+           s.taxa_fraude AS percentual_fraude,
+           c.customer_name
+    FROM stats s
+    LEFT JOIN customers c ON c.customer_id = s.customer_id
+    ORDER BY s.customer_id
+"""
+
+# Mesma consulta para o DuckDB, que não aceita colunas soltas no GROUP BY:
+# arg_min devolve a região da linha de menor rowid
+SUSPICIOUS_CUSTOMERS_DUCKDB_SQL = """
+    WITH stats AS (
+        SELECT customer_id,
+               SUM(items_missing) AS relatos_fraude,
+               COUNT(order_id) AS total_pedidos,
+               arg_min(region, rowid) AS region,
+               ROUND(SUM(items_missing) * 100.0 / COUNT(order_id), 2) AS taxa_fraude
+        FROM orders
+        WHERE customer_id IS NOT NULL
+        GROUP BY customer_id
+        HAVING taxa_fraude > :customer_rate_threshold
+           AND total_pedidos > :customer_min_orders
+        ORDER BY customer_id
+        LIMIT :top_suspects
+    )
+    SELECT s.customer_id,
+           s.relatos_fraude,
+           s.total_pedidos,
+           s.region,
+           s.taxa_fraude,
+           s.taxa_fraude AS percentual_fraude,
+           c.customer_name
+    FROM stats s
+    LEFT JOIN customers c ON c.customer_id = s.customer_id
+    ORDER BY s.customer_id
+"""
+
+
+def run_query(conn, sql, params):
+    """
+    Executa uma consulta parametrizada e devolve o resultado como DataFrame.
+
+    conn pode ser uma conexão sqlite3 ou um backend de utils/backends.py.
+    """
+    if hasattr(conn, 'read_sql'):
+        return conn.read_sql(sql, params)
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def query_dialect(conn):
+    """Retorna o dialeto SQL da conexão ('sqlite' para conexões sqlite3)."""
+    return getattr(conn, 'dialect', 'sqlite')
+
+
+def query_relation(conn):
+    """Relação de produtos faltantes (order_id, product_id, position) da conexão."""
+    if hasattr(conn, 'missing_products_relation'):
+        return conn.missing_products_relation()
+    return missing_products_relation(conn)
+
+
+def _merge_params(params=None):
+    """Combina os parâmetros informados com os valores padrão."""
+    merged = dict(DEFAULT_PARAMS)
+    if params:
+        merged.update(params)
+    return merged
+
+
+@timed
+def query_fraud_trend(conn, params=None):
+    """
+    Agrega itens faltantes e pedidos por dia.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com a tendência diária de fraudes
+    """
+    df = run_query(conn, FRAUD_TREND_SQL, _merge_params(params))
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+@timed
+def query_fraud_region(conn, params=None):
+    """
+    Agrega itens faltantes e pedidos por região.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com as métricas de fraude por região
+    """
+    return run_query(conn, FRAUD_REGION_SQL, _merge_params(params))
+
+
+@timed
+def query_missing_products(conn, params=None):
+    """
+    Conta os produtos mais reportados como faltantes.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com os produtos mais reportados e sua categoria
+    """
+    sql = MISSING_PRODUCTS_SQL.format(relation=query_relation(conn))
+    return run_query(conn, sql, _merge_params(params))
+
+
+@timed
+def query_missing_categories(conn, params=None):
+    """
+    Conta os relatos de itens faltantes por categoria de produto.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com total de relatos e produtos distintos por categoria
+    """
+    sql = MISSING_CATEGORIES_SQL.format(relation=query_relation(conn))
+    return run_query(conn, sql, _merge_params(params))
+
+
+@timed
+def query_driver_products(conn, params=None):
+    """
+    Conta os itens faltantes por motorista e produto.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com motorista, produto e itens faltantes, para os
+        motoristas com mais relatos (top_driver_products)
+    """
+    sql = DRIVER_PRODUCTS_SQL.format(relation=query_relation(conn))
+    return run_query(conn, sql, _merge_params(params))
+
+
+@timed
+def query_drivers(conn, params=None):
+    """
+    Carrega o cadastro de motoristas com a faixa etária usada nas páginas.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com os motoristas
+    """
+    drivers = run_query(conn, DRIVERS_SQL, _merge_params(params))
+    return add_age_group(drivers)
+
+
+def add_age_group(drivers):
+    """
+    Adiciona a coluna faixa_etaria a partir da idade do motorista.
+
+    Args:
+        drivers: DataFrame de motoristas
+
+    Returns:
+        DataFrame com a coluna faixa_etaria
+    """
+    if 'age' in drivers.columns:
+        drivers['faixa_etaria'] = pd.cut(
+            drivers['age'],
+            bins=[0, 25, 35, 45, 55, 100],
+            labels=['18-25', '26-35', '36-45', '46-55', '55+'],
+            right=False
+        )
+    else:
+        # Se não tiver age, criar faixa_etaria fictícia
+        drivers['faixa_etaria'] = '26-35'
+    return drivers
+
+
+@timed
+def query_suspicious_drivers(conn, params=None):
+    """
+    Seleciona motoristas com alta taxa de itens faltantes.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com os motoristas suspeitos
+    """
+    return run_query(conn, SUSPICIOUS_DRIVERS_SQL, _merge_params(params))
+
+
+@timed
+def query_fraud_time(conn, params=None):
+    """
+    Agrega itens faltantes e entregas por hora do dia.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com as fraudes por horário
+    """
+    return run_query(conn, FRAUD_TIME_SQL, _merge_params(params))
+
+
+@timed
+def query_suspicious_customers(conn, params=None):
+    """
+    Seleciona clientes com muitos relatos de itens faltantes.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        DataFrame com os clientes suspeitos
+    """
+    sql = SUSPICIOUS_CUSTOMERS_DUCKDB_SQL if query_dialect(conn) == 'duckdb' else SUSPICIOUS_CUSTOMERS_SQL
+    return run_query(conn, sql, _merge_params(params))
+
+
+def build_dashboard_frames(conn, params=None):
+    """
+    Monta os DataFrames usados pelas páginas a partir de consultas agregadas.
+
+    Apenas os resultados agregados são transferidos para o Python; a tabela
+    orders nunca é carregada inteira em memória.
+
+    Args:
+        conn: Conexão com o banco SQLite ou backend de utils/backends.py
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        Dicionário com os DataFrames do dashboard
+    """
+    return {
+        'fraud_trend': query_fraud_trend(conn, params),
+        'fraud_region': query_fraud_region(conn, params),
+        'missing_products': query_missing_products(conn, params),
+        'missing_categories': query_missing_categories(conn, params),
+        'driver_products': query_driver_products(conn, params),
+        'drivers': query_drivers(conn, params),
+        'suspicious_drivers': query_suspicious_drivers(conn, params),
+        'fraud_time': query_fraud_time(conn, params),
+        'suspicious_customers': query_suspicious_customers(conn, params)
+    }
@@ -0,0 +1,275 @@
+"""
+Backends das consultas agregadas do dashboard.
+
+As consultas de utils/aggregations.py aceitam uma conexão sqlite3 ou um
+backend com a interface abaixo (read_sql, missing_products_relation e
+dialect):
+
+- SQLiteBackend: executa as consultas na própria conexão SQLite (padrão);
+- DuckDBBackend: executa as mesmas consultas no executor vetorizado e
+  multi-thread do DuckDB, lendo walmart_fraudes.db pela extensão sqlite
+  ou exportações Parquet. Os resultados chegam como tabelas Arrow e viram
+  DataFrames com textos em string[pyarrow].
+
+O backend é escolhido por QUERY_BACKEND em config/settings.py. O DuckDB é
+opcional: sem o pacote instalado, o dashboard continua no SQLite.
+
+Uso pela linha de comando (a partir da pasta Dashboard):
+    python -m utils.backends --export-parquet ../Database/parquet
+"""
+import argparse
+import os
+import re
+from glob import glob
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from config.settings import (DB_PATH, DUCKDB_EXTENSION_DIR, DUCKDB_PARQUET_DIR,
+                             DUCKDB_THREADS, QUERY_BACKEND)
+from utils.database import get_pool
+from utils.dtypes import ARROW_STRING_TYPES
+from utils.normalization import LONG_TABLE, missing_products_relation
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Tabelas exportadas para Parquet. orders leva o rowid, usado para
+# reproduzir a "primeira linha" das consultas do SQLite.
+PARQUET_TABLES = {
+    'orders': "SELECT rowid AS rowid, * FROM orders",
+    'drivers': "SELECT * FROM drivers",
+    'customers': "SELECT * FROM customers",
+    'products': "SELECT * FROM products",
+    LONG_TABLE: "SELECT order_id, product_id, position FROM {relation}",
+}
+
+# Parâmetros nomeados no estilo do sqlite3 (:nome); '::' é conversão de tipo
+_NAMED_PARAM = re.compile(r'(?<![:\w]):(\w+)')
+
+
+class SQLiteBackend:
+    """Consultas executadas diretamente em uma conexão SQLite."""
+
+    dialect = 'sqlite'
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def read_sql(self, sql, params=None):
+        """
+        Executa uma consulta e devolve o resultado como DataFrame.
+
+        Args:
+            sql: Consulta com parâmetros nomeados (:nome)
+            params: Dicionário de parâmetros
+
+        Returns:
+            DataFrame com o resultado
+        """
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def missing_products_relation(self):
+        """Relação de produtos faltantes a usar nas consultas."""
+        return missing_products_relation(self.conn)
+
+
+def _arrow_to_pandas(table):
+    """
+    Converte o resultado Arrow do DuckDB em DataFrame.
+
+    SUM de inteiros chega como decimal de 38 dígitos (HUGEINT): decimais sem
+    casas viram int64 e os demais float64, como no resultado do SQLite.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            target = pa.int64() if field.type.scale == 0 else pa.float64()
+            table = table.set_column(i, field.name, table.column(i).cast(target))
+    return table.to_pandas(types_mapper=ARROW_STRING_TYPES.get)
+
+
+class DuckDBBackend:
+    """
+    Consultas executadas pelo DuckDB sobre o banco SQLite ou sobre Parquet.
+
+    Uma conexão DuckDB em memória é aberta na criação; cada consulta usa um
+    cursor próprio, o que permite consultas simultâneas de várias sessões.
+    """
+
+    dialect = 'duckdb'
+
+    def __init__(self, db_path=DB_PATH, parquet_dir=None, threads=0, extension_dir=None):
+        """
+        Args:
+            db_path: Caminho do banco SQLite (lido pela extensão sqlite)
+            parquet_dir: Pasta com as exportações Parquet; se informada, é
+                         usada no lugar do banco SQLite
+            threads: Threads do executor (0 = todos os núcleos)
+            extension_dir: Pasta de extensões do DuckDB
+        """
+        if duckdb is None:
+            raise ImportError("O backend DuckDB requer o pacote duckdb (pip install duckdb)")
+
+        config = {}
+        if threads:
+            config['threads'] = int(threads)
+        if extension_dir:
+            config['extension_directory'] = extension_dir
+        self.db_path = db_path
+        self.parquet_dir = parquet_dir
+        self._conn = duckdb.connect(':memory:', config=config)
+
+        if parquet_dir:
+            self._register_parquet(parquet_dir)
+        else:
+            self._attach_sqlite(db_path)
+
+    def _attach_sqlite(self, db_path):
+        """Anexa o banco SQLite em modo somente leitura (esquema 'fonte')."""
+        try:
+            self._conn.execute("LOAD sqlite")
+        except duckdb.Error:
+            self._conn.execute("INSTALL sqlite")
+            self._conn.execute("LOAD sqlite")
+        path = os.path.abspath(db_path).replace("'", "''")
+        self._conn.execute(f"ATTACH '{path}' AS fonte (TYPE sqlite, READ_ONLY)")
+
+    def _register_parquet(self, parquet_dir):
+        """Cria uma view por arquivo .parquet da pasta, com o nome do arquivo."""
+        paths = sorted(glob(os.path.join(parquet_dir, '*.parquet')))
+        if not paths:
+            raise FileNotFoundError(f"Nenhum arquivo Parquet em {parquet_dir}")
+        for path in paths:
+            table = os.path.splitext(os.path.basename(path))[0]
+            escaped = os.path.abspath(path).replace("'", "''")
+            self._conn.execute(f'CREATE VIEW "{table}" AS SELECT * FROM read_parquet(\'{escaped}\')')
+
+    def _cursor(self):
+        """Abre um cursor com o banco SQLite anexado como esquema padrão."""
+        cursor = self._conn.cursor()
+        if not self.parquet_dir:
+            # USE vale por conexão: cada cursor precisa repeti-lo
+            cursor.execute("USE fonte")
+        return cursor
+
+    def read_sql(self, sql, params=None):
+        """
+        Executa uma consulta escrita para o SQLite e devolve um DataFrame.
+
+        Os parâmetros :nome são convertidos para $nome, e apenas os
+        parâmetros usados pela consulta são enviados ao DuckDB.
+
+        Args:
+            sql: Consulta com parâmetros nomeados (:nome)
+            params: Dicionário de parâmetros
+
+        Returns:
+            DataFrame com textos em string[pyarrow]
+        """
+        names = set(_NAMED_PARAM.findall(sql))
+        sql = _NAMED_PARAM.sub(r'$\1', sql)
+        used = {name: value for name, value in (params or {}).items() if name in names}
+
+        cursor = self._cursor()
+        try:
+            result = cursor.execute(sql, used)
+            fetch = getattr(result, 'to_arrow_table', None) or result.fetch_arrow_table
+            return _arrow_to_pandas(fetch())
+        finally:
+            cursor.close()
+
+    def missing_products_relation(self):
+        """Relação de produtos faltantes a usar nas consultas."""
+        if self.parquet_dir:
+            # A exportação sempre grava a tabela longa
+            return LONG_TABLE
+        # Mesma decisão do SQLite: tabela longa se atualizada, senão UNION ALL
+        with get_pool(self.db_path).connection() as conn:
+            return missing_products_relation(conn)
+
+    def close(self):
+        """Fecha a conexão DuckDB."""
+        self._conn.close()
+
+
+@st.cache_resource(show_spinner=False)
+def get_duckdb_backend(db_path=DB_PATH, parquet_dir=DUCKDB_PARQUET_DIR,
+                       threads=DUCKDB_THREADS, extension_dir=DUCKDB_EXTENSION_DIR):
+    """
+    Retorna o backend DuckDB compartilhado por todas as sessões.
+
+    Returns:
+        DuckDBBackend (um por combinação de argumentos)
+    """
+    return DuckDBBackend(db_path, parquet_dir=parquet_dir, threads=threads,
+                         extension_dir=extension_dir)
+
+
+def get_backend(conn):
+    """
+    Retorna o backend configurado em QUERY_BACKEND.
+
+    Se o DuckDB estiver configurado mas indisponível, avisa e usa o SQLite.
+
+    Args:
+        conn: Conexão SQLite usada pelo backend 'sqlite' (e como alternativa)
+
+    Returns:
+        SQLiteBackend ou DuckDBBackend
+    """
+    if QUERY_BACKEND == 'duckdb':
+        try:
+            return get_duckdb_backend()
+        except Exception as e:
+            st.warning(f"Backend DuckDB indisponível, usando SQLite: {e}")
+    return SQLiteBackend(conn)
+
+
+def export_parquet(db_path, out_dir, extension_dir=DUCKDB_EXTENSION_DIR):
+    """
+    Exporta as tabelas usadas pelas consultas para Parquet (um arquivo por tabela).
+
+    Args:
+        db_path: Caminho do banco SQLite
+        out_dir: Pasta de destino
+        extension_dir: Pasta de extensões do DuckDB
+
+    Returns:
+        Lista de arquivos gravados
+    """
+    backend = DuckDBBackend(db_path, extension_dir=extension_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    try:
+        relation = backend.missing_products_relation()
+        for table, sql in PARQUET_TABLES.items():
+            path = os.path.abspath(os.path.join(out_dir, f"{table}.parquet"))
+            escaped = path.replace("'", "''")
+            cursor = backend._cursor()
+            try:
+                cursor.execute(f"COPY ({sql.format(relation=relation)}) TO '{escaped}' (FORMAT parquet)")
+            finally:
+                cursor.close()
+            written.append(path)
+    finally:
+        backend.close()
+    return written
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Backends de consulta do dashboard")
+    parser.add_argument('--db', default=DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--export-parquet', metavar='PASTA', required=True,
+                        help="Exporta as tabelas para Parquet na pasta informada")
+    args = parser.parse_args(argv)
+
+    for path in export_parquet(args.db, args.export_parquet):
+        print(f"Gravado: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Cubo OLAP pré-agregado dos pedidos, com roll-up e fatias (slice).
+
+Os fatos de pedidos são agregados uma vez por (data, hora, região); o dia
+da semana é derivado da data. Cada roll-up é respondido pelo menor
+cuboide que contém as dimensões pedidas e as dimensões filtradas:
+
+- cube_region: data × hora × dia da semana × região. O tamanho depende
+  apenas do número de dias, horas e regiões, não do volume de pedidos, e
+  responde a qualquer combinação dos filtros da barra lateral;
+- cube_category: cube_region × categoria, com os relatos de produtos
+  faltantes da tabela longa (medida total_relatos).
+
+Motoristas não fazem parte do cubo: com o motorista como dimensão, o
+cuboide teria quase uma linha por pedido. As estatísticas por motorista
+de uma fatia são lidas por consulta SQL (ver utils/pushdown.py).
+
+As dimensões são guardadas como category/int8 e as contagens como int32
+(ver CUBE_DTYPES em utils/dtypes.py). Pedidos sem data ficam fora do cubo.
+
+Os cuboides são lidos das tabelas de resumo summary_cube e
+summary_cube_category (build_cube_frames_from_summaries em
+utils/summaries.py) nos modos 'auto' e 'summary'; build_cube_frames, que
+agrega orders, atende os modos 'sql' e 'streaming'.
+
+Exemplo:
+    cube = OlapCube.from_frames(data).slice(regions=['Orlando'])
+    cube.rollup(['date', 'hour'])
+    cube.slice(category='Electronics').fraud_trend()
+"""
+import numpy as np
+import pandas as pd
+
+from utils.aggregations import query_relation, run_query
+from utils.dtypes import CUBE_DTYPES, STRING_DTYPE, apply_schema
+from utils.perf import timed
+
+CUBE_ORDERS_SQL = """
+    SELECT DATE(date) AS date,
+           delivery_hour_only AS hour,
+           region,
+           COUNT(order_id) AS total_pedidos,
+           SUM(items_missing) AS itens_faltantes,
+           SUM(items_delivered) AS itens_entregues,
+           SUM(CASE WHEN items_missing > 0 THEN 1 ELSE 0 END) AS pedidos_com_falta,
+           SUM(order_amount) AS valor_total
+    FROM orders
+    WHERE date IS NOT NULL
+    GROUP BY DATE(date), delivery_hour_only, region
+"""
+
+# {relation} é a tabela longa order_missing_product (ver utils/normalization.py)
+CUBE_CATEGORIES_SQL = """
+    SELECT DATE(o.date) AS date,
+           o.delivery_hour_only AS hour,
+           o.region,
+           p.category,
+           COUNT(*) AS total_relatos
+    FROM {relation} r
+    JOIN orders o ON o.order_id = r.order_id
+    LEFT JOIN products p ON p.product_id = r.product_id
+    WHERE o.date IS NOT NULL
+    GROUP BY DATE(o.date), o.delivery_hour_only, o.region, p.category
+"""
+
+ORDER_MEASURES = ['total_pedidos', 'itens_faltantes', 'itens_entregues',
+                  'pedidos_com_falta', 'valor_total']
+CATEGORY_MEASURES = ['total_relatos']
+
+# Cuboides de pedidos, do menor para o maior, e suas dimensões
+ORDER_CUBOIDS = {
+    'cube_region': ['date', 'hour', 'weekday', 'region'],
+}
+CATEGORY_CUBOID = 'cube_category'
+CATEGORY_DIMENSIONS = ['date', 'hour', 'weekday', 'region', 'category']
+
+CUBE_FRAMES = list(ORDER_CUBOIDS) + [CATEGORY_CUBOID]
+
+# Argumentos de slice() e a dimensão filtrada por cada um
+FILTER_DIMENSIONS = {
+    'date_range': 'date',
+    'hours': 'hour',
+    'weekdays': 'weekday',
+    'regions': 'region',
+    'category': 'category',
+}
+
+
+def _compact(df, dimensions):
+    """Converte datas, adiciona o dia da semana e aplica os tipos compactos."""
+    df['date'] = pd.to_datetime(df['date'])
+    # 0 = segunda-feira ... 6 = domingo
+    df['weekday'] = df['date'].dt.dayofweek.astype('int8')
+    measures = [col for col in df.columns if col not in dimensions]
+    df = df[dimensions + measures].sort_values(dimensions, kind='stable', ignore_index=True)
+    return apply_schema(df, CUBE_DTYPES)
+
+
+def compact_cube_frames(orders, categories):
+    """
+    Monta os cuboides a partir das linhas no grão do cubo.
+
+    Args:
+        orders: DataFrame com as colunas de CUBE_ORDERS_SQL
+        categories: DataFrame com as colunas de CUBE_CATEGORIES_SQL
+
+    Returns:
+        Dicionário com os DataFrames de CUBE_FRAMES
+    """
+    return {
+        'cube_region': _compact(orders, ORDER_CUBOIDS['cube_region']),
+        'cube_category': _compact(categories, CATEGORY_DIMENSIONS),
+    }
+
+
+@timed
+def build_cube_frames(conn):
+    """
+    Monta os cuboides a partir do banco.
+
+    Cada cuboide é lido com um único GROUP BY sobre orders (e sobre a
+    tabela longa de relatos, para cube_category).
+
+    Args:
+        conn: Conexão com o banco SQLite ou backend de utils/backends.py
+
+    Returns:
+        Dicionário com os DataFrames de CUBE_FRAMES
+    """
+    sql = CUBE_CATEGORIES_SQL.format(relation=query_relation(conn))
+    return compact_cube_frames(run_query(conn, CUBE_ORDERS_SQL, None), run_query(conn, sql, None))
+
+
+def filters_from_sidebar(date_filter=None, category_filter=None, region_filter=None):
+    """
+    Converte os valores dos filtros da barra lateral em argumentos de slice().
+
+    Args:
+        date_filter: Data ou tupla (início, fim) do st.date_input; durante
+                     a seleção o widget devolve apenas o início
+        category_filter: Categoria ou "Todas"
+        region_filter: Região ou "Todas"
+
+    Returns:
+        Dicionário de filtros para OlapCube.slice
+    """
+    filters = {}
+    if date_filter:
+        dates = list(date_filter) if isinstance(date_filter, (list, tuple)) else [date_filter]
+        if dates:
+            filters['date_range'] = (dates[0], dates[-1])
+    if category_filter and category_filter != "Todas":
+        filters['category'] = category_filter
+    if region_filter and region_filter != "Todas":
+        filters['regions'] = [region_filter]
+    return filters
+
+
+def percent(cases, total):
+    """
+    Percentual de casos sobre o total, com duas casas.
+
+    Empates são arredondados para cima, como no ROUND do SQLite (o round
+    do pandas arredonda 15.625 para 15.62).
+
+    Args:
+        cases: Series com os casos
+        total: Series com o total (zero resulta em nulo)
+
+    Returns:
+        Series com o percentual
+    """
+    rate = cases * 100.0 / total.where(total > 0)
+    return np.floor(rate * 100 + 0.5) / 100
+
+
+class OlapCube:
+    """
+    Fatia de um cubo de pedidos.
+
+    slice() devolve uma nova fatia com filtros adicionais, sem copiar dados;
+    os filtros são aplicados em rollup(), apenas ao cuboide escolhido.
+
+    Com o filtro de categoria, as medidas de pedidos continuam valendo para
+    todos os pedidos da fatia e a coluna total_relatos traz os relatos de
+    produtos faltantes da categoria.
+    """
+
+    def __init__(self, frames, filters=None):
+        """
+        Args:
+            frames: Dicionário com os DataFrames de CUBE_FRAMES
+            filters: Filtros da fatia (argumentos de slice)
+        """
+        self.frames = frames
+        self.filters = dict(filters or {})
+
+    @classmethod
+    def from_frames(cls, data):
+        """
+        Cria o cubo a partir do dicionário de DataFrames do dashboard.
+
+        Args:
+            data: Dicionário com os DataFrames carregados
+
+        Returns:
+            OlapCube sem filtros, ou None se os cuboides não foram carregados
+        """
+        if not data or any(name not in data for name in ORDER_CUBOIDS):
+            return None
+        return cls({name: data[name] for name in CUBE_FRAMES if name in data})
+
+    def slice(self, **filters):
+        """
+        Restringe o cubo a um subconjunto das dimensões.
+
+        Args:
+            date_range: Tupla (início, fim), inclusiva; None em um dos lados
+                        deixa o intervalo aberto
+            hours: Horas (0-23)
+            weekdays: Dias da semana (0 = segunda-feira)
+            regions: Regiões
+            category: Categoria de produto
+
+        Returns:
+            Novo OlapCube; filtros com valor None removem o filtro atual
+        """
+        unknown = set(filters) - set(FILTER_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Filtros desconhecidos: {sorted(unknown)}")
+        merged = {**self.filters, **filters}
+        return OlapCube(self.frames, {k: v for k, v in merged.items() if v is not None})
+
+    def _mask(self, df, name, value):
+        """Máscara booleana de um filtro sobre um cuboide."""
+        column = df[FILTER_DIMENSIONS[name]]
+        if name == 'date_range':
+            start, end = value
+            mask = np.ones(len(df), dtype=bool)
+            if start is not None:
+                mask &= (column >= pd.Timestamp(start)).to_numpy()
+            if end is not None:
+                mask &= (column <= pd.Timestamp(end)).to_numpy()
+            return mask
+        if name == 'category' or isinstance(value, str):
+            value = [value]
+        return column.isin(list(value)).to_numpy()
+
+    def _filtered(self, cuboid, skip=()):
+        """Linhas do cuboide que atendem aos filtros da fatia."""
+        df = self.frames[cuboid]
+        mask = None
+        for name, value in self.filters.items():
+            if name in skip:
+                continue
+            current = self._mask(df, name, value)
+            mask = current if mask is None else mask & current
+        return df if mask is None else df[mask]
+
+    def _order_cuboid(self, dimensions):
+        """Menor cuboide de pedidos que contém as dimensões informadas."""
+        for name, cuboid_dimensions in ORDER_CUBOIDS.items():
+            if name in self.frames and set(dimensions) <= set(cuboid_dimensions):
+                return name
+        raise ValueError(f"Nenhum cuboide contém as dimensões {sorted(dimensions)}")
+
+    @staticmethod
+    def _aggregate(df, by, measures):
+        """Soma as medidas agrupando pelas dimensões de by."""
+        if not by:
+            return pd.DataFrame({name: [df[name].sum()] for name in measures})
+        return df.groupby(by, observed=True, sort=True)[measures].sum().reset_index()
+
+    def rollup(self, by=()):
+        """
+        Agrega a fatia pelas dimensões informadas.
+
+        Args:
+            by: Lista de dimensões (date, hour, weekday, region ou
+                category); vazia para o total da fatia
+
+        Returns:
+            DataFrame com uma linha por combinação de dimensões e as medidas
+            de ORDER_MEASURES (ou apenas total_relatos, se by contém category)
+        """
+        by = list(by)
+        filtered = [FILTER_DIMENSIONS[name] for name in self.filters if name != 'category']
+
+        if 'category' in by or 'category' in self.filters:
+            if CATEGORY_CUBOID not in self.frames:
+                raise ValueError("Cubo de categorias não carregado")
+            if not set(by + filtered) <= set(CATEGORY_DIMENSIONS):
+                raise ValueError(f"O cubo de categorias não contém as dimensões {sorted(set(by + filtered))}")
+            relatos = self._aggregate(self._filtered(CATEGORY_CUBOID), by, CATEGORY_MEASURES)
+            if 'category' in by:
+                return relatos
+
+        orders = self._order_cuboid(by + filtered)
+        result = self._aggregate(self._filtered(orders, skip=('category',)), by, ORDER_MEASURES)
+
+        if 'category' in self.filters:
+            if by:
+                result = result.merge(relatos, on=by, how='left')
+            else:
+                result['total_relatos'] = relatos['total_relatos'].to_numpy()
+            result['total_relatos'] = result['total_relatos'].fillna(0).astype('int64')
+        return result
+
+    def _cases(self, result):
+        """Casos de fraude: relatos da categoria filtrada ou itens faltantes."""
+        column = 'total_relatos' if 'category' in self.filters else 'itens_faltantes'
+        return result[column]
+
+    def fraud_trend(self):
+        """
+        Tendência diária da fatia, no formato do DataFrame fraud_trend.
+
+        Returns:
+            DataFrame com date, itens_faltantes, total_pedidos, casos_fraude
+            e percentual_fraude
+        """
+        result = self.rollup(['date'])
+        cases = self._cases(result)
+        return pd.DataFrame({
+            'date': result['date'],
+            'itens_faltantes': cases,
+            'total_pedidos': result['total_pedidos'],
+            'casos_fraude': cases,
+            'percentual_fraude': percent(cases, result['total_pedidos']),
+        })
+
+    def fraud_time(self):
+        """
+        Casos por hora da fatia, no formato do DataFrame fraud_time.
+
+        Returns:
+            DataFrame com hour, casos_fraude e total_entregas
+        """
+        result = self.rollup(['hour'])
+        return pd.DataFrame({
+            'hour': result['hour'],
+            'casos_fraude': self._cases(result),
+            'total_entregas': result['total_pedidos'],
+        })
+
+    def fraud_region(self):
+        """
+        Métricas por região da fatia, no formato do DataFrame fraud_region.
+
+        Returns:
+            DataFrame com region, casos_fraude, total_pedidos, taxa_fraude,
+            percentual_fraude e total_itens_faltantes
+        """
+        result = self.rollup(['region'])
+        cases = self._cases(result)
+        rate = percent(cases, result['total_pedidos'])
+        return pd.DataFrame({
+            'region': result['region'].astype(STRING_DTYPE),
+            'casos_fraude': cases,
+            'total_pedidos': result['total_pedidos'],
+            'taxa_fraude': rate,
+            'percentual_fraude': rate,
+            'total_itens_faltantes': cases,
+        })
@@ -0,0 +1,228 @@
+"""
+Pool de conexões somente leitura com o banco SQLite do dashboard.
+
+Abrir uma conexão por carregamento custa a abertura do arquivo, a leitura
+do esquema e um cache de páginas vazio. O pool mantém algumas conexões
+abertas em modo somente leitura (URI com mode=ro), compartilhadas por
+todas as sessões do Streamlit por meio de st.cache_resource:
+
+- mmap_size: as páginas do banco são lidas por memory-map, direto do
+  cache do sistema operacional;
+- cache_size: cache de páginas do SQLite que sobrevive entre consultas;
+- cached_statements: cache de instruções preparadas do módulo sqlite3.
+  As consultas do dashboard usam textos SQL fixos com parâmetros nomeados,
+  então cada conexão compila cada consulta uma única vez;
+- query_only: qualquer tentativa de escrita falha em vez de bloquear o ETL.
+
+As escritas (ETL, migrações, tabelas de resumo) continuam usando conexões
+próprias com sqlite3.connect.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+
+import streamlit as st
+
+from config.settings import (DB_CACHE_SIZE_KB, DB_IMMUTABLE, DB_MMAP_SIZE, DB_PATH,
+                             DB_POOL_SIZE, DB_STATEMENT_CACHE)
+
+
+def read_only_uri(db_path, immutable=False):
+    """
+    Monta a URI SQLite somente leitura de um arquivo de banco.
+
+    Args:
+        db_path: Caminho do banco SQLite
+        immutable: Se True, adiciona immutable=1 (o SQLite deixa de verificar
+                   alterações e bloqueios; usar apenas se o arquivo não muda
+                   enquanto o dashboard está no ar)
+
+    Returns:
+        URI no formato file:...?mode=ro
+    """
+    uri = f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+    return uri
+
+
+def read_pragmas(mmap_size=DB_MMAP_SIZE, cache_size_kb=DB_CACHE_SIZE_KB):
+    """
+    Retorna os PRAGMAs aplicados a cada conexão de leitura.
+
+    Args:
+        mmap_size: Bytes do banco mapeados em memória
+        cache_size_kb: Tamanho do cache de páginas em KiB
+
+    Returns:
+        Lista de comandos PRAGMA
+    """
+    return [
+        f"PRAGMA mmap_size = {int(mmap_size)}",
+        # Valor negativo: tamanho em KiB, independente do tamanho da página
+        f"PRAGMA cache_size = {-int(cache_size_kb)}",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA query_only = ON",
+    ]
+
+
+class ConnectionPool:
+    """
+    Pool de conexões somente leitura com um banco SQLite.
+
+    As conexões são criadas sob demanda até o tamanho máximo e reutilizadas
+    na ordem inversa de devolução, o que favorece conexões com cache quente.
+    Cada conexão é usada por uma thread de cada vez.
+    """
+
+    def __init__(self, db_path, size=4, immutable=False, timeout=30.0,
+                 statement_cache=256, pragmas=None):
+        """
+        Args:
+            db_path: Caminho do banco SQLite
+            size: Quantidade máxima de conexões abertas
+            immutable: Abre o banco com immutable=1 (ver read_only_uri)
+            timeout: Segundos de espera por uma conexão livre
+            statement_cache: Instruções preparadas mantidas por conexão
+            pragmas: Comandos PRAGMA aplicados a cada conexão nova
+        """
+        self.db_path = db_path
+        self.size = max(1, int(size))
+        self.immutable = immutable
+        self.timeout = timeout
+        self.statement_cache = statement_cache
+        self.pragmas = read_pragmas() if pragmas is None else list(pragmas)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+
+    def _connect(self):
+        """Abre uma conexão nova e aplica os PRAGMAs de leitura."""
+        conn = sqlite3.connect(
+            read_only_uri(self.db_path, self.immutable),
+            uri=True,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.statement_cache
+        )
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        """
+        Retira uma conexão do pool, abrindo uma nova se houver espaço.
+
+        Returns:
+            Conexão sqlite3 somente leitura
+
+        Raises:
+            TimeoutError: Se nenhuma conexão ficar livre dentro do timeout
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"Nenhuma conexão livre com {self.db_path} após {self.timeout}s"
+                    ) from None
+
+        with self._lock:
+            self._in_use += 1
+        return conn
+
+    def release(self, conn):
+        """
+        Devolve uma conexão ao pool.
+
+        Args:
+            conn: Conexão obtida com acquire()
+        """
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Conexão inutilizável: descartar e liberar a vaga
+            with self._lock:
+                self._created -= 1
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Empresta uma conexão dentro de um bloco with.
+
+        Yields:
+            Conexão sqlite3 somente leitura, devolvida ao sair do bloco
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Fecha as conexões ociosas (as emprestadas são fechadas na devolução)."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+            conn.close()
+
+    def stats(self):
+        """
+        Retorna o estado do pool.
+
+        Returns:
+            Dicionário com conexões abertas, em uso e ociosas
+        """
+        with self._lock:
+            return {
+                'abertas': self._created,
+                'em_uso': self._in_use,
+                'ociosas': self._idle.qsize(),
+                'tamanho_maximo': self.size,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_pool(db_path=DB_PATH, size=DB_POOL_SIZE, immutable=DB_IMMUTABLE):
+    """
+    Retorna o pool de conexões compartilhado por todas as sessões.
+
+    Args:
+        db_path: Caminho do banco SQLite
+        size: Quantidade máxima de conexões abertas
+        immutable: Abre o banco com immutable=1
+
+    Returns:
+        ConnectionPool (um por combinação de argumentos)
+    """
+    return ConnectionPool(db_path, size=size, immutable=immutable,
+                          statement_cache=DB_STATEMENT_CACHE)
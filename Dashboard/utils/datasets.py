@@ -0,0 +1,135 @@
+"""
+Referências versionadas aos DataFrames do dashboard para st.cache_data.
+
+Uma função com @st.cache_data calcula a chave do cache a partir do
+conteúdo dos argumentos; para um DataFrame isso significa percorrer (ou
+amostrar) todas as linhas a cada chamada, mesmo quando o resultado já está
+em cache. Um DatasetHandle carrega o DataFrame junto com um identificador
+de versão (versão de conteúdo do banco, modo de carregamento e filtros
+globais), e HASH_FUNCS faz o Streamlit usar apenas esse identificador.
+
+Uso:
+    @st.cache_data(hash_funcs=HASH_FUNCS)
+    def prepare(df):
+        df = frame_of(df)
+        ...
+
+    prepare(dataset(data, 'fraud_trend'))
+"""
+
+# Chave do dicionário de dados com a versão dos DataFrames carregados
+DATASET_VERSION_KEY = '_version'
+
+
+class DatasetHandle:
+    """
+    Referência imutável a um DataFrame identificada por nome e versão.
+
+    Dois handles com o mesmo nome e versão são considerados iguais, sem
+    comparar o conteúdo: a versão deve mudar sempre que o conteúdo mudar.
+    """
+
+    __slots__ = ('name', 'version', '_frame')
+
+    def __init__(self, name, version, frame):
+        """
+        Args:
+            name: Nome do DataFrame (ex.: 'fraud_trend')
+            version: Identificador da versão dos dados
+            frame: DataFrame referenciado
+        """
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_frame', frame)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DatasetHandle é imutável")
+
+    @property
+    def frame(self):
+        """DataFrame referenciado."""
+        return self._frame
+
+    @property
+    def token(self):
+        """Identificador usado como chave de cache."""
+        return f"{self.version}:{self.name}"
+
+    def derive(self, step, frame):
+        """
+        Cria o handle de um DataFrame derivado deste.
+
+        Args:
+            step: Descrição determinística da transformação (incluindo
+                  seus parâmetros)
+            frame: DataFrame resultante
+
+        Returns:
+            DatasetHandle com a mesma versão e nome 'nome/step'
+        """
+        return DatasetHandle(f"{self.name}/{step}", self.version, frame)
+
+    def __eq__(self, other):
+        return isinstance(other, DatasetHandle) and self.token == other.token
+
+    def __hash__(self):
+        return hash(self.token)
+
+    def __repr__(self):
+        return f"DatasetHandle({self.token!r})"
+
+
+# hash_funcs para @st.cache_data: chave de cache em O(1)
+HASH_FUNCS = {DatasetHandle: lambda handle: handle.token}
+
+
+def frame_of(value):
+    """
+    Retorna o DataFrame de um handle (ou o próprio valor, se não for handle).
+
+    Args:
+        value: DatasetHandle, DataFrame ou None
+
+    Returns:
+        DataFrame ou None
+    """
+    return value.frame if isinstance(value, DatasetHandle) else value
+
+
+def with_version(data, version):
+    """
+    Registra a versão no dicionário de dados.
+
+    Args:
+        data: Dicionário com os DataFrames do dashboard
+        version: Identificador da versão (ex.: db_content_version)
+
+    Returns:
+        Novo dicionário com a chave DATASET_VERSION_KEY
+    """
+    if not data or version is None:
+        return data
+    return {**data, DATASET_VERSION_KEY: str(version)}
+
+
+def dataset(data, name):
+    """
+    Retorna o handle de um DataFrame do dicionário de dados.
+
+    Sem versão registrada, retorna o próprio DataFrame: as funções em
+    cache continuam funcionando, com a chave calculada pelo conteúdo.
+
+    Args:
+        data: Dicionário com os DataFrames do dashboard
+        name: Nome do DataFrame
+
+    Returns:
+        DatasetHandle, DataFrame ou None se o DataFrame não existir
+    """
+    if not data:
+        return None
+    frame = data.get(name)
+    version = data.get(DATASET_VERSION_KEY)
+    if frame is None or version is None:
+        return frame
+    return DatasetHandle(name, version, frame)
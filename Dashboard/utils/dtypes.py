@@ -0,0 +1,271 @@
+"""
+Esquema de tipos compactos aplicado aos DataFrames no carregamento.
+
+O SQLite devolve textos como objetos Python e inteiros como int64. Aqui
+cada coluna conhecida recebe um tipo menor:
+
+- IDs e nomes: string com armazenamento Arrow (um buffer contíguo em vez
+  de um objeto Python por linha);
+- dimensões de baixa cardinalidade das tabelas base: category;
+- horas, idades e contagens: int8/int16/int32, conforme o intervalo;
+- preço unitário: float32. Valores monetários somados (order_amount) e
+  percentuais exibidos continuam em float64 para não perder centavos.
+
+Uso pela linha de comando (a partir da pasta Dashboard):
+    python -m utils.dtypes           # relatório de memória antes/depois
+"""
+import argparse
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    STRING_DTYPE = 'string[pyarrow]'
+    # Textos Arrow voltam como STRING_DTYPE em to_pandas(types_mapper=ARROW_STRING_TYPES.get),
+    # sem criar um objeto Python por valor
+    ARROW_STRING_TYPES = {
+        pa.string(): pd.api.types.pandas_dtype(STRING_DTYPE),
+        pa.large_string(): pd.api.types.pandas_dtype(STRING_DTYPE)
+    }
+except ImportError:
+    STRING_DTYPE = 'string'
+    ARROW_STRING_TYPES = {}
+
+# Tipos das tabelas base, usados ao ler as tabelas completas ou em blocos
+TABLE_DTYPES = {
+    'orders': {
+        'order_id': STRING_DTYPE,
+        'region': 'category',
+        'items_delivered': 'int16',
+        'items_missing': 'int16',
+        'delivery_hour': STRING_DTYPE,
+        'driver_id': STRING_DTYPE,
+        'customer_id': STRING_DTYPE,
+        'delivery_hour_only': 'int8',
+        'delivery_minute': 'int8',
+        'delivery_second': 'int8',
+        'period_of_day': 'category',
+        # Colunas com alias nas consultas de leitura em blocos
+        'day': 'category',
+        'hour': 'int8',
+    },
+    'drivers': {
+        'driver_id': STRING_DTYPE,
+        'driver_name': STRING_DTYPE,
+        'age': 'int8',
+        'Trips': 'int32',
+    },
+    'customers': {
+        'customer_id': STRING_DTYPE,
+        'customer_name': STRING_DTYPE,
+        'customer_age': 'int8',
+    },
+    'products': {
+        'product_id': STRING_DTYPE,
+        'product_name': STRING_DTYPE,
+        'category': 'category',
+        'price': 'float32',
+    },
+    'missing_items': {
+        'order_id': STRING_DTYPE,
+        'product_id_1': STRING_DTYPE,
+        'product_id_2': STRING_DTYPE,
+        'product_id_3': STRING_DTYPE,
+    },
+    'order_missing_product': {
+        'order_id': STRING_DTYPE,
+        'product_id': STRING_DTYPE,
+        'position': 'int8',
+    },
+}
+
+# Tipos das colunas dos DataFrames derivados (os nomes são os mesmos em
+# todos os DataFrames do dashboard). Não há colunas category aqui: as
+# páginas agrupam esses DataFrames e um category exibiria grupos vazios.
+FRAME_COLUMN_DTYPES = {
+    'driver_id': STRING_DTYPE,
+    'driver_name': STRING_DTYPE,
+    'customer_id': STRING_DTYPE,
+    'customer_name': STRING_DTYPE,
+    'product_id': STRING_DTYPE,
+    'product_name': STRING_DTYPE,
+    'category': STRING_DTYPE,
+    'region': STRING_DTYPE,
+    'age': 'int8',
+    'customer_age': 'int8',
+    'hour': 'int8',
+    'hora': 'int8',
+    'total_pedidos': 'int32',
+    'total_entregas': 'int32',
+    'casos_fraude': 'int32',
+    'itens_faltantes': 'int32',
+    'total_itens_faltantes': 'int32',
+    'relatos_fraude': 'int32',
+    'total_relatos': 'int32',
+    'pedidos_com_fraude': 'int32',
+    'produtos_distintos': 'int32',
+    'price': 'float32',
+}
+
+# Tipos dos cubos OLAP (utils/cube.py). As dimensões ficam em category:
+# os cubos só são agrupados pelo próprio OlapCube, com observed=True.
+CUBE_DTYPES = {
+    'hour': 'int8',
+    'weekday': 'int8',
+    'region': 'category',
+    'category': 'category',
+    'total_pedidos': 'int32',
+    'itens_faltantes': 'int32',
+    'itens_entregues': 'int32',
+    'pedidos_com_falta': 'int32',
+    'total_relatos': 'int32',
+}
+
+# DataFrames derivados com esquema próprio (os demais usam FRAME_COLUMN_DTYPES)
+FRAME_DTYPES = {
+    'cube_region': CUBE_DTYPES,
+    'cube_category': CUBE_DTYPES,
+}
+
+
+def _can_cast(series, dtype):
+    """
+    Verifica se a coluna cabe no tipo de destino sem perda.
+
+    Inteiros só são reduzidos quando não há nulos e todos os valores
+    estão dentro do intervalo do tipo; caso contrário a coluna é mantida.
+    """
+    if str(series.dtype) == dtype:
+        return False
+    if dtype.startswith('int'):
+        if not pd.api.types.is_numeric_dtype(series) or series.isna().any():
+            return False
+        if len(series) == 0:
+            return True
+        info = np.iinfo(dtype)
+        return info.min <= series.min() and series.max() <= info.max
+    if dtype.startswith('float'):
+        return pd.api.types.is_float_dtype(series)
+    if dtype == 'category':
+        return not isinstance(series.dtype, pd.CategoricalDtype)
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def apply_schema(df, dtypes):
+    """
+    Converte as colunas de um DataFrame para os tipos compactos.
+
+    Colunas ausentes no esquema ou que não cabem no tipo são mantidas.
+
+    Args:
+        df: DataFrame a converter
+        dtypes: Nome de uma tabela de TABLE_DTYPES ou dicionário coluna -> tipo
+
+    Returns:
+        DataFrame com os tipos convertidos (o original não é alterado)
+    """
+    if df is None or df.empty:
+        return df
+    if isinstance(dtypes, str):
+        dtypes = TABLE_DTYPES.get(dtypes, {})
+
+    casts = {
+        col: dtype for col, dtype in dtypes.items()
+        if col in df.columns and _can_cast(df[col], dtype)
+    }
+    return df.astype(casts) if casts else df
+
+
+def apply_frame_schemas(frames):
+    """
+    Aplica FRAME_COLUMN_DTYPES (ou o esquema de FRAME_DTYPES) aos DataFrames derivados.
+
+    Args:
+        frames: Dicionário nome -> DataFrame
+
+    Returns:
+        Novo dicionário com os DataFrames convertidos
+    """
+    return {
+        name: apply_schema(df, FRAME_DTYPES.get(name, FRAME_COLUMN_DTYPES))
+        if isinstance(df, pd.DataFrame) else df
+        for name, df in frames.items()
+    }
+
+
+def frame_memory(df):
+    """Retorna os bytes ocupados por um DataFrame, incluindo textos."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(before, after):
+    """
+    Compara a memória de dois conjuntos de DataFrames.
+
+    Args:
+        before: Dicionário nome -> DataFrame com os tipos originais
+        after: Dicionário nome -> DataFrame com os tipos compactos
+
+    Returns:
+        DataFrame com linhas, bytes antes, bytes depois e redução por DataFrame
+    """
+    rows = []
+    for name, df in before.items():
+        if not isinstance(df, pd.DataFrame) or name not in after:
+            continue
+        bytes_before = frame_memory(df)
+        bytes_after = frame_memory(after[name])
+        rows.append({
+            'frame': name,
+            'linhas': len(df),
+            'bytes_antes': bytes_before,
+            'bytes_depois': bytes_after,
+            'reducao_pct': round(100 * (1 - bytes_after / bytes_before), 1) if bytes_before else 0.0
+        })
+
+    report = pd.DataFrame(rows, columns=['frame', 'linhas', 'bytes_antes', 'bytes_depois', 'reducao_pct'])
+    if not report.empty:
+        total_before = report['bytes_antes'].sum()
+        total_after = report['bytes_depois'].sum()
+        report.loc[len(report)] = {
+            'frame': 'TOTAL',
+            'linhas': report['linhas'].sum(),
+            'bytes_antes': total_before,
+            'bytes_depois': total_after,
+            'reducao_pct': round(100 * (1 - total_after / total_before), 1) if total_before else 0.0
+        }
+    return report
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    from config.settings import DB_PATH
+    from utils.aggregations import build_dashboard_frames
+    from utils.schema import table_exists
+
+    parser = argparse.ArgumentParser(description="Relatório de memória dos tipos compactos")
+    parser.add_argument('--db', default=DB_PATH, help="Caminho do banco SQLite")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        tables = {
+            name: pd.read_sql_query(f"SELECT * FROM {name}", conn)
+            for name in TABLE_DTYPES if table_exists(conn, name)
+        }
+        frames = build_dashboard_frames(conn)
+    finally:
+        conn.close()
+
+    pd.set_option('display.width', 120)
+    print("Tabelas base")
+    print(memory_report(tables, {name: apply_schema(df, name) for name, df in tables.items()}).to_string(index=False))
+    print()
+    print("DataFrames do dashboard")
+    print(memory_report(frames, apply_frame_schemas(frames)).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Agregação de pedidos em uma única leitura da tabela orders.
+
+Cada bloco de pedidos é lido uma vez e, para cada dimensão (dia, hora,
+região, motorista e cliente), as chaves são convertidas em códigos
+inteiros com pd.factorize (hash) e as métricas são somadas com
+np.bincount. Os totais de todas as dimensões saem da mesma leitura, em
+vez de uma consulta GROUP BY (e uma varredura de orders) por DataFrame.
+
+Métricas por chave:
+- pedidos: pedidos com order_id (equivale a COUNT(order_id));
+- itens: soma de items_missing;
+- entregues: soma de items_delivered;
+- pedidos_com_falta: pedidos com ao menos um item faltante;
+- media_itens: itens / pedidos (calculada em totals()).
+"""
+import numpy as np
+import pandas as pd
+
+from utils.dtypes import apply_schema
+from utils.perf import timed
+
+# Uma linha por pedido, na ordem de gravação (rowid). A data vem truncada
+# para o dia pelo SQLite, então só os dias distintos passam por to_datetime.
+ORDER_SCAN_SQL = """
+    SELECT DATE(date) AS day,
+           delivery_hour_only AS hour,
+           region,
+           driver_id,
+           customer_id,
+           order_id IS NOT NULL AS pedido,
+           items_missing,
+           items_delivered
+    FROM orders
+"""
+
+# Dimensões agregadas e, para cada uma, colunas cujo primeiro valor (na
+# ordem de rowid) é guardado junto com os totais
+SCAN_DIMENSIONS = {
+    'day': [],
+    'hour': [],
+    'region': [],
+    'driver_id': [],
+    'customer_id': ['region'],
+}
+
+METRICS = ['pedidos', 'itens', 'entregues', 'pedidos_com_falta']
+
+
+class KeyedTotals:
+    """
+    Somas por chave acumuladas bloco a bloco.
+
+    As chaves vistas até o momento ficam em um pd.Index; a cada bloco só as
+    chaves distintas do bloco são procuradas nele, e as somas do bloco
+    (calculadas com bincount sobre os códigos locais) são adicionadas às
+    posições globais.
+    """
+
+    def __init__(self, metrics, first_columns=()):
+        self.metrics = list(metrics)
+        self.first_columns = list(first_columns)
+        self._index = pd.Index([])
+        self._sums = {name: np.zeros(0, dtype='float64') for name in self.metrics}
+        self._first = {name: [] for name in self.first_columns}
+
+    def add(self, keys, weights, first_values=None):
+        """
+        Soma um bloco aos totais.
+
+        Args:
+            keys: Series com a chave de cada linha (nulos são ignorados)
+            weights: Dicionário métrica -> array com o valor de cada linha
+            first_values: Dicionário coluna -> Series, para as colunas de
+                          first_columns (primeiro valor de cada chave)
+        """
+        codes, uniques = pd.factorize(keys, sort=False)
+        # Chaves como array simples: blocos com categorias diferentes
+        # continuam comparáveis no índice global
+        uniques = np.asarray(uniques)
+        valid = codes >= 0
+        if not valid.all():
+            codes = codes[valid]
+            weights = {name: values[valid] for name, values in weights.items()}
+            if first_values:
+                first_values = {name: values[valid] for name, values in first_values.items()}
+        if len(uniques) == 0:
+            return
+
+        positions = self._index.get_indexer(uniques)
+        new = positions < 0
+        if new.any():
+            start = len(self._index)
+            positions[new] = np.arange(start, start + int(new.sum()))
+            new_keys = pd.Index(uniques[new])
+            self._index = self._index.append(new_keys) if start else new_keys
+            for name in self.metrics:
+                self._sums[name] = np.concatenate([self._sums[name], np.zeros(int(new.sum()))])
+            if self.first_columns:
+                # Primeira linha de cada chave nova: início do código na
+                # ordenação estável dos códigos
+                order = np.argsort(codes, kind='stable')
+                first_rows = order[np.searchsorted(codes[order], np.flatnonzero(new))]
+                for name in self.first_columns:
+                    self._first[name].append(np.asarray(first_values[name])[first_rows])
+
+        for name in self.metrics:
+            self._sums[name][positions] += np.bincount(codes, weights=weights[name], minlength=len(uniques))
+
+    def to_frame(self):
+        """
+        Retorna os totais como DataFrame.
+
+        Returns:
+            DataFrame indexado pela chave (ordenado), com uma coluna por
+            métrica (inteiros) e as colunas de first_columns
+        """
+        frame = pd.DataFrame(
+            {name: self._sums[name].astype('int64') for name in self.metrics},
+            index=self._index
+        )
+        for name in self.first_columns:
+            parts = self._first[name]
+            frame[name] = np.concatenate(parts) if parts else np.array([], dtype=object)
+        return frame.sort_index()
+
+
+class OrderScan:
+    """Totais de todas as dimensões de SCAN_DIMENSIONS em uma leitura de orders."""
+
+    def __init__(self, dimensions=None):
+        self.dimensions = dict(SCAN_DIMENSIONS if dimensions is None else dimensions)
+        self._totals = {
+            dim: KeyedTotals(METRICS, first_columns)
+            for dim, first_columns in self.dimensions.items()
+        }
+        self.rows_read = 0
+
+    def add_chunk(self, chunk):
+        """
+        Incorpora um bloco de pedidos a todas as dimensões.
+
+        Args:
+            chunk: DataFrame com as colunas de ORDER_SCAN_SQL
+        """
+        self.rows_read += len(chunk)
+        missing = chunk['items_missing'].fillna(0).to_numpy('float64')
+        weights = {
+            'pedidos': chunk['pedido'].fillna(0).to_numpy('float64'),
+            'itens': missing,
+            'entregues': chunk['items_delivered'].fillna(0).to_numpy('float64'),
+            'pedidos_com_falta': (missing > 0).astype('float64'),
+        }
+        for dim, first_columns in self.dimensions.items():
+            self._totals[dim].add(
+                chunk[dim],
+                weights,
+                {name: chunk[name] for name in first_columns}
+            )
+
+    def totals(self, dim):
+        """
+        Retorna os totais de uma dimensão.
+
+        Args:
+            dim: Uma das dimensões de SCAN_DIMENSIONS
+
+        Returns:
+            DataFrame indexado pela chave com as métricas de METRICS e a
+            média de itens faltantes por pedido (media_itens)
+        """
+        frame = self._totals[dim].to_frame()
+        frame['media_itens'] = (frame['itens'] / frame['pedidos'].where(frame['pedidos'] > 0)).round(2)
+        return frame
+
+
+@timed
+def scan_orders(conn, chunk_size=100_000):
+    """
+    Lê a tabela orders uma única vez e acumula os totais de todas as dimensões.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        chunk_size: Quantidade de linhas por bloco
+
+    Returns:
+        OrderScan preenchido
+    """
+    scan = OrderScan()
+    for chunk in pd.read_sql_query(ORDER_SCAN_SQL, conn, chunksize=chunk_size):
+        scan.add_chunk(apply_schema(chunk, 'orders'))
+    return scan
@@ -0,0 +1,196 @@
+"""
+Cache das figuras Plotly montadas por utils/graphics.py.
+
+Montar uma figura com plotly.express (validação de cada propriedade,
+agrupamentos, traces) custa dezenas de milissegundos e acontece a cada
+reexecução do script, mesmo sem mudança nos dados ou nos parâmetros. As
+funções decoradas com @cached_figure guardam a figura serializada em JSON,
+chaveada por:
+
+- função construtora;
+- versão dos dados: o token do DatasetHandle (O(1)) ou, para um DataFrame
+  comum, uma impressão digital do conteúdo (pd.util.hash_pandas_object);
+- demais argumentos, com os valores padrão aplicados;
+- tema (claro ou escuro).
+
+O cache é compartilhado por todas as sessões e limitado em bytes
+(FIGURE_CACHE_MAX_MB em config/settings.py), com descarte do item usado há
+mais tempo (LRU). Cada acerto devolve uma nova figura reconstruída do
+JSON: as páginas podem alterá-la (update_layout etc.) sem afetar o cache.
+"""
+import functools
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+
+from config.settings import FIGURE_CACHE_MAX_MB
+from utils.datasets import DatasetHandle
+
+
+class FigureCache:
+    """Cache LRU de figuras serializadas, limitado pelo total de bytes."""
+
+    def __init__(self, max_bytes):
+        """
+        Args:
+            max_bytes: Tamanho máximo do cache (soma dos JSONs em bytes)
+        """
+        self.max_bytes = int(max_bytes)
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Retorna o JSON da figura, ou None se não estiver no cache.
+
+        Args:
+            key: Chave da figura
+
+        Returns:
+            Texto JSON da figura ou None
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload):
+        """
+        Guarda o JSON de uma figura, descartando as menos usadas se necessário.
+
+        Figuras maiores que o próprio limite não são guardadas.
+
+        Args:
+            key: Chave da figura
+            payload: Texto JSON da figura
+        """
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous)
+            self._entries[key] = payload
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def clear(self):
+        """Remove todas as figuras do cache."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self):
+        """
+        Retorna as estatísticas de uso do cache.
+
+        Returns:
+            Dicionário com figuras, bytes, limite, acertos e faltas
+        """
+        with self._lock:
+            return {
+                'figuras': len(self._entries),
+                'bytes': self.size_bytes,
+                'max_bytes': self.max_bytes,
+                'acertos': self.hits,
+                'faltas': self.misses,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache(max_mb=FIGURE_CACHE_MAX_MB):
+    """
+    Retorna o cache de figuras compartilhado por todas as sessões.
+
+    Returns:
+        FigureCache (um por limite de tamanho)
+    """
+    return FigureCache(max_mb * 1024 * 1024)
+
+
+def data_token(value):
+    """
+    Identifica a versão dos dados de um argumento da figura.
+
+    Args:
+        value: DatasetHandle, DataFrame ou outro valor
+
+    Returns:
+        Token do handle, impressão digital do DataFrame (colunas, tipos e
+        conteúdo) ou repr do valor
+    """
+    if isinstance(value, DatasetHandle):
+        return f"handle:{value.token}"
+    if isinstance(value, pd.DataFrame):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(list(zip(value.columns, value.dtypes.astype(str)))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        return f"frame:{digest.hexdigest()}"
+    return repr(value)
+
+
+def theme_mode():
+    """Tema atual do dashboard ('light' ou 'dark')."""
+    return 'dark' if st.session_state.get('dark_mode', False) else 'light'
+
+
+def cached_figure(builder):
+    """
+    Decora uma função de utils/graphics.py com o cache de figuras.
+
+    A função decorada aceita um DatasetHandle no lugar do DataFrame; a
+    função original sempre recebe o DataFrame.
+
+    Args:
+        builder: Função que recebe os dados e devolve uma figura Plotly
+
+    Returns:
+        Função com a mesma assinatura que consulta o cache antes de montar
+    """
+    signature = inspect.signature(builder)
+
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        try:
+            parts = [f"{name}={data_token(value)}" for name, value in bound.arguments.items()]
+        except TypeError:
+            # DataFrame com valores que não podem ser hasheados (ex.: listas)
+            parts = None
+
+        for name, value in bound.arguments.items():
+            if isinstance(value, DatasetHandle):
+                bound.arguments[name] = value.frame
+
+        if parts is None:
+            return builder(*bound.args, **bound.kwargs)
+
+        key = "|".join([builder.__module__, builder.__qualname__, theme_mode(), *parts])
+        cache = get_figure_cache()
+        payload = cache.get(key)
+        if payload is None:
+            fig = builder(*bound.args, **bound.kwargs)
+            payload = fig.to_json()
+            cache.put(key, payload)
+            return fig
+        return pio.from_json(payload, skip_invalid=True)
+
+    wrapper.uncached = builder
+    return wrapper
@@ -3,15 +3,20 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
-def apply_global_filters(data, date_filter=None, category_filter=None, region_filter=None):
+def apply_global_filters(data, date_filter=None, category_filter=None, region_filter=None, frames=None):
     """
-    Aplica filtros globais a todos os DataFrames relevantes.
+    Recalcula todos os DataFrames do dashboard para os filtros globais.
+    
+    Os filtros são aplicados na origem (cubo OLAP e consultas SQL com os
+    filtros no WHERE), ver utils/pushdown.py. Sem filtros ativos, os dados
+    são devolvidos sem alteração.
     
     Args:
         data: Dicionário com todos os DataFrames
         date_filter: Tupla (data_inicio, data_fim) para filtro
         category_filter: Categoria selecionada para filtro
         region_filter: Região selecionada para filtro
+        frames: Nomes dos DataFrames necessários (padrão: todos)
         
     Returns:
         Dicionário com DataFrames filtrados
@@ -19,40 +24,17 @@ def apply_global_filters(data, date_filter=None, category_filter=None, region_fi
     if data is None:
         return None
     
-    filtered_data = {}
-    
-    # Aplicar filtro de data ao conjunto de tendências
-    if 'fraud_trend' in data and data['fraud_trend'] is not None and date_filter is not None:
-        from utils.loaders import apply_date_filter
-        filtered_data['fraud_trend'] = apply_date_filter(data['fraud_trend'], date_filter)
-    else:
-        filtered_data['fraud_trend'] = data.get('fraud_trend')
-    
-    # Aplicar filtro de categoria aos produtos
-    if 'missing_products' in data and data['missing_products'] is not None and category_filter is not None:
-        from utils.loaders import apply_category_filter
-        filtered_data['missing_products'] = apply_category_filter(
-            data['missing_products'], 
-            category_filter
-        )
-    else:
-        filtered_data['missing_products'] = data.get('missing_products')
-    
-    # Aplicar filtro de região
-    if 'fraud_region' in data and data['fraud_region'] is not None and region_filter is not None:
-        from utils.loaders import apply_region_filter
-        filtered_data['fraud_region'] = apply_region_filter(
-            data['fraud_region'], 
-            region_filter
-        )
-    else:
-        filtered_data['fraud_region'] = data.get('fraud_region')
-    
-    # Copiar outros dataframes sem alteração
-    for key in ['drivers', 'fraud_time', 'suspicious_drivers', 'suspicious_customers']:
-        filtered_data[key] = data.get(key)
-    
-    return filtered_data
+    from utils.pushdown import build_filtered_frames, normalize_filters
+    
+    filters = normalize_filters(data, date_filter, category_filter, region_filter)
+    if not filters:
+        return data
+    
+    if 'cube_region' not in data:
+        st.warning("Cubo de dados indisponível: filtros globais não aplicados")
+        return data
+    
+    return build_filtered_frames(data, filters, frames=frames)
 
 def filter_suspicious_entries(df, threshold=0.1, column='percentual_fraude'):
     """
@@ -0,0 +1,38 @@
+"""
+Reexecução parcial de seções das páginas (fragments do Streamlit).
+
+Uma interação com um widget reexecuta o script inteiro: carregamento dos
+dados, barra lateral, filtros globais e a página toda. Uma função
+decorada com @fragment é reexecutada sozinha quando um widget criado
+dentro dela muda, com os mesmos argumentos da última execução completa.
+
+st.fragment existe a partir do Streamlit 1.37, a versão fixada em
+requirements.txt (st.experimental_fragment entre 1.33 e 1.36). Em versões
+anteriores o decorador não altera a função: a seção continua funcionando,
+com reexecução completa do script.
+
+Os widgets de cada seção ficam em um formulário (st.form), de modo que
+uma alteração gera uma única reexecução da seção, no envio.
+"""
+import streamlit as st
+
+_st_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+# Indica se a versão instalada do Streamlit reexecuta fragments isoladamente
+FRAGMENTS_AVAILABLE = _st_fragment is not None
+
+
+def fragment(func):
+    """
+    Decora uma seção de página para ser reexecutada isoladamente.
+
+    Args:
+        func: Função que desenha a seção
+
+    Returns:
+        Função decorada com st.fragment, ou a própria função se a versão
+        do Streamlit não tiver fragments
+    """
+    if _st_fragment is None:
+        return func
+    return _st_fragment(func)
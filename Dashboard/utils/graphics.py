@@ -1,13 +1,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
+from utils.lazy import lazy_import
+from utils.perf import timed
 from config.style_config import THEME, create_tooltip
+from utils.figure_cache import cached_figure
 
+# plotly.express só é carregado quando a primeira figura é montada
+px = lazy_import('plotly.express')
+
+@timed
+@cached_figure
 def create_time_heatmap(df, time_column='hora', day_column='dia_semana', value_column='percentual_fraude', 
                        title='Heatmap de Fraudes por Hora/Dia'):
     """
@@ -116,6 +121,8 @@ def create_time_heatmap(df, time_column='hora', day_column='dia_semana', value_c
     
     return fig
 
+@timed
+@cached_figure
 def create_bar_chart(df, x_column, y_column, title, color_column=None, 
                    orientation='v', height=400, text_auto=True):
     """
@@ -189,6 +196,8 @@ def create_bar_chart(df, x_column, y_column, title, color_column=None,
     
     return fig
 
+@timed
+@cached_figure
 def create_time_series(df, x_column, y_column, title, add_trendline=True, height=400, 
                      secondary_y_column=None, colors=None):
     """
@@ -337,6 +346,7 @@ def create_time_series(df, x_column, y_column, title, add_trendline=True, height
     
     return fig
 
+@timed
 def create_pie_chart(df, label_column, value_column, title, hole=0, height=400):
     """
     Cria um gráfico de pizza ou donut.
@@ -399,6 +409,7 @@ def create_pie_chart(df, label_column, value_column, title, hole=0, height=400):
     
     return fig
 
+@timed
 def create_gauge_chart(value, title, min_value=0, max_value=100, threshold_values=None, threshold_colors=None, height=300):
     """
     Cria um gráfico de medidor.
@@ -476,6 +487,7 @@ def create_gauge_chart(value, title, min_value=0, max_value=100, threshold_value
     
     return fig
 
+@timed
 def create_scatter_plot(df, x_column, y_column, title, color_column=None, size_column=None, text_column=None, height=400):
     """
     Cria um gráfico de dispersão.
@@ -566,6 +578,8 @@ def create_scatter_plot(df, x_column, y_column, title, color_column=None, size_c
     
     return fig
 
+@timed
+@cached_figure
 def create_treemap(df, path, values, title, color_column=None, height=500):
     """
     Cria um gráfico de treemap.
@@ -623,6 +637,8 @@ def create_treemap(df, path, values, title, color_column=None, height=500):
     
     return fig
 
+@timed
+@cached_figure
 def create_correlation_matrix(df, title='Matriz de Correlação', height=600):
     """
     Cria uma matriz de correlação.
@@ -690,6 +706,7 @@ def create_correlation_matrix(df, title='Matriz de Correlação', height=600):
     
     return fig
 
+@timed
 def create_map(df, lat_column, lon_column, color_col=None, size_col=None, hover_name=None, hover_data=None, title='Mapa'):
     """
     Cria um mapa com pontos georreferenciados.
@@ -755,6 +772,8 @@ def create_map(df, lat_column, lon_column, color_col=None, size_col=None, hover_
     
     return fig
 
+@timed
+@cached_figure
 def create_sankey_diagram(df, source_col, target_col, value_col, title='Diagrama de Sankey'):
     """
     Cria um diagrama de Sankey.
@@ -0,0 +1,222 @@
+"""
+Conversão vetorizada dos campos textuais dos CSVs de origem.
+
+Os CSVs guardam valores monetários como "$1,095.54", horários de entrega
+como "8:37:28" e datas como texto. As funções abaixo convertem colunas
+inteiras de uma vez com pyarrow.compute/NumPy, sem funções Python por
+linha, e são usadas pelo ETL (notebook de limpeza) e pelos carregadores
+do dashboard.
+
+Comparação com o código linha a linha:
+    python benchmarks/bench_ingestion.py --rows 2000000
+"""
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Períodos do dia como (hora inicial, rótulo), em ordem crescente de hora.
+# ETL_DAY_PERIODS reproduz a coluna period_of_day gravada pelo ETL;
+# DASHBOARD_DAY_PERIODS é a divisão em quatro faixas usada nas páginas.
+ETL_DAY_PERIODS = ((0, 'Noite'), (5, 'Manhã'), (12, 'Tarde'), (18, 'Noite'))
+DASHBOARD_DAY_PERIODS = ((0, 'Madrugada'), (6, 'Manhã'), (12, 'Tarde'), (18, 'Noite'))
+
+# Formatos de data aceitos, testados apenas sobre uma amostra
+DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',  # 2023-01-15 14:30:00
+    '%Y-%m-%d',           # 2023-01-15
+    '%d/%m/%Y %H:%M',     # 15/01/2023 14:30
+    '%m/%d/%Y %H:%M',     # 01/15/2023 14:30
+    '%Y-%m-%dT%H:%M:%S',  # 2023-01-15T14:30:00
+    '%Y%m%d%H%M%S'        # 20230115143000
+]
+
+_TIME_OF_DAY_PATTERN = r'^\d{1,2}:\d{2}:\d{2}$'
+
+
+def _to_arrow_strings(values):
+    """Converte uma coluna de textos em pyarrow.StringArray."""
+    if isinstance(values, pd.Series):
+        values = values.array
+    if isinstance(values, pa.ChunkedArray):
+        return values.combine_chunks().cast(pa.string())
+    if hasattr(values, '__arrow_array__'):
+        return pa.array(values).cast(pa.string())
+    return pa.array(values, type=pa.string(), from_pandas=True)
+
+
+def _index_of(values):
+    """Retorna o índice original quando a entrada é uma Series."""
+    return values.index if isinstance(values, pd.Series) else None
+
+
+def parse_currency(values, errors='raise'):
+    """
+    Converte valores monetários textuais ("$1,095.54") em float.
+
+    Args:
+        values: Series ou lista de textos (valores numéricos são mantidos)
+        errors: 'raise' para falhar em valores inválidos ou 'coerce' para NaN
+
+    Returns:
+        Series float64 com o mesmo índice da entrada
+    """
+    index = _index_of(values)
+    if isinstance(values, pd.Series) and pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64')
+
+    cleaned = pc.utf8_trim(pc.replace_substring(_to_arrow_strings(values), ',', ''), '$ ')
+    try:
+        result = pc.cast(cleaned, pa.float64()).to_numpy(zero_copy_only=False)
+    except pa.ArrowInvalid:
+        if errors != 'coerce':
+            raise ValueError("Valor monetário inválido na coluna")
+        result = pd.to_numeric(pd.Series(cleaned.to_pandas()), errors='coerce').to_numpy('float64')
+    return pd.Series(result, index=index, dtype='float64')
+
+
+def parse_time_of_day(values, errors='raise'):
+    """
+    Converte horários "H:MM:SS" em segundos do dia, hora, minuto e segundo.
+
+    Args:
+        values: Series ou lista de textos no formato H:MM:SS
+        errors: 'raise' para falhar em valores inválidos ou 'coerce' para
+                marcá-los como nulos (colunas passam a Int16/Int32 anuláveis)
+
+    Returns:
+        DataFrame com as colunas seconds, hour, minute e second
+    """
+    index = _index_of(values)
+    text = pc.utf8_trim_whitespace(_to_arrow_strings(values))
+    parts = pc.split_pattern(text, ':')
+
+    valid = pc.fill_null(pc.equal(pc.list_value_length(parts), 3), False)
+    all_valid = pc.all(valid).as_py() if len(text) else True
+    try:
+        if not all_valid:
+            raise pa.ArrowInvalid("horário fora do formato H:MM:SS")
+        hms = pc.cast(pc.list_flatten(parts), pa.int32()).to_numpy().reshape(-1, 3)
+        mask = None
+    except pa.ArrowInvalid:
+        if errors != 'coerce':
+            raise ValueError("Horário inválido na coluna; esperado H:MM:SS")
+        valid = pc.fill_null(pc.match_substring_regex(text, _TIME_OF_DAY_PATTERN), False)
+        hms = np.zeros((len(text), 3), dtype=np.int32)
+        if pc.any(valid).as_py():
+            hms[valid.to_numpy(zero_copy_only=False)] = pc.cast(
+                pc.list_flatten(parts.filter(valid)), pa.int32()
+            ).to_numpy().reshape(-1, 3)
+        mask = ~valid.to_numpy(zero_copy_only=False)
+
+    hour, minute, second = hms[:, 0], hms[:, 1], hms[:, 2]
+    columns = {
+        'seconds': (hour * 3600 + minute * 60 + second, 'int32'),
+        'hour': (hour, 'int8'),
+        'minute': (minute, 'int8'),
+        'second': (second, 'int8'),
+    }
+    if mask is None:
+        return pd.DataFrame(
+            {name: data.astype(dtype) for name, (data, dtype) in columns.items()},
+            index=index
+        )
+    return pd.DataFrame(
+        {name: pd.arrays.IntegerArray(data.astype(dtype if dtype == 'int32' else 'int16'), mask)
+         for name, (data, dtype) in columns.items()},
+        index=index
+    )
+
+
+def period_of_day(hours, periods=ETL_DAY_PERIODS):
+    """
+    Classifica horas (0-23) em períodos do dia.
+
+    Args:
+        hours: Series ou array de horas
+        periods: Sequência de (hora inicial, rótulo) em ordem crescente,
+                 começando na hora 0
+
+    Returns:
+        Series categórica com os rótulos (nulo para horas inválidas)
+    """
+    index = _index_of(hours)
+    starts = np.array([start for start, _ in periods])
+    categories = list(dict.fromkeys(label for _, label in periods))
+    label_codes = np.array([categories.index(label) for _, label in periods])
+
+    hours = pd.to_numeric(pd.Series(hours).reset_index(drop=True), errors='coerce').to_numpy('float64')
+    valid = (hours >= 0) & (hours < 24)
+    positions = np.searchsorted(starts, np.where(valid, hours, 0), side='right') - 1
+    codes = np.where(valid, label_codes[positions], -1)
+
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=index)
+
+
+def detect_datetime_format(values, formats=DATETIME_FORMATS):
+    """
+    Identifica o formato de data a partir do primeiro valor não nulo.
+
+    Args:
+        values: Series de textos
+        formats: Formatos candidatos
+
+    Returns:
+        Formato encontrado ou None
+    """
+    sample = values.dropna()
+    if sample.empty:
+        return None
+    sample = str(sample.iloc[0])
+    for date_format in formats:
+        try:
+            datetime.strptime(sample, date_format)
+            return date_format
+        except ValueError:
+            continue
+    return None
+
+
+def parse_datetime(values, formats=DATETIME_FORMATS):
+    """
+    Converte textos em datetime com um único formato detectado na amostra.
+
+    Valores que não seguem o formato detectado viram NaT. Sem formato
+    reconhecido, recorre à inferência do pandas.
+
+    Args:
+        values: Series de textos ou datas
+        formats: Formatos candidatos
+
+    Returns:
+        Series datetime64
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    date_format = detect_datetime_format(values, formats)
+    if date_format is None:
+        return pd.to_datetime(values, errors='coerce')
+    return pd.to_datetime(values, format=date_format, errors='coerce')
+
+
+def extract_hour(values):
+    """
+    Extrai a hora (0-23) de uma coluna de datas, horários ou números.
+
+    Args:
+        values: Series datetime, numérica, de horários H:MM:SS ou de datas em texto
+
+    Returns:
+        Series com a hora de cada linha
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.hour
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    sample = values.dropna()
+    if not sample.empty and re.match(_TIME_OF_DAY_PATTERN, str(sample.iloc[0]).strip()):
+        return parse_time_of_day(values, errors='coerce')['hour']
+    return parse_datetime(values).dt.hour
@@ -0,0 +1,58 @@
+"""
+Importação adiada de módulos pesados.
+
+lazy_import devolve um módulo substituto que só importa o módulo real no
+primeiro acesso a um atributo. Assim, um módulo que só é usado em alguns
+caminhos (ex.: plotly.express nas funções que montam figuras) não pesa na
+importação de quem o declara.
+
+A importação real passa por importlib.import_module, cujo bloqueio por
+módulo faz as demais threads esperarem o fim da carga: o aquecimento
+(utils/warmup.py) monta páginas em paralelo com a thread do script. O
+importlib.util.LazyLoader não serve aqui, pois no Python 3.11 expõe o
+módulo ainda incompleto às outras threads durante a carga.
+
+Uso:
+    px = lazy_import('plotly.express')
+    ...
+    fig = px.bar(...)  # plotly.express é carregado aqui
+"""
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Substituto de um módulo, carregado no primeiro acesso a um atributo."""
+
+    def __getattr__(self, attr):
+        # Chamado apenas para atributos ainda ausentes no substituto
+        module = importlib.import_module(self.__name__)
+        # Os próximos acessos encontram os atributos direto no substituto
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """
+    Importa um módulo de forma adiada.
+
+    Se o módulo já foi importado, devolve o próprio módulo.
+
+    Args:
+        name: Nome completo do módulo (ex.: 'plotly.express')
+
+    Returns:
+        Módulo, carregado no primeiro acesso a um atributo
+
+    Raises:
+        ModuleNotFoundError: Se o módulo não estiver instalado
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
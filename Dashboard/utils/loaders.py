@@ -1,30 +1,38 @@
 import pandas as pd
 import streamlit as st
 import numpy as np
-import sqlite3
 from datetime import datetime, timedelta
 
-@st.cache_data
+from config.settings import STREAMING_CHUNK_SIZE
+from utils.database import get_pool
+from utils.datasets import HASH_FUNCS, frame_of
+from utils.dtypes import apply_schema, apply_frame_schemas
+from utils.engine import scan_orders
+from utils.filters import cluster_data
+from utils.ingestion import DASHBOARD_DAY_PERIODS, period_of_day
+from utils.normalization import melt_missing_items
+from utils.perf import timed
+
+@timed
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def prepare_data_for_time_analysis(df_fraud_time):
     """
     Prepara os dados de fraude por horário para análise.
     
     Args:
-        df_fraud_time: DataFrame com dados de fraude por horário
+        df_fraud_time: DataFrame (ou DatasetHandle) com dados de fraude por horário
         
     Returns:
         DataFrame processado para análise temporal
     """
+    df_fraud_time = frame_of(df_fraud_time)
     # Garantir que temos as colunas necessárias
     if 'hora' not in df_fraud_time.columns:
         return df_fraud_time
     
     # Adicionar período do dia se não existir
     if 'periodo_dia' not in df_fraud_time.columns:
-        df_fraud_time['periodo_dia'] = df_fraud_time['hora'].apply(lambda x: 
-            'Madrugada' if 0 <= x < 6 else 
-            'Manhã' if 6 <= x < 12 else 
-            'Tarde' if 12 <= x < 18 else 'Noite')
+        df_fraud_time['periodo_dia'] = period_of_day(df_fraud_time['hora'], DASHBOARD_DAY_PERIODS)
     
     # Calcular porcentagem de fraude
     if 'percentual_fraude' not in df_fraud_time.columns:
@@ -56,17 +64,19 @@ def get_id_column(df):
     
     return None
 
-@st.cache_data
+@timed
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def prepare_fraud_trend_data(df_fraud_trend):
     """
     Prepara os dados de tendência de fraude para análise.
     
     Args:
-        df_fraud_trend: DataFrame com dados de tendência de fraude
+        df_fraud_trend: DataFrame (ou DatasetHandle) com dados de tendência de fraude
         
     Returns:
         DataFrame processado para análise de tendência
     """
+    df_fraud_trend = frame_of(df_fraud_trend)
     if df_fraud_trend is None or df_fraud_trend.empty:
         return pd.DataFrame()
     
@@ -86,17 +96,19 @@ def prepare_fraud_trend_data(df_fraud_trend):
     
     return df_fraud_trend
 
-@st.cache_data
+@timed
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def prepare_region_data(df_fraud_region):
     """
     Prepara os dados de fraude por região para análise.
     
     Args:
-        df_fraud_region: DataFrame com dados de fraude por região
+        df_fraud_region: DataFrame (ou DatasetHandle) com dados de fraude por região
         
     Returns:
         DataFrame processado para análise regional
     """
+    df_fraud_region = frame_of(df_fraud_region)
     if df_fraud_region is None or df_fraud_region.empty:
         return pd.DataFrame()
 
@@ -118,18 +130,21 @@ def prepare_region_data(df_fraud_region):
     
     return df_fraud_region
 
-@st.cache_data
+@timed
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def prepare_driver_data(df_drivers, df_suspicious_drivers):
     """
     Prepara os dados de motoristas para análise.
     
     Args:
-        df_drivers: DataFrame com dados de todos os motoristas
-        df_suspicious_drivers: DataFrame com dados de motoristas suspeitos
+        df_drivers: DataFrame (ou DatasetHandle) com dados de todos os motoristas
+        df_suspicious_drivers: DataFrame (ou DatasetHandle) com dados de motoristas suspeitos
         
     Returns:
         DataFrame processado para análise de motoristas
     """
+    df_drivers = frame_of(df_drivers)
+    df_suspicious_drivers = frame_of(df_suspicious_drivers)
     if df_drivers is None or df_drivers.empty:
         return df_suspicious_drivers
     
@@ -158,17 +173,19 @@ def prepare_driver_data(df_drivers, df_suspicious_drivers):
     
     return df_drivers
 
-@st.cache_data
+@timed
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def prepare_product_data(df_missing_products):
     """
     Prepara os dados de produtos não entregues para análise.
     
     Args:
-        df_missing_products: DataFrame com dados de produtos não entregues
+        df_missing_products: DataFrame (ou DatasetHandle) com dados de produtos não entregues
         
     Returns:
         DataFrame processado para análise de produtos
     """
+    df_missing_products = frame_of(df_missing_products)
     if df_missing_products is None or df_missing_products.empty:
         return pd.DataFrame(), None
     
@@ -208,6 +225,12 @@ def prepare_product_data(df_missing_products):
     
     return df_missing_products, category_summary
 
+def _missing_item_rate(totals):
+    """Percentual de itens faltantes sobre os itens do pedido (entregues + faltantes)."""
+    total_items = totals['entregues'] + totals['itens']
+    return (totals['itens'] / total_items.where(total_items > 0) * 100).round(2)
+
+@timed
 def load_data_from_db():
     """
     Carrega os dados do banco de dados SQLite
@@ -215,156 +238,88 @@ def load_data_from_db():
     Returns:
         Dicionário contendo todos os DataFrames necessários para a aplicação
     """
+    pool = get_pool()
+    conn = None
     try:
-        # Conectar ao banco de dados no caminho específico
-        db_path = r'C:\Users\louis\datatech\Database\walmart_fraudes.db'
-        conn = sqlite3.connect(db_path)
+        # Conexão somente leitura do pool compartilhado (banco em config/settings.py)
+        conn = pool.acquire()
         
         # Definir mapeamento baseado nas tabelas reais do banco
         # Tabelas encontradas: orders, drivers, customers, missing_items, products
         
         # Carregar tabela drivers
         try:
-            df_drivers = pd.read_sql("SELECT * FROM drivers", conn)
+            df_drivers = apply_schema(pd.read_sql("SELECT * FROM drivers", conn), 'drivers')
         except Exception as e:
             df_drivers = generate_mock_data('drivers')
             st.warning("Tabela 'drivers' não encontrada. Usando dados fictícios.")
         
-        # Criar dados de fraud_time a partir da tabela orders se possível
+        # Uma única leitura de orders: totais por dia, hora, região, motorista
+        # e cliente saem da mesma passada (utils/engine.py)
         try:
-            df_orders = pd.read_sql("SELECT * FROM orders", conn)
-            
-            # Buscar coluna de hora/data usando a função auxiliar
-            hour_col = None
-            for col in ['delivery_hour', 'hour', 'created_at', 'timestamp', 'date']:
-                if col in df_orders.columns:
-                    hour_col = col
-                    break
-            
-            if hour_col:
-                # Processar para extrair hora
-                if pd.api.types.is_datetime64_any_dtype(df_orders[hour_col]):
-                    df_orders['hora'] = df_orders[hour_col].dt.hour
-                else:
-                    # Tenta converter para datetime
-                    try:
-                        # Tentar inferir o formato de data comum
-                        sample_date = df_orders[hour_col].iloc[0] if len(df_orders) > 0 else None
-                        
-                        if sample_date:
-                            if isinstance(sample_date, str):
-                                # Tentar alguns formatos comuns de data
-                                formats_to_try = [
-                                    '%Y-%m-%d %H:%M:%S',  # 2023-01-15 14:30:00
-                                    '%d/%m/%Y %H:%M',     # 15/01/2023 14:30
-                                    '%m/%d/%Y %H:%M',     # 01/15/2023 14:30
-                                    '%Y-%m-%dT%H:%M:%S',  # 2023-01-15T14:30:00
-                                    '%Y%m%d%H%M%S'        # 20230115143000
-                                ]
-                                
-                                for date_format in formats_to_try:
-                                    try:
-                                        df_orders['hora'] = pd.to_datetime(df_orders[hour_col], format=date_format).dt.hour
-                                        break
-                                    except:
-                                        continue
-                                else:
-                                    # Se nenhum formato funcionar, usar o método padrão que gera o aviso
-                                    df_orders['hora'] = pd.to_datetime(df_orders[hour_col], errors='coerce').dt.hour
-                            else:
-                                # Se não for string, tentar converter normalmente
-                                df_orders['hora'] = pd.to_datetime(df_orders[hour_col]).dt.hour
-                        else:
-                            # Gerar horas aleatórias se não houver dados
-                            df_orders['hora'] = np.random.randint(0, 24, len(df_orders))
-                    except Exception as e:
-                        # Em caso de erro, gerar horas aleatórias
-                        st.warning(f"Erro ao extrair hora: {e}. Usando valores aleatórios.")
-                        df_orders['hora'] = np.random.randint(0, 24, len(df_orders))
-                
-                # Usar a função auxiliar para buscar coluna de ID
-                id_col = get_id_column(df_orders)
-                
-                if id_col:
-                    # Agrupar por hora para criar dados de fraude por horário
-                    df_fraud_time = df_orders.groupby('hora').agg({
-                        id_col: 'count',  # Usar a coluna de ID encontrada
-                    }).reset_index()
-                    
-                    df_fraud_time.columns = ['hora', 'total_pedidos']
-                    df_fraud_time['periodo_dia'] = df_fraud_time['hora'].apply(lambda x: 
-                        'Madrugada' if 0 <= x < 6 else 
-                        'Manhã' if 6 <= x < 12 else 
-                        'Tarde' if 12 <= x < 18 else 'Noite')
-                    
-                    # Gerar pedidos com fraude (simulados)
-                    df_fraud_time['pedidos_com_fraude'] = np.random.randint(1, 20, len(df_fraud_time))
-                    df_fraud_time['percentual_fraude'] = (df_fraud_time['pedidos_com_fraude'] / df_fraud_time['total_pedidos'] * 100).round(2)
-                else:
-                    st.warning("Nenhuma coluna de ID encontrada na tabela orders.")
-                    df_fraud_time = generate_mock_data('fraud_time')
+            scan = scan_orders(conn, STREAMING_CHUNK_SIZE)
+        except Exception as e:
+            st.warning(f"Erro ao ler a tabela orders: {e}. Usando dados fictícios.")
+            scan = None
+        
+        # Fraudes por horário
+        try:
+            if scan is not None and scan.rows_read > 0:
+                hourly = scan.totals('hour')
+                df_fraud_time = pd.DataFrame({
+                    'hora': hourly.index.astype('int64'),
+                    'total_pedidos': hourly['pedidos'].values
+                })
+                df_fraud_time['periodo_dia'] = period_of_day(df_fraud_time['hora'], DASHBOARD_DAY_PERIODS)
+                df_fraud_time['pedidos_com_fraude'] = hourly['pedidos_com_falta'].values
+                df_fraud_time['percentual_fraude'] = (df_fraud_time['pedidos_com_fraude'] / df_fraud_time['total_pedidos'] * 100).round(2)
             else:
                 df_fraud_time = generate_mock_data('fraud_time')
         except Exception as e:
             st.warning(f"Erro ao processar dados de horário: {e}")
             df_fraud_time = generate_mock_data('fraud_time')
         
-        # Gerar dados de região baseados na localização dos clientes, se disponível
+        # Fraudes por região do pedido
         try:
-            df_customers = pd.read_sql("SELECT * FROM customers", conn)
-            region_col = None
-            
-            for col in ['region', 'state', 'location', 'city', 'address']:
-                if col in df_customers.columns:
-                    region_col = col
-                    break
-                    
-            if region_col:
-                # Usar a função auxiliar para buscar coluna de ID
-                id_col = get_id_column(df_customers)
-                
-                if id_col:
-                    df_fraud_region = df_customers.groupby(region_col).agg({
-                        id_col: 'count'  # Usar a coluna de ID encontrada
-                    }).reset_index()
-                    
-                    df_fraud_region.columns = ['region', 'total_pedidos']
-                    df_fraud_region['total_itens_faltantes'] = np.random.randint(5, 50, len(df_fraud_region))
-                    df_fraud_region['media_itens_faltantes'] = (df_fraud_region['total_itens_faltantes'] / df_fraud_region['total_pedidos']).round(2)
-                    df_fraud_region['percentual_fraude'] = (df_fraud_region['total_itens_faltantes'] / (df_fraud_region['total_pedidos'] * 5) * 100).round(2)
-                else:
-                    st.warning("Nenhuma coluna de ID encontrada na tabela customers.")
-                    df_fraud_region = generate_mock_data('fraud_region')
+            if scan is not None and scan.rows_read > 0:
+                regional = scan.totals('region')
+                df_fraud_region = pd.DataFrame({
+                    'region': regional.index,
+                    'total_pedidos': regional['pedidos'].values,
+                    'total_itens_faltantes': regional['itens'].values,
+                    'media_itens_faltantes': regional['media_itens'].values,
+                    'percentual_fraude': _missing_item_rate(regional).values
+                })
             else:
                 df_fraud_region = generate_mock_data('fraud_region')
         except Exception as e:
             st.warning(f"Erro ao processar dados de região: {e}")
             df_fraud_region = generate_mock_data('fraud_region')
         
-        # Motoristas suspeitos (usando os 20% piores motoristas)
+        # Motoristas suspeitos (os 20% com maior percentual de itens faltantes)
         try:
-            if len(df_drivers) > 0:
-                suspicious_count = max(1, int(len(df_drivers) * 0.2))  # 20% ou pelo menos 1
+            driver_id_col = get_id_column(df_drivers)
+            if scan is not None and scan.rows_read > 0 and driver_id_col:
+                per_driver = scan.totals('driver_id')
+                driver_stats = pd.DataFrame({
+                    'driver_id': per_driver.index,
+                    'total_entregas': per_driver['pedidos'].values,
+                    'itens_faltantes': per_driver['itens'].values,
+                    'media_itens_faltantes': per_driver['media_itens'].values,
+                    'percentual_fraude': _missing_item_rate(per_driver).values
+                })
+                suspicious_count = max(1, int(len(driver_stats) * 0.2))  # 20% ou pelo menos 1
+                driver_stats = driver_stats.sort_values(
+                    ['percentual_fraude', 'driver_id'], ascending=[False, True]
+                ).head(suspicious_count)
                 
-                # Verificar se há alguma medida de desempenho
-                performance_cols = [col for col in df_drivers.columns if any(term in col.lower() for term in 
-                                   ['rating', 'score', 'performance', 'avaliacao', 'fraude', 'fraud', 'missing'])]
-                
-                if performance_cols:
-                    # Ordenar pelos piores (considerando que valores mais altos são piores para 'missing' e 'fraude')
-                    sort_ascending = any(term in performance_cols[0].lower() for term in ['missing', 'fraude', 'fraud'])
-                    df_suspicious_drivers = df_drivers.sort_values(performance_cols[0], ascending=not sort_ascending).head(suspicious_count).copy()
-                else:
-                    # Se não houver medida de desempenho, gere valores aleatórios
-                    df_drivers['desempenho_aleatorio'] = np.random.uniform(1, 10, len(df_drivers))
-                    df_suspicious_drivers = df_drivers.sort_values('desempenho_aleatorio', ascending=False).head(suspicious_count).copy()
-                    df_suspicious_drivers.drop('desempenho_aleatorio', axis=1, inplace=True)
-                
-                # Adicionar colunas de fraude simuladas
-                df_suspicious_drivers['total_entregas'] = np.random.randint(10, 500, len(df_suspicious_drivers))
-                df_suspicious_drivers['itens_faltantes'] = np.random.randint(10, 100, len(df_suspicious_drivers))
-                df_suspicious_drivers['media_itens_faltantes'] = (df_suspicious_drivers['itens_faltantes'] / df_suspicious_drivers['total_entregas']).round(2)
-                df_suspicious_drivers['percentual_fraude'] = (df_suspicious_drivers['itens_faltantes'] / (df_suspicious_drivers['total_entregas'] * 5) * 100).round(2)
+                # Cadastro do motorista + métricas reais dos pedidos
+                df_suspicious_drivers = df_drivers.drop(
+                    columns=[col for col in driver_stats.columns if col in df_drivers.columns and col != driver_id_col]
+                ).merge(driver_stats, left_on=driver_id_col, right_on='driver_id', how='inner')
+                df_suspicious_drivers = df_suspicious_drivers.sort_values(
+                    ['percentual_fraude', 'driver_id'], ascending=[False, True]
+                ).reset_index(drop=True)
             else:
                 df_suspicious_drivers = generate_mock_data('suspicious_drivers')
         except Exception as e:
@@ -373,19 +328,15 @@ def load_data_from_db():
         
         # Produtos não entregues
         try:
-            df_products = pd.read_sql("SELECT * FROM products", conn)
-            df_missing = pd.read_sql("SELECT * FROM missing_items", conn)
+            df_products = apply_schema(pd.read_sql("SELECT * FROM products", conn), 'products')
+            df_missing = apply_schema(pd.read_sql("SELECT * FROM missing_items", conn), 'missing_items')
             
-            # Verificar se há informações sobre o produto e sua categoria
-            product_id_col = None
-            for col in df_missing.columns:
-                if 'product' in col.lower() and 'id' in col.lower():
-                    product_id_col = col
-                    break
+            # Formato longo: uma linha por produto faltante, em qualquer posição
+            df_missing_long = melt_missing_items(df_missing)
             
-            if product_id_col and product_id_col in df_missing.columns:
+            if not df_missing_long.empty:
                 # Contar ocorrências de cada produto
-                product_counts = df_missing[product_id_col].value_counts().reset_index()
+                product_counts = df_missing_long['product_id'].value_counts().reset_index()
                 product_counts.columns = ['product_id', 'total_relatos']
                 
                 # Buscar coluna de ID nos produtos
@@ -442,102 +393,55 @@ def load_data_from_db():
             st.warning(f"Erro ao processar dados de produtos: {e}")
             df_missing_products = generate_mock_data('missing_products')
         
-        # Tendência de fraudes (baseado em orders se disponível)
+        # Tendência de fraudes por dia (as datas chegam truncadas pelo SQLite:
+        # só os dias distintos são convertidos)
         try:
-            if 'df_orders' in locals():
-                # Verificar se há data
-                date_col = None
-                for col in df_orders.columns:
-                    if any(term in col.lower() for term in ['date', 'data', 'created_at', 'created', 'datetime']):
-                        date_col = col
-                        break
-                
-                if date_col and date_col in df_orders.columns:
-                    # Converter para datetime
-                    df_orders[date_col] = pd.to_datetime(df_orders[date_col], errors='coerce')
-                    
-                    # Agrupar por data
-                    df_orders['date'] = df_orders[date_col].dt.date
-                    
-                    # Usar a função auxiliar para buscar coluna de ID
-                    id_col = get_id_column(df_orders)
-                    
-                    if id_col:
-                        df_fraud_trend = df_orders.groupby('date').agg({
-                            id_col: 'count'  # Usar a coluna de ID encontrada
-                        }).reset_index()
-                        
-                        df_fraud_trend.columns = ['date', 'total_pedidos']
-                        
-                        # Gerar itens faltantes (simulados)
-                        df_fraud_trend['date'] = pd.to_datetime(df_fraud_trend['date'])
-                        df_fraud_trend['itens_faltantes'] = np.random.randint(1, 50, len(df_fraud_trend))
-                        df_fraud_trend['percentual_fraude'] = (df_fraud_trend['itens_faltantes'] / (df_fraud_trend['total_pedidos'] * 5) * 100).round(2)
-                    else:
-                        st.warning("Nenhuma coluna de ID encontrada para análise de tendência.")
-                        df_fraud_trend = generate_mock_data('fraud_trend')
-                else:
-                    df_fraud_trend = generate_mock_data('fraud_trend')
+            if scan is not None and scan.rows_read > 0:
+                daily = scan.totals('day')
+                df_fraud_trend = pd.DataFrame({
+                    'date': pd.to_datetime(daily.index),
+                    'total_pedidos': daily['pedidos'].values,
+                    'itens_faltantes': daily['itens'].values,
+                    'percentual_fraude': _missing_item_rate(daily).values
+                })
             else:
                 df_fraud_trend = generate_mock_data('fraud_trend')
         except Exception as e:
             st.warning(f"Erro ao processar dados de tendência: {e}")
             df_fraud_trend = generate_mock_data('fraud_trend')
         
-        # Clientes suspeitos
+        # Clientes suspeitos (os 50 com mais itens faltantes)
         try:
-            if 'df_customers' in locals() and len(df_customers) > 0:
-                # Selecionar 50 clientes aleatórios para simular suspeitos
-                suspicious_count = min(50, len(df_customers))
-                df_suspicious_customers = df_customers.sample(suspicious_count).copy()
-                
-                # Buscar coluna de ID
-                id_col = get_id_column(df_suspicious_customers)
-                
-                # Adicionar colunas simuladas de fraude
-                if id_col:
-                    df_suspicious_customers['customer_id'] = df_suspicious_customers[id_col]
-                else:
-                    df_suspicious_customers['customer_id'] = [f"C{i:03d}" for i in range(1, suspicious_count+1)]
-                
-                # Buscar coluna de nome
-                name_col = None
-                for col in df_suspicious_customers.columns:
-                    if any(term in col.lower() for term in ['name', 'nome']):
-                        name_col = col
-                        break
-                
-                if name_col:
-                    df_suspicious_customers['customer_name'] = df_suspicious_customers[name_col]
-                else:
-                    df_suspicious_customers['customer_name'] = [f"Cliente {i}" for i in range(1, suspicious_count+1)]
-                
-                # Buscar coluna de idade
-                age_col = None
-                for col in df_suspicious_customers.columns:
-                    if any(term in col.lower() for term in ['age', 'idade']):
-                        age_col = col
-                        break
+            df_customers = apply_schema(pd.read_sql("SELECT * FROM customers", conn), 'customers')
+            customer_id_col = get_id_column(df_customers)
+            if scan is not None and scan.rows_read > 0 and customer_id_col:
+                per_customer = scan.totals('customer_id')
+                customer_stats = pd.DataFrame({
+                    'customer_id': per_customer.index,
+                    'total_pedidos': per_customer['pedidos'].values,
+                    'itens_faltantes': per_customer['itens'].values,
+                    'media_itens_faltantes': per_customer['media_itens'].values,
+                    'percentual_fraude': _missing_item_rate(per_customer).values
+                })
+                customer_stats = customer_stats.sort_values(
+                    ['itens_faltantes', 'percentual_fraude', 'customer_id'], ascending=[False, False, True]
+                ).head(50)
                 
-                if age_col:
-                    df_suspicious_customers['customer_age'] = df_suspicious_customers[age_col]
-                else:
-                    df_suspicious_customers['customer_age'] = np.random.randint(18, 70, suspicious_count)
-                
-                df_suspicious_customers['total_pedidos'] = np.random.randint(5, 50, suspicious_count)
-                df_suspicious_customers['itens_faltantes'] = np.random.randint(2, 30, suspicious_count)
-                df_suspicious_customers['media_itens_faltantes'] = (df_suspicious_customers['itens_faltantes'] / df_suspicious_customers['total_pedidos']).round(2)
-                df_suspicious_customers['percentual_fraude'] = (df_suspicious_customers['itens_faltantes'] / (df_suspicious_customers['total_pedidos'] * 5) * 100).round(2)
+                # Cadastro do cliente (nome e idade) + métricas reais dos pedidos
+                customer_columns = [customer_id_col] + [
+                    col for col in df_customers.columns
+                    if col != customer_id_col and any(term in col.lower() for term in ['name', 'nome', 'age', 'idade'])
+                ]
+                df_suspicious_customers = customer_stats.merge(
+                    df_customers[customer_columns], left_on='customer_id', right_on=customer_id_col, how='left'
+                ).reset_index(drop=True)
             else:
                 df_suspicious_customers = generate_mock_data('suspicious_customers')
         except Exception as e:
             st.warning(f"Erro ao processar dados de clientes suspeitos: {e}")
             df_suspicious_customers = generate_mock_data('suspicious_customers')
         
-        # Fechar conexão
-        conn.close()
-        
-        return {
+        return apply_frame_schemas({
             'drivers': df_drivers,
             'fraud_time': df_fraud_time, 
             'fraud_region': df_fraud_region,
@@ -545,13 +449,18 @@ def load_data_from_db():
             'missing_products': df_missing_products,
             'fraud_trend': df_fraud_trend,
             'suspicious_customers': df_suspicious_customers
-        }
+        })
         
     except Exception as e:
         st.warning(f"Erro ao acessar o banco de dados: {e}. Carregando dados fictícios...")
         
         # Se houver qualquer erro, gerar todos os dados fictícios
         return generate_mock_data_all()
+    
+    finally:
+        # Devolver a conexão ao pool
+        if conn is not None:
+            pool.release(conn)
 
 def generate_mock_data(data_type):
     """
@@ -684,19 +593,20 @@ def generate_mock_data_all():
         'suspicious_customers': generate_mock_data('suspicious_customers')
     }
 
-@st.cache_data
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def apply_date_filter(df, date_range=None, date_column='date'):
     """
     Filtra DataFrame por intervalo de datas.
     
     Args:
-        df: DataFrame a ser filtrado
+        df: DataFrame (ou DatasetHandle) a ser filtrado
         date_range: Tupla (data_inicio, data_fim) para filtro
         date_column: Nome da coluna de data no DataFrame
         
     Returns:
         DataFrame filtrado
     """
+    df = frame_of(df)
     if df is None or df.empty or date_range is None or date_column not in df.columns:
         return df
     
@@ -710,57 +620,61 @@ def apply_date_filter(df, date_range=None, date_column='date'):
     
     return filtered_df
 
-@st.cache_data
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def apply_category_filter(df, category=None, category_column='category'):
     """
     Filtra DataFrame por categoria.
     
     Args:
-        df: DataFrame a ser filtrado
+        df: DataFrame (ou DatasetHandle) a ser filtrado
         category: Categoria para filtro
         category_column: Nome da coluna de categoria no DataFrame
         
     Returns:
         DataFrame filtrado
     """
+    df = frame_of(df)
     if df is None or df.empty or category is None or category == "Todas" or category_column not in df.columns:
         return df
     
     # Aplicar filtro de categoria
     return df[df[category_column] == category]
 
-@st.cache_data
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def apply_region_filter(df, region=None, region_column='region'):
     """
     Filtra DataFrame por região.
     
     Args:
-        df: DataFrame a ser filtrado
+        df: DataFrame (ou DatasetHandle) a ser filtrado
         region: Região para filtro
         region_column: Nome da coluna de região no DataFrame
         
     Returns:
         DataFrame filtrado
     """
+    df = frame_of(df)
     if df is None or df.empty or region is None or region == "Todas" or region_column not in df.columns:
         return df
     
     # Aplicar filtro de região
     return df[df[region_column] == region]
 
-@st.cache_data
+@timed
+@st.cache_data(hash_funcs=HASH_FUNCS)
 def detect_anomalies(df, column, threshold=1.5):
     """
     Detecta anomalias em uma coluna usando o método do IQR (Intervalo Interquartil).
     
     Args:
-        df: DataFrame com os dados
+        df: DataFrame (ou DatasetHandle) com os dados
         column: Nome da coluna para detectar anomalias
         threshold: Multiplicador do IQR para determinar limites (padrão: 1.5)
         
     Returns:
         DataFrame com coluna adicional indicando anomalias
     """
+    df = frame_of(df)
     if df is None or df.empty or column not in df.columns:
         return df
     
@@ -777,4 +691,19 @@ def detect_anomalies(df, column, threshold=1.5):
     df = df.copy()
     df['anomalia'] = ((df[column] < lower_bound) | (df[column] > upper_bound))
     
-    return df
\ No newline at end of file
+    return df
+@timed
+@st.cache_data(hash_funcs=HASH_FUNCS, max_entries=32, show_spinner="Calculando clusters...")
+def cluster_dataset(df, columns, n_clusters=3):
+    """
+    Aplica a clusterização (K-Means) com o resultado em cache.
+    
+    Args:
+        df: DataFrame (ou DatasetHandle) com os dados
+        columns: Tupla de colunas usadas na clusterização
+        n_clusters: Número de clusters a serem criados
+        
+    Returns:
+        DataFrame com a coluna 'cluster' adicionada
+    """
+    return cluster_data(frame_of(df), list(columns), n_clusters=n_clusters)
\ No newline at end of file
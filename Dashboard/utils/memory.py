@@ -0,0 +1,263 @@
+"""
+Contabilidade de memória do dashboard: DataFrames, caches e sessões.
+
+Reúne, para o painel de administração (pages/admin.py):
+- bytes de cada DataFrame carregado (memory_usage(deep=True));
+- bytes guardados por função em st.cache_data (valores serializados) e
+  pelo cache de figuras de utils/figure_cache.py;
+- tamanho do st.session_state de cada sessão ativa;
+- memória residente do processo (atual e pico).
+
+Para procurar vazamentos, o MemoryTracker compara snapshots do
+tracemalloc a cada MEMORY_SNAPSHOT_SECONDS e grava as linhas de código que
+mais cresceram na saída do servidor. O tracemalloc deixa as alocações mais
+lentas, por isso o rastreamento fica desligado por padrão
+(MEMORY_TRACKING) e pode ser ligado pelo painel.
+
+As estatísticas de cache e de sessão usam os provedores internos de
+estatísticas do Streamlit; se a API mudar, as tabelas ficam vazias.
+"""
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import MEMORY_SNAPSHOT_SECONDS, MEMORY_TRACE_FRAMES, MEMORY_TRACKING
+from utils.dtypes import frame_memory
+
+# Comparações de snapshots mantidas para o painel
+DIFF_HISTORY = 20
+# Linhas de código listadas em cada comparação
+DIFF_TOP = 15
+
+# Alocações do próprio rastreamento e da importação de módulos não entram na comparação
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+]
+
+
+def process_memory():
+    """
+    Memória residente do processo.
+
+    Returns:
+        Dicionário com rss_bytes e pico_bytes (None fora do Linux)
+    """
+    values = {'rss_bytes': None, 'pico_bytes': None}
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    values['rss_bytes'] = int(line.split()[1]) * 1024
+                elif line.startswith('VmHWM:'):
+                    values['pico_bytes'] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+def frame_sizes(data):
+    """
+    Bytes de cada DataFrame do dicionário de dados.
+
+    Args:
+        data: Dicionário nome -> DataFrame
+
+    Returns:
+        DataFrame com frame, linhas, colunas e bytes, do maior para o menor
+    """
+    rows = [
+        (name, len(df), len(df.columns), frame_memory(df))
+        for name, df in (data or {}).items()
+        if isinstance(df, pd.DataFrame)
+    ]
+    report = pd.DataFrame(rows, columns=['frame', 'linhas', 'colunas', 'bytes']).astype(
+        {'linhas': 'int64', 'colunas': 'int64', 'bytes': 'int64'}
+    )
+    return report.sort_values('bytes', ascending=False, ignore_index=True)
+
+
+def cache_data_sizes():
+    """
+    Bytes guardados por função em st.cache_data e no cache de figuras.
+
+    Returns:
+        DataFrame com cache, entradas e bytes, do maior para o menor
+    """
+    rows = []
+    try:
+        from streamlit.runtime.caching import get_data_cache_stats_provider
+        stats = get_data_cache_stats_provider().get_stats()
+    except (ImportError, AttributeError):
+        stats = []
+    for stat in stats:
+        rows.append((stat.cache_name, stat.byte_length))
+    report = pd.DataFrame(rows, columns=['cache', 'bytes']).astype({'bytes': 'int64'})
+    report = report.groupby('cache', as_index=False).agg(entradas=('bytes', 'size'), bytes=('bytes', 'sum'))
+
+    # Importado aqui: utils.figure_cache carrega o plotly.io
+    from utils.figure_cache import get_figure_cache
+    figures = get_figure_cache().stats()
+    report.loc[len(report)] = ['figuras (utils/figure_cache.py)', figures['figuras'], figures['bytes']]
+    return report.sort_values('bytes', ascending=False, ignore_index=True)
+
+
+def session_state_sizes():
+    """
+    Tamanho do st.session_state de cada sessão ativa.
+
+    Returns:
+        DataFrame com sessão, chaves e bytes, do maior para o menor
+    """
+    rows = []
+    try:
+        from streamlit.runtime import Runtime
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        current = get_script_run_ctx()
+        current_id = current.session_id if current else None
+        sessions = Runtime.instance()._session_mgr.list_active_sessions() if Runtime.exists() else []
+    except (ImportError, AttributeError, RuntimeError):
+        sessions, current_id = [], None
+    for info in sessions:
+        session = info.session
+        state = session.session_state
+        label = session.id + (" (esta sessão)" if session.id == current_id else "")
+        rows.append((label, len(list(state.filtered_state)), sum(stat.byte_length for stat in state.get_stats())))
+    report = pd.DataFrame(rows, columns=['sessao', 'chaves', 'bytes']).astype({'chaves': 'int64', 'bytes': 'int64'})
+    return report.sort_values('bytes', ascending=False, ignore_index=True)
+
+
+class MemoryTracker:
+    """Comparação periódica de snapshots do tracemalloc."""
+
+    def __init__(self, interval=MEMORY_SNAPSHOT_SECONDS, frames=MEMORY_TRACE_FRAMES):
+        """
+        Args:
+            interval: Segundos entre comparações automáticas
+            frames: Quadros de pilha guardados por alocação
+        """
+        self.interval = interval
+        self.frames = frames
+        self.history = deque(maxlen=DIFF_HISTORY)
+        self._previous = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        """Indica se o tracemalloc está ativo."""
+        return tracemalloc.is_tracing()
+
+    def start(self, periodic=True):
+        """
+        Inicia o tracemalloc e, se pedido, as comparações periódicas.
+
+        Args:
+            periodic: Se True, compara snapshots a cada self.interval segundos
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+            self._previous = self._snapshot()
+            if periodic and (self._thread is None or not self._thread.is_alive()):
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="dashboard-memory", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Encerra as comparações e o tracemalloc."""
+        self._stop.set()
+        with self._lock:
+            self._previous = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def _snapshot(self):
+        """Snapshot atual, sem as alocações do rastreamento e das importações."""
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def compare(self, top=DIFF_TOP):
+        """
+        Compara um novo snapshot com o anterior e guarda o resultado.
+
+        Args:
+            top: Linhas de código listadas
+
+        Returns:
+            Dicionário com momento, memória rastreada e DataFrame das linhas
+            que mais cresceram (ou None se o tracemalloc estiver parado)
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing() or self._previous is None:
+                return None
+            current = self._snapshot()
+            stats = current.compare_to(self._previous, 'lineno')
+            self._previous = current
+            traced, peak = tracemalloc.get_traced_memory()
+
+        rows = [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             stat.size_diff, stat.count_diff, stat.size, stat.count)
+            for stat in stats[:top]
+        ]
+        diff = {
+            'momento': time.time(),
+            'rastreado_bytes': traced,
+            'pico_rastreado_bytes': peak,
+            'linhas': pd.DataFrame(rows, columns=['local', 'bytes_diff', 'blocos_diff', 'bytes', 'blocos']),
+        }
+        self.history.append(diff)
+        return diff
+
+    def _loop(self):
+        """Compara snapshots periodicamente e grava o resultado na saída do servidor."""
+        while not self._stop.wait(self.interval):
+            diff = self.compare()
+            if diff is not None:
+                print(format_diff(diff), flush=True)
+
+
+def format_diff(diff):
+    """
+    Formata uma comparação de snapshots para a saída do servidor.
+
+    Args:
+        diff: Resultado de MemoryTracker.compare
+
+    Returns:
+        Texto com uma linha por local de alocação
+    """
+    rss = process_memory()['rss_bytes']
+    lines = [
+        f"Memória {time.strftime('%H:%M:%S', time.localtime(diff['momento']))}: "
+        f"rastreada {diff['rastreado_bytes'] / 2**20:.1f} MB"
+        + (f", RSS {rss / 2**20:.0f} MB" if rss else "")
+    ]
+    for row in diff['linhas'].itertuples(index=False):
+        lines.append(f"  {row.bytes_diff / 1024:+10.1f} KB {row.blocos_diff:+7d} blocos  {row.local}")
+    return "\n".join(lines)
+
+
+# Instância única do processo, compartilhada pelas sessões e pelo painel
+tracker = MemoryTracker()
+
+
+@st.cache_resource(show_spinner=False)
+def start_memory_tracking():
+    """
+    Inicia o rastreamento periódico (uma vez por processo), se ativado.
+
+    Returns:
+        MemoryTracker do processo, ou None se desativado em MEMORY_TRACKING
+    """
+    if not MEMORY_TRACKING:
+        return None
+    tracker.start()
+    return tracker
@@ -0,0 +1,178 @@
+"""
+Tabela longa order_missing_product(order_id, product_id, position).
+
+missing_items guarda até três produtos por pedido em colunas
+(product_id_1..3). A forma longa tem uma linha por produto faltante,
+aceita qualquer quantidade de produtos por pedido e transforma contagens
+por produto, categoria ou motorista x produto em um único GROUP BY.
+
+A tabela é derivada de missing_items com melt (vetorizado, em blocos) e
+mantida em dia por uma marca d'água de rowid em summary_state. Enquanto
+ela não existir ou estiver desatualizada, as consultas usam um UNION ALL
+equivalente sobre as colunas de missing_items.
+"""
+import re
+
+import pandas as pd
+
+from utils.schema import get_state, max_rowid, migrate, set_state, table_exists
+
+LONG_TABLE = 'order_missing_product'
+SOURCE_TABLE = 'missing_items'
+
+# Maior rowid de missing_items já copiado para a tabela longa
+SYNC_MARK = 'order_missing_product_source_mark'
+
+_WIDE_COLUMN = re.compile(r'^product_id_(\d+)$')
+
+
+def wide_product_columns(columns):
+    """
+    Identifica as colunas product_id_N de missing_items.
+
+    Args:
+        columns: Nomes das colunas
+
+    Returns:
+        Lista de (coluna, posição) em ordem de posição
+    """
+    found = []
+    for col in columns:
+        match = _WIDE_COLUMN.match(col)
+        if match:
+            found.append((col, int(match.group(1))))
+    return sorted(found, key=lambda item: item[1])
+
+
+def melt_missing_items(df):
+    """
+    Converte missing_items do formato largo para o formato longo.
+
+    Args:
+        df: DataFrame com order_id e colunas product_id_1..N
+
+    Returns:
+        DataFrame com order_id, product_id e position, uma linha por produto
+        informado, na ordem dos pedidos e das posições
+    """
+    columns = wide_product_columns(df.columns)
+    if df.empty or not columns:
+        return pd.DataFrame({
+            'order_id': pd.Series(dtype='object'),
+            'product_id': pd.Series(dtype='object'),
+            'position': pd.Series(dtype='int8'),
+        })
+
+    long = df.melt(
+        id_vars='order_id',
+        value_vars=[col for col, _ in columns],
+        var_name='position',
+        value_name='product_id',
+        ignore_index=False
+    )
+    long = long[long['order_id'].notna() & long['product_id'].notna() & (long['product_id'] != '')]
+    long['position'] = long['position'].map(dict(columns)).astype('int8')
+    # ignore_index=False mantém a linha de origem: a ordenação estável
+    # agrupa os produtos de cada pedido na ordem das colunas
+    long = long.sort_index(kind='stable')
+    return long[['order_id', 'product_id', 'position']].reset_index(drop=True)
+
+
+def _wide_union_sql(conn):
+    """Monta o UNION ALL equivalente à tabela longa a partir de missing_items."""
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({SOURCE_TABLE})")]
+    parts = [
+        f"SELECT order_id, {col} AS product_id, {position} AS position "
+        f"FROM {SOURCE_TABLE} WHERE {col} IS NOT NULL AND {col} != ''"
+        for col, position in wide_product_columns(columns)
+    ]
+    if not parts:
+        return "(SELECT NULL AS order_id, NULL AS product_id, NULL AS position WHERE 0)"
+    return "(" + " UNION ALL ".join(parts) + ")"
+
+
+def long_table_is_current(conn):
+    """
+    Verifica se order_missing_product reflete todas as linhas de missing_items.
+
+    Args:
+        conn: Conexão com o banco SQLite
+
+    Returns:
+        True se a tabela longa pode ser usada nas consultas
+    """
+    if not table_exists(conn, LONG_TABLE):
+        return False
+    if not table_exists(conn, SOURCE_TABLE):
+        # Carga que grava apenas a tabela longa
+        return True
+    mark = get_state(conn, SYNC_MARK)
+    return mark is not None and int(mark) == max_rowid(conn, SOURCE_TABLE)
+
+
+def missing_products_relation(conn):
+    """
+    Retorna a relação SQL (order_id, product_id, position) a usar nas consultas.
+
+    Args:
+        conn: Conexão com o banco SQLite
+
+    Returns:
+        Nome da tabela longa, se atualizada, ou subconsulta sobre missing_items
+    """
+    if long_table_is_current(conn):
+        return LONG_TABLE
+    return _wide_union_sql(conn)
+
+
+def _insert_long_rows(conn, long):
+    """Insere linhas no formato longo usando tipos nativos do Python."""
+    conn.executemany(
+        f"INSERT INTO {LONG_TABLE} (order_id, product_id, position) VALUES (?, ?, ?)",
+        zip(long['order_id'].tolist(), long['product_id'].tolist(), long['position'].tolist())
+    )
+
+
+def sync_order_missing_product(conn, full=False, chunk_size=100_000):
+    """
+    Copia para order_missing_product as linhas novas de missing_items.
+
+    Lê apenas as linhas com rowid acima da marca d'água, em blocos, e as
+    converte com melt_missing_items. Se missing_items foi recriada (rowid
+    máximo menor que a marca) a tabela longa é reconstruída.
+
+    Args:
+        conn: Conexão com o banco SQLite (com permissão de escrita)
+        full: Se True, reconstrói a tabela longa inteira
+        chunk_size: Quantidade de linhas de missing_items por bloco
+
+    Returns:
+        True se a tabela foi reconstruída por completo, False se foi
+        apenas complementada (ou já estava em dia)
+    """
+    migrate(conn)
+    if not table_exists(conn, SOURCE_TABLE):
+        return False
+
+    source_mark = max_rowid(conn, SOURCE_TABLE)
+    mark = get_state(conn, SYNC_MARK)
+    if mark is None or int(mark) > source_mark:
+        full = True
+    start = 0 if full else int(mark)
+    if not full and start == source_mark:
+        return False
+
+    with conn:
+        if full:
+            conn.execute(f"DELETE FROM {LONG_TABLE}")
+        chunks = pd.read_sql_query(
+            f"SELECT * FROM {SOURCE_TABLE} WHERE rowid > :inicio AND rowid <= :fim ORDER BY rowid",
+            conn,
+            params={'inicio': start, 'fim': source_mark},
+            chunksize=chunk_size
+        )
+        for chunk in chunks:
+            _insert_long_rows(conn, melt_missing_items(chunk))
+        set_state(conn, SYNC_MARK, source_mark)
+
+    return full
@@ -0,0 +1,268 @@
+"""
+Medição do tempo de execução das páginas, cargas, consultas e gráficos.
+
+Funções decoradas com @timed (e blocos com span()) registram intervalos
+aninhados: cada reexecução do script (app.main) forma uma execução com a
+árvore dos intervalos medidos dentro dela, guardada em um buffer circular
+com as últimas PERF_MAX_RUNS execuções. Intervalos medidos fora de uma
+execução (aquecimento, atualização em segundo plano) formam execuções
+próprias. O painel de administração (pages/admin.py) mostra p50/p95 por
+intervalo e exporta as execuções em JSON lines; com PERF_EXPORT_PATH
+definido, cada execução também é acrescentada ao arquivo.
+
+Com a medição desativada (padrão, ver PERF_ENABLED), cada chamada decorada
+custa apenas a leitura de um atributo booleano.
+
+Uso:
+    @timed
+    def create_bar_chart(...): ...
+
+    with span("app.main"):
+        ...
+"""
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from config.settings import PERF_ENABLED, PERF_EXPORT_PATH, PERF_MAX_RUNS
+
+
+class _Span:
+    """Intervalo em medição; registrado no PerfRecorder ao sair do bloco."""
+
+    __slots__ = ('recorder', 'name', 'record', 'start')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.record = self.recorder._open(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        self.recorder._close(self.record, elapsed, exc_type)
+        return False
+
+
+class _NoSpan:
+    """Bloco vazio usado quando a medição está desativada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class PerfRecorder:
+    """Buffer circular das execuções medidas, com a pilha de intervalos por thread."""
+
+    def __init__(self, enabled=PERF_ENABLED, max_runs=PERF_MAX_RUNS, export_path=PERF_EXPORT_PATH):
+        """
+        Args:
+            enabled: Se a medição começa ativada
+            max_runs: Execuções mantidas no buffer
+            export_path: Arquivo JSON lines que recebe cada execução (opcional)
+        """
+        self.enabled = enabled
+        self.export_path = export_path
+        self._runs = deque(maxlen=max_runs)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        """
+        Bloco medido.
+
+        Args:
+            name: Nome do intervalo
+
+        Returns:
+            Gerenciador de contexto (vazio com a medição desativada)
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name)
+
+    def _open(self, name):
+        """Empilha um intervalo; o primeiro da pilha inicia uma execução."""
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            stack = self._local.stack = []
+            self._local.spans = []
+            self._local.started_at = time.time()
+            self._local.origin = time.perf_counter()
+        record = {
+            'nome': name,
+            'nivel': len(stack),
+            'pai': stack[-1]['id'] if stack else None,
+            'id': len(self._local.spans),
+            'inicio_ms': round((time.perf_counter() - self._local.origin) * 1000, 3),
+        }
+        self._local.spans.append(record)
+        stack.append(record)
+        return record
+
+    def _close(self, record, elapsed, exc_type):
+        """Desempilha o intervalo; ao esvaziar a pilha, guarda a execução."""
+        record['duracao_ms'] = round(elapsed * 1000, 3)
+        if exc_type is not None:
+            record['erro'] = exc_type.__name__
+        stack = self._local.stack
+        # Intervalos abertos por um bloco interrompido saem junto com este
+        while stack and stack.pop() is not record:
+            pass
+        if stack:
+            return
+        run = {
+            'execucao': record['nome'],
+            'thread': threading.current_thread().name,
+            'inicio': self._local.started_at,
+            'duracao_ms': record['duracao_ms'],
+            'intervalos': self._local.spans,
+        }
+        self._local.spans = []
+        with self._lock:
+            self._runs.append(run)
+            if self.export_path:
+                try:
+                    with open(self.export_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(run, ensure_ascii=False) + "\n")
+                except OSError:
+                    # A exportação não pode interromper a página medida
+                    pass
+
+    def runs(self):
+        """Cópia das execuções guardadas, da mais antiga para a mais recente."""
+        with self._lock:
+            return list(self._runs)
+
+    def clear(self):
+        """Descarta as execuções guardadas."""
+        with self._lock:
+            self._runs.clear()
+
+
+# Instância única do processo: os decoradores são aplicados na importação
+recorder = PerfRecorder()
+
+
+def span(name):
+    """Bloco medido pelo registrador do processo (ver PerfRecorder.span)."""
+    return recorder.span(name)
+
+
+def timed(func=None, *, name=None):
+    """
+    Decorador que mede cada chamada da função.
+
+    Pode ser usado como @timed ou @timed(name="..."). O nome padrão é
+    módulo.função. Sobre funções com @st.cache_data, deve ficar acima do
+    decorador do cache, para medir também os acertos.
+
+    Args:
+        func: Função decorada
+        name: Nome do intervalo
+
+    Returns:
+        Função com a medição
+    """
+    def decorate(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not recorder.enabled:
+                return func(*args, **kwargs)
+            with _Span(recorder, label):
+                return func(*args, **kwargs)
+        return wrapper
+
+    if func is not None:
+        return decorate(func)
+    return decorate
+
+
+def set_enabled(enabled):
+    """Ativa ou desativa a medição no processo (todas as sessões)."""
+    recorder.enabled = bool(enabled)
+
+
+def is_enabled():
+    """Indica se a medição está ativada."""
+    return recorder.enabled
+
+
+def span_stats(runs=None):
+    """
+    Estatísticas por intervalo nas execuções guardadas.
+
+    Args:
+        runs: Execuções (padrão: as do buffer)
+
+    Returns:
+        DataFrame com chamadas, p50, p95, máximo e total (ms) por intervalo,
+        do maior total para o menor
+    """
+    runs = recorder.runs() if runs is None else runs
+    rows = [
+        (span_record['nome'], span_record['duracao_ms'])
+        for run in runs
+        for span_record in run['intervalos']
+        if 'duracao_ms' in span_record
+    ]
+    if not rows:
+        return pd.DataFrame(columns=['intervalo', 'chamadas', 'p50_ms', 'p95_ms', 'max_ms', 'total_ms'])
+    df = pd.DataFrame(rows, columns=['intervalo', 'duracao_ms'])
+    stats = df.groupby('intervalo')['duracao_ms'].agg(
+        chamadas='count',
+        p50_ms=lambda values: values.quantile(0.5),
+        p95_ms=lambda values: values.quantile(0.95),
+        max_ms='max',
+        total_ms='sum',
+    )
+    return stats.sort_values('total_ms', ascending=False).round(2).reset_index()
+
+
+def run_tree(run):
+    """
+    Intervalos de uma execução em ordem de início, com o nome recuado pelo nível.
+
+    Args:
+        run: Execução guardada
+
+    Returns:
+        DataFrame com intervalo, início e duração (ms)
+    """
+    rows = [
+        (' ' * span_record['nivel'] + span_record['nome'],
+         span_record['inicio_ms'], span_record.get('duracao_ms'), span_record.get('erro'))
+        for span_record in run['intervalos']
+    ]
+    return pd.DataFrame(rows, columns=['intervalo', 'inicio_ms', 'duracao_ms', 'erro'])
+
+
+def export_jsonl(runs=None):
+    """
+    Execuções em JSON lines (uma execução por linha).
+
+    Args:
+        runs: Execuções (padrão: as do buffer)
+
+    Returns:
+        Texto JSON lines
+    """
+    runs = recorder.runs() if runs is None else runs
+    return "".join(json.dumps(run, ensure_ascii=False) + "\n" for run in runs)
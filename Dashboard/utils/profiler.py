@@ -0,0 +1,323 @@
+"""
+Perfil por amostragem de uma única execução do dashboard.
+
+Quando pedido (pelo painel de administração ou com ?profile=1 junto com
+?admin=<chave> na URL), a execução seguinte de app.main roda com um SamplingProfiler: uma thread
+auxiliar lê a pilha da thread do script a cada PROFILE_INTERVAL_MS
+(sys._current_frames), sem instrumentar as chamadas, então o custo não
+depende da quantidade de funções executadas.
+
+Ao final, o perfil é gravado em PROFILE_DIR em dois formatos:
+- .speedscope.json: abrir em https://www.speedscope.app;
+- .collapsed.txt: pilhas colapsadas (flamegraph.pl, speedscope, inferno).
+Só os PROFILE_KEEP perfis mais recentes ficam na pasta.
+A tabela das funções com mais tempo (próprio e acumulado) é exibida ao
+final da página e os perfis recentes ficam no painel de administração.
+
+Uso:
+    with profile_run("panorama") as result:
+        main()
+    result.hotspots(top=30)
+"""
+import contextlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+import pandas as pd
+
+from config.settings import PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_KEEP, PROFILE_TOP
+
+# Perfis mantidos em memória para o painel de administração
+RECENT_PROFILES = 10
+
+# Extensões dos arquivos gravados por ProfileResult.save
+PROFILE_SUFFIXES = ('.speedscope.json', '.collapsed.txt')
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _short_path(filename):
+    """Caminho curto para exibição (relativo ao dashboard ou ao site-packages)."""
+    if filename.startswith(DASHBOARD_DIR):
+        return os.path.relpath(filename, DASHBOARD_DIR)
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return filename
+
+
+class SamplingProfiler:
+    """Amostragem periódica da pilha de uma thread."""
+
+    def __init__(self, interval=PROFILE_INTERVAL_MS / 1000):
+        """
+        Args:
+            interval: Intervalo entre amostras, em segundos
+        """
+        self.interval = interval
+        # Pilha (da raiz para a folha) de cada amostra, como índices em frames,
+        # e o tempo real desde a amostra anterior (ms): com o GIL ocupado por
+        # código nativo, o intervalo efetivo pode passar do configurado
+        self.samples = []
+        self.weights = []
+        self.frames = []
+        self._frame_index = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.started_at = None
+        self.elapsed = 0.0
+
+    def _frame_id(self, code):
+        """Índice do quadro (função) na tabela de quadros."""
+        key = (code.co_filename, code.co_firstlineno, code.co_name)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({
+                'name': getattr(code, 'co_qualname', code.co_name),
+                'file': _short_path(code.co_filename),
+                'line': code.co_firstlineno,
+            })
+        return index
+
+    def _sample_loop(self, target):
+        """Lê a pilha da thread alvo até stop()."""
+        last = self._start
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples.append(tuple(stack))
+            self.weights.append((now - last) * 1000)
+            last = now
+
+    def start(self, thread_ident=None):
+        """
+        Inicia a amostragem.
+
+        Args:
+            thread_ident: Thread amostrada (padrão: a thread atual)
+        """
+        target = thread_ident or threading.get_ident()
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._sample_loop, args=(target,), name="dashboard-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Encerra a amostragem."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._start
+
+    def hotspots(self, top=PROFILE_TOP):
+        """
+        Funções com mais amostras.
+
+        Args:
+            top: Quantidade de funções
+
+        Returns:
+            DataFrame com função, local, tempo próprio e acumulado (ms e %)
+        """
+        columns = ['funcao', 'local', 'proprio_ms', 'proprio_pct', 'acumulado_ms', 'acumulado_pct']
+        if not self.samples:
+            return pd.DataFrame(columns=columns)
+        own = Counter()
+        total = Counter()
+        for stack, weight in zip(self.samples, self.weights):
+            own[stack[-1]] += weight
+            # Cada função conta uma vez por amostra, mesmo em recursão
+            for index in set(stack):
+                total[index] += weight
+        sampled_ms = sum(self.weights)
+        rows = []
+        for index, total_ms in total.items():
+            frame = self.frames[index]
+            own_ms = own.get(index, 0.0)
+            rows.append((
+                frame['name'], f"{frame['file']}:{frame['line']}",
+                own_ms, own_ms / sampled_ms * 100, total_ms, total_ms / sampled_ms * 100,
+            ))
+        df = pd.DataFrame(rows, columns=columns)
+        return df.sort_values(['proprio_ms', 'acumulado_ms'], ascending=False).head(top).round(1)
+
+    def to_speedscope(self, name):
+        """
+        Perfil no formato do speedscope (perfil 'sampled').
+
+        Args:
+            name: Nome do perfil
+
+        Returns:
+            Dicionário serializável em JSON
+        """
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'dashboard utils/profiler.py',
+            'activeProfileIndex': 0,
+            'shared': {'frames': self.frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': sum(self.weights),
+                'samples': [list(stack) for stack in self.samples],
+                'weights': [round(weight, 3) for weight in self.weights],
+            }],
+        }
+
+    def to_collapsed(self):
+        """
+        Pilhas colapsadas ('raiz;...;folha quantidade'), uma por linha.
+
+        Returns:
+            Texto no formato do flamegraph.pl
+        """
+        counts = Counter(self.samples)
+        lines = []
+        # Contagem de amostras, como no flamegraph.pl
+        for stack, count in counts.most_common():
+            names = [self.frames[index]['name'].replace(';', ':') for index in stack]
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class ProfileResult:
+    """Perfil de uma execução: amostras, arquivos gravados e erro de gravação."""
+
+    def __init__(self, label):
+        self.label = label
+        self.profiler = SamplingProfiler()
+        self.files = []
+        self.error = None
+
+    @property
+    def started_at(self):
+        return self.profiler.started_at
+
+    @property
+    def elapsed(self):
+        return self.profiler.elapsed
+
+    @property
+    def sample_count(self):
+        return len(self.profiler.samples)
+
+    def hotspots(self, top=PROFILE_TOP):
+        """Funções com mais tempo (ver SamplingProfiler.hotspots)."""
+        return self.profiler.hotspots(top)
+
+    def save(self, out_dir=PROFILE_DIR):
+        """
+        Grava o perfil em speedscope e em pilhas colapsadas.
+
+        Args:
+            out_dir: Pasta de destino
+
+        Returns:
+            Lista com os arquivos gravados
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(self.started_at))
+        slug = re.sub(r'[^\w.-]+', '_', self.label).strip('_') or 'execucao'
+        base = os.path.join(out_dir, f"perfil_{stamp}_{slug}")
+
+        speedscope_path = base + PROFILE_SUFFIXES[0]
+        with open(speedscope_path, 'w', encoding='utf-8') as f:
+            json.dump(self.profiler.to_speedscope(f"{self.label} {stamp}"), f)
+        collapsed_path = base + PROFILE_SUFFIXES[1]
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            f.write(self.profiler.to_collapsed())
+        self.files = [speedscope_path, collapsed_path]
+        return self.files
+
+
+def prune_profiles(keep=PROFILE_KEEP, out_dir=PROFILE_DIR):
+    """
+    Remove os perfis mais antigos da pasta, mantendo os `keep` mais recentes.
+
+    Args:
+        keep: Perfis mantidos (cada perfil tem um arquivo por formato)
+        out_dir: Pasta dos perfis
+    """
+    if not os.path.isdir(out_dir):
+        return
+    # Agrupa os arquivos de cada perfil pelo nome sem a extensão
+    profiles = {}
+    for entry in os.listdir(out_dir):
+        for suffix in PROFILE_SUFFIXES:
+            if entry.startswith('perfil_') and entry.endswith(suffix):
+                path = os.path.join(out_dir, entry)
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                base = entry[:-len(suffix)]
+                files, newest = profiles.get(base, ([], 0.0))
+                profiles[base] = (files + [path], max(newest, mtime))
+    ordered = sorted(profiles.values(), key=lambda item: item[1], reverse=True)
+    for files, _ in ordered[max(keep, 0):]:
+        for path in files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+_recent = deque(maxlen=RECENT_PROFILES)
+_recent_lock = threading.Lock()
+
+
+def recent_profiles():
+    """Perfis das execuções recentes do processo, do mais recente para o mais antigo."""
+    with _recent_lock:
+        return list(reversed(_recent))
+
+
+@contextlib.contextmanager
+def profile_run(label, out_dir=PROFILE_DIR):
+    """
+    Executa um bloco com o SamplingProfiler e grava o perfil ao final.
+
+    O perfil é gravado mesmo se o bloco for interrompido (exceção ou
+    reexecução pedida pelo Streamlit), e os perfis antigos da pasta são
+    removidos (prune_profiles); a falha na gravação fica em result.error e
+    não interrompe a página.
+
+    Args:
+        label: Nome do perfil (usado no nome dos arquivos)
+        out_dir: Pasta de destino dos arquivos
+
+    Yields:
+        ProfileResult, completo ao sair do bloco
+    """
+    result = ProfileResult(label)
+    result.profiler.start()
+    try:
+        yield result
+    finally:
+        result.profiler.stop()
+        try:
+            result.save(out_dir)
+            prune_profiles(out_dir=out_dir)
+        except OSError as e:
+            result.error = f"Não foi possível gravar o perfil: {e}"
+        with _recent_lock:
+            _recent.append(result)
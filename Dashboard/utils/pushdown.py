@@ -0,0 +1,441 @@
+"""
+Filtros globais da barra lateral aplicados na origem dos dados.
+
+Em vez de filtrar linhas dos DataFrames já agregados, cada DataFrame do
+dashboard é recalculado para a fatia (período, categoria, região):
+
+- fraud_trend, fraud_time e fraud_region saem do cubo OLAP
+  (utils/cube.py), sem consulta ao banco;
+- missing_products, missing_categories e driver_products saem de uma
+  única consulta de relatos de produtos faltantes da fatia, agrupada por
+  motorista, cliente e produto, com os filtros no WHERE;
+- drivers e suspicious_drivers saem de uma consulta por motorista, e
+  suspicious_customers de uma consulta por cliente, com os mesmos filtros
+  (motoristas e clientes não fazem parte do cubo).
+
+As consultas são memorizadas com st.cache_data pela fatia e pela versão
+do banco; mudar apenas a categoria reaproveita as estatísticas de
+motoristas e clientes, e os relatos por motorista e cliente da consulta
+de produtos substituem os itens faltantes quando há filtro de categoria.
+Apenas os DataFrames pedidos (os da página ativa) são calculados, e uma
+consulta só é executada se algum deles depende dela.
+"""
+from datetime import date, timedelta
+from functools import cached_property
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import DB_PATH
+from utils.aggregations import DEFAULT_PARAMS, query_dialect, query_relation, run_query
+from utils.backends import get_backend
+from utils.cube import OlapCube, filters_from_sidebar, percent
+from utils.database import get_pool
+from utils.datasets import DATASET_VERSION_KEY, with_version
+from utils.dtypes import STRING_DTYPE, apply_frame_schemas
+from utils.perf import timed
+from utils.snapshots import db_content_version
+
+# Relatos de produtos faltantes da fatia. {where} recebe os filtros de
+# sql_predicates; o agrupamento por motorista e cliente permite derivar
+# os DataFrames de produtos e os relatos por motorista/cliente da mesma leitura.
+FILTERED_REPORTS_SQL = """
+    SELECT o.driver_id,
+           o.customer_id,
+           r.product_id,
+           p.product_name,
+           p.category,
+           COUNT(*) AS itens_faltantes
+    FROM {relation} r
+    JOIN orders o ON o.order_id = r.order_id
+    LEFT JOIN products p ON p.product_id = r.product_id
+    WHERE {where}
+    GROUP BY o.driver_id, o.customer_id, r.product_id, p.product_name, p.category
+"""
+
+# Estatísticas por motorista da fatia; pedidos sem data ficam de fora,
+# como no cubo
+FILTERED_DRIVERS_SQL = """
+    SELECT o.driver_id,
+           COUNT(o.order_id) AS total_entregas,
+           SUM(o.items_missing) AS relatos_fraude
+    FROM orders o
+    WHERE o.driver_id IS NOT NULL AND o.date IS NOT NULL AND {where}
+    GROUP BY o.driver_id
+    ORDER BY o.driver_id
+"""
+
+# Estatísticas por cliente da fatia; region vem da primeira linha do
+# cliente (MIN(rowid)), como em SUSPICIOUS_CUSTOMERS_SQL
+FILTERED_CUSTOMERS_SQL = """
+    WITH stats AS (
+        SELECT o.customer_id,
+               SUM(o.items_missing) AS relatos_fraude,
+               COUNT(o.order_id) AS total_pedidos,
+               MIN(o.rowid) AS primeira_linha,
+               o.region
+        FROM orders o
+        WHERE o.customer_id IS NOT NULL AND {where}
+        GROUP BY o.customer_id
+    )
+    SELECT s.customer_id, s.relatos_fraude, s.total_pedidos, s.region, c.customer_name
+    FROM stats s
+    LEFT JOIN customers c ON c.customer_id = s.customer_id
+"""
+
+FILTERED_CUSTOMERS_DUCKDB_SQL = """
+    WITH stats AS (
+        SELECT o.customer_id,
+               SUM(o.items_missing) AS relatos_fraude,
+               COUNT(o.order_id) AS total_pedidos,
+               arg_min(o.region, o.rowid) AS region
+        FROM orders o
+        WHERE o.customer_id IS NOT NULL AND {where}
+        GROUP BY o.customer_id
+    )
+    SELECT s.customer_id, s.relatos_fraude, s.total_pedidos, s.region, c.customer_name
+    FROM stats s
+    LEFT JOIN customers c ON c.customer_id = s.customer_id
+"""
+
+
+def normalize_filters(data, date_filter=None, category_filter=None, region_filter=None):
+    """
+    Converte os filtros da barra lateral em uma fatia normalizada.
+
+    Um período que cobre todas as datas carregadas não é um filtro: o
+    st.date_input começa com o intervalo completo.
+
+    Args:
+        data: Dicionário com os DataFrames carregados
+        date_filter: Data ou tupla (início, fim)
+        category_filter: Categoria ou "Todas"
+        region_filter: Região ou "Todas"
+
+    Returns:
+        Dicionário de filtros no formato de OlapCube.slice, com datas em
+        texto AAAA-MM-DD e regiões em tupla
+    """
+    filters = filters_from_sidebar(date_filter, category_filter, region_filter)
+
+    if 'date_range' in filters:
+        start, end = (pd.Timestamp(value).normalize() for value in filters['date_range'])
+        trend = data.get('fraud_trend') if data else None
+        if trend is not None and not trend.empty and \
+                start <= trend['date'].min() and end >= trend['date'].max():
+            del filters['date_range']
+        else:
+            filters['date_range'] = (start.date().isoformat(), end.date().isoformat())
+
+    if 'regions' in filters:
+        filters['regions'] = tuple(filters['regions'])
+    return filters
+
+
+def sql_predicates(filters, include_category=True):
+    """
+    Monta o WHERE de uma fatia sobre orders (alias o) e products (alias p).
+
+    O período vira um intervalo [início, fim + 1 dia) sobre o texto da
+    data, o que permite usar o índice de orders(date).
+
+    Args:
+        filters: Dicionário de normalize_filters
+        include_category: Se False, ignora o filtro de categoria
+
+    Returns:
+        Tupla (condição SQL, parâmetros nomeados)
+    """
+    clauses, params = [], {}
+    if 'date_range' in filters:
+        start, end = filters['date_range']
+        clauses += ["o.date >= :inicio", "o.date < :fim"]
+        params['inicio'] = start
+        params['fim'] = (date.fromisoformat(end) + timedelta(days=1)).isoformat()
+    if 'regions' in filters:
+        names = [f"region_{i}" for i in range(len(filters['regions']))]
+        clauses.append(f"o.region IN ({', '.join(':' + name for name in names)})")
+        params.update(zip(names, filters['regions']))
+    if include_category and 'category' in filters:
+        clauses.append("p.category = :category")
+        params['category'] = filters['category']
+    return ' AND '.join(clauses) or '1 = 1', params
+
+
+@timed
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def load_filtered_reports(filter_items, version):
+    """
+    Lê os relatos de produtos faltantes de uma fatia.
+
+    Args:
+        filter_items: Filtros como tupla de pares (chave da memorização)
+        version: Versão de conteúdo do banco (chave da memorização)
+
+    Returns:
+        DataFrame com driver_id, customer_id, product_id, product_name,
+        category e itens_faltantes
+    """
+    where, params = sql_predicates(dict(filter_items))
+    with get_pool().connection() as conn:
+        backend = get_backend(conn)
+        sql = FILTERED_REPORTS_SQL.format(relation=query_relation(backend), where=where)
+        return run_query(backend, sql, params)
+
+
+@timed
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def load_filtered_drivers(filter_items, version):
+    """
+    Lê as estatísticas por motorista de uma fatia (sem filtro de categoria).
+
+    Args:
+        filter_items: Filtros como tupla de pares (chave da memorização)
+        version: Versão de conteúdo do banco (chave da memorização)
+
+    Returns:
+        DataFrame com driver_id, total_entregas e relatos_fraude
+    """
+    where, params = sql_predicates(dict(filter_items), include_category=False)
+    with get_pool().connection() as conn:
+        return run_query(get_backend(conn), FILTERED_DRIVERS_SQL.format(where=where), params)
+
+
+@timed
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def load_filtered_customers(filter_items, version):
+    """
+    Lê as estatísticas por cliente de uma fatia (sem filtro de categoria).
+
+    Args:
+        filter_items: Filtros como tupla de pares (chave da memorização)
+        version: Versão de conteúdo do banco (chave da memorização)
+
+    Returns:
+        DataFrame com customer_id, relatos_fraude, total_pedidos, region
+        e customer_name
+    """
+    where, params = sql_predicates(dict(filter_items), include_category=False)
+    with get_pool().connection() as conn:
+        backend = get_backend(conn)
+        template = FILTERED_CUSTOMERS_DUCKDB_SQL if query_dialect(backend) == 'duckdb' else FILTERED_CUSTOMERS_SQL
+        return run_query(backend, template.format(where=where), params)
+
+
+def _filter_items(filters):
+    """Filtros como tupla ordenada de pares, usável como chave de cache."""
+    return tuple(sorted(filters.items()))
+
+
+def _missing_products(reports, params):
+    """Produtos mais reportados da fatia (formato de missing_products)."""
+    products = (
+        reports.groupby('product_id', sort=True)
+        .agg(itens_faltantes=('itens_faltantes', 'sum'),
+             product_name=('product_name', 'first'),
+             category=('category', 'first'))
+        .reset_index()
+        .sort_values('itens_faltantes', ascending=False, kind='stable')
+        .head(params['top_products'])
+        .reset_index(drop=True)
+    )
+    products['total_relatos'] = products['itens_faltantes']
+    return products
+
+
+def _missing_categories(reports):
+    """Relatos e produtos distintos por categoria (formato de missing_categories)."""
+    return (
+        reports.groupby('category', sort=True, dropna=False)
+        .agg(total_relatos=('itens_faltantes', 'sum'),
+             produtos_distintos=('product_id', 'nunique'))
+        .reset_index()
+        .sort_values('total_relatos', ascending=False, kind='stable')
+        .reset_index(drop=True)
+    )
+
+
+def _driver_products(reports, drivers, params):
+    """Itens faltantes por motorista e produto (formato de driver_products)."""
+    counts = (
+        reports[reports['driver_id'].notna()]
+        .groupby(['driver_id', 'product_id'], sort=True)
+        .agg(product_name=('product_name', 'first'),
+             category=('category', 'first'),
+             itens_faltantes=('itens_faltantes', 'sum'))
+        .reset_index()
+    )
+    totals = counts.groupby('driver_id', sort=True)['itens_faltantes'].sum()
+    top = totals.sort_values(ascending=False, kind='stable').head(params['top_driver_products'])
+
+    counts = counts[counts['driver_id'].isin(top.index)].copy()
+    counts['total_motorista'] = counts['driver_id'].map(top)
+    counts = counts.sort_values(
+        ['total_motorista', 'driver_id', 'itens_faltantes', 'product_id'],
+        ascending=[False, True, False, True], kind='stable'
+    )
+    counts = counts.merge(drivers[['driver_id', 'driver_name']], on='driver_id', how='left')
+    return counts[['driver_id', 'driver_name', 'product_id', 'product_name',
+                   'category', 'itens_faltantes']].reset_index(drop=True)
+
+
+def _suspects(stats, key, total_column, threshold, min_total, top):
+    """
+    Seleciona as chaves com taxa de fraude acima do limiar.
+
+    Mesma regra das consultas SUSPICIOUS_*_SQL: taxa arredondada acima de
+    threshold, total acima de min_total, ordenado pela chave, limitado a top.
+    """
+    stats = stats.copy()
+    stats['taxa_fraude'] = percent(stats['relatos_fraude'], stats[total_column])
+    selected = stats[(stats['taxa_fraude'] > threshold) & (stats[total_column] > min_total)]
+    selected = selected.sort_values(key, kind='stable').head(top).reset_index(drop=True)
+    selected['percentual_fraude'] = selected['taxa_fraude']
+    return selected
+
+
+def _cases_by(reports, key):
+    """Relatos da fatia somados por motorista ou cliente."""
+    return reports[reports[key].notna()].groupby(key)['itens_faltantes'].sum()
+
+
+class FilteredSlice:
+    """
+    DataFrames do dashboard de uma fatia, calculados sob demanda.
+
+    Os resultados intermediários (relatos da fatia, estatísticas por
+    motorista e por cliente) são calculados uma única vez e compartilhados
+    pelos DataFrames que dependem deles.
+    """
+
+    def __init__(self, data, filters, params=None):
+        """
+        Args:
+            data: Dicionário com os DataFrames carregados (inclui os cuboides)
+            filters: Dicionário de normalize_filters
+            params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+        """
+        self.data = data
+        self.filters = filters
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.order_filters = {name: value for name, value in filters.items() if name != 'category'}
+        self.cube = OlapCube.from_frames(data)
+        self.sliced = self.cube.slice(**filters)
+        # Versão dos dados recebidos (não a do arquivo do banco): enquanto a
+        # atualização em segundo plano serve uma versão anterior, as
+        # consultas da fatia continuam memorizadas junto com ela
+        self.version = data.get(DATASET_VERSION_KEY) or db_content_version(DB_PATH)
+
+    @cached_property
+    def reports(self):
+        """Relatos de produtos faltantes da fatia (memorizados entre execuções)."""
+        return load_filtered_reports(_filter_items(self.filters), self.version)
+
+    @cached_property
+    def driver_stats(self):
+        """
+        Entregas e itens faltantes por motorista; com filtro de categoria,
+        os casos são os relatos da categoria.
+        """
+        stats = load_filtered_drivers(_filter_items(self.order_filters), self.version).copy()
+        stats['driver_id'] = stats['driver_id'].astype(STRING_DTYPE)
+        if 'category' in self.filters:
+            relatos = _cases_by(self.reports, 'driver_id')
+            stats['relatos_fraude'] = stats['driver_id'].map(relatos).fillna(0).astype('int64')
+        return stats
+
+    @cached_property
+    def customer_stats(self):
+        """Pedidos e itens faltantes por cliente (relatos da categoria, se filtrada)."""
+        customers = load_filtered_customers(_filter_items(self.order_filters), self.version)
+        if 'category' in self.filters:
+            customers = customers.copy()
+            relatos = _cases_by(self.reports, 'customer_id')
+            customers['relatos_fraude'] = customers['customer_id'].map(relatos).fillna(0).astype('int64')
+        return customers
+
+    def fraud_trend(self):
+        """Tendência diária da fatia."""
+        return self.sliced.fraud_trend()
+
+    def fraud_region(self):
+        """Métricas por região da fatia."""
+        return self.sliced.fraud_region()
+
+    def fraud_time(self):
+        """Casos por hora da fatia."""
+        return self.sliced.fraud_time()
+
+    def missing_products(self):
+        """Produtos mais reportados da fatia."""
+        return _missing_products(self.reports, self.params)
+
+    def missing_categories(self):
+        """Relatos por categoria da fatia."""
+        return _missing_categories(self.reports)
+
+    def driver_products(self):
+        """Itens faltantes por motorista e produto da fatia."""
+        return _driver_products(self.reports, self.data['drivers'], self.params)
+
+    def drivers(self):
+        """Motoristas com pedidos na fatia; total_entregas conta os pedidos da fatia."""
+        drivers = self.data['drivers'].drop(columns=['total_entregas'], errors='ignore').merge(
+            self.driver_stats[['driver_id', 'total_entregas']], on='driver_id', how='inner'
+        )
+        return drivers[['driver_id', 'driver_name', 'age', 'total_entregas', 'faixa_etaria']]
+
+    def suspicious_drivers(self):
+        """Motoristas suspeitos da fatia."""
+        selected = _suspects(
+            self.driver_stats, 'driver_id', 'total_entregas',
+            self.params['driver_rate_threshold'], self.params['driver_min_deliveries'],
+            self.params['top_suspects']
+        ).merge(self.data['drivers'][['driver_id', 'driver_name']], on='driver_id', how='left')
+        return selected[['driver_id', 'relatos_fraude', 'total_entregas', 'taxa_fraude',
+                         'percentual_fraude', 'driver_name']]
+
+    def suspicious_customers(self):
+        """Clientes suspeitos da fatia."""
+        selected = _suspects(
+            self.customer_stats, 'customer_id', 'total_pedidos',
+            self.params['customer_rate_threshold'], self.params['customer_min_orders'],
+            self.params['top_suspects']
+        )
+        return selected[['customer_id', 'relatos_fraude', 'total_pedidos', 'region',
+                         'taxa_fraude', 'percentual_fraude', 'customer_name']]
+
+
+# DataFrames do dashboard recalculados para cada fatia
+FILTERED_FRAMES = [
+    'fraud_trend', 'fraud_region', 'missing_products', 'missing_categories',
+    'driver_products', 'drivers', 'suspicious_drivers', 'fraud_time', 'suspicious_customers'
+]
+
+
+@timed
+def build_filtered_frames(data, filters, params=None, frames=None):
+    """
+    Recalcula os DataFrames do dashboard para uma fatia.
+
+    Args:
+        data: Dicionário com os DataFrames carregados (inclui os cuboides)
+        filters: Dicionário de normalize_filters
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+        frames: Nomes dos DataFrames a recalcular (padrão: FILTERED_FRAMES).
+                Os demais DataFrames de FILTERED_FRAMES ficam fora do
+                resultado, para que nenhuma página use dados sem o filtro.
+
+    Returns:
+        Novo dicionário com os DataFrames da fatia; os cuboides são mantidos
+    """
+    wanted = FILTERED_FRAMES if frames is None else [name for name in FILTERED_FRAMES if name in frames]
+    current = FilteredSlice(data, filters, params)
+    computed = apply_frame_schemas({name: getattr(current, name)() for name in wanted})
+
+    filtered = {name: value for name, value in data.items() if name not in FILTERED_FRAMES}
+    filtered.update(computed)
+    if DATASET_VERSION_KEY in data:
+        # Os DataFrames da fatia recebem uma versão própria
+        filtered = with_version(filtered, f"{data[DATASET_VERSION_KEY]}|{_filter_items(filters)}")
+    return filtered
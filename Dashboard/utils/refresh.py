@@ -0,0 +1,194 @@
+"""
+Atualização dos dados do dashboard por detecção de mudança no banco.
+
+Em vez de expirar os dados a cada intervalo fixo (ttl), o RefreshManager
+mantém a versão carregada e, no máximo a cada REFRESH_CHECK_SECONDS,
+calcula a versão de conteúdo do banco (db_content_version: tamanho e data
+de modificação do banco e do WAL, sem abrir o SQLite). Quando a versão
+muda, os dados são reconstruídos em uma thread em segundo plano enquanto as
+sessões continuam recebendo a versão anterior (stale-while-revalidate); ao
+final, a nova versão substitui a anterior em uma única atribuição.
+
+Apenas a primeira carga bloqueia a sessão que a pediu. Se a reconstrução
+falhar, a versão anterior continua em uso e o erro fica em status(); a
+mesma versão só é tentada de novo após uma espera que dobra a cada falha
+(até REFRESH_RETRY_MAX_SECONDS). Uma nova mudança no banco é tentada logo.
+"""
+import threading
+import time
+
+import pandas as pd
+
+from config.settings import REFRESH_CHECK_SECONDS, REFRESH_RETRY_MAX_SECONDS
+
+
+class RefreshManager:
+    """Versão atual dos dados, com reconstrução em segundo plano quando o banco muda."""
+
+    def __init__(self, loader, version_fn, check_interval=REFRESH_CHECK_SECONDS,
+                 retry_max=REFRESH_RETRY_MAX_SECONDS):
+        """
+        Args:
+            loader: Função que recebe a versão e devolve o dicionário de dados;
+                    em caso de falha, levanta uma exceção (ou devolve None)
+            version_fn: Função sem argumentos que devolve a versão atual do banco
+            check_interval: Intervalo mínimo, em segundos, entre verificações
+            retry_max: Espera máxima, em segundos, antes de tentar de novo
+                       uma versão que falhou
+        """
+        self.loader = loader
+        self.version_fn = version_fn
+        self.check_interval = check_interval
+        self.retry_max = retry_max
+        # (versão, momento da próxima tentativa, espera atual) da última falha
+        self._failed = (None, 0.0, 0.0)
+        # (versão, dados, momento da carga): substituído por inteiro, nunca alterado
+        self._current = (None, None, None)
+        self._last_check = 0.0
+        self._last_error = None
+        self._refresh_thread = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def current(self):
+        """
+        Retorna os dados da versão atual.
+
+        Na primeira chamada (ou após uma carga sem sucesso), carrega os dados
+        e bloqueia até o fim. Nas demais, devolve a versão carregada e, se o
+        banco mudou, inicia a reconstrução em segundo plano.
+
+        Returns:
+            Dicionário de dados ou None se nenhuma carga teve sucesso
+        """
+        version, data, _ = self._current
+        if data is None:
+            return self._load_blocking()
+        self._check_for_changes(version)
+        return data
+
+    def _load_blocking(self):
+        """Carrega a versão atual na sessão que pediu (uma carga por vez)."""
+        with self._load_lock:
+            version, data, _ = self._current
+            if data is not None:
+                # Outra sessão terminou a carga enquanto esta esperava
+                return data
+            version = self.version_fn()
+            self._last_check = time.monotonic()
+            data = self.loader(version)
+            if data:
+                self._current = (version, data, time.time())
+            return data
+
+    def _check_for_changes(self, loaded_version):
+        """Verifica a versão do banco e inicia a reconstrução se ela mudou."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_check < self.check_interval or self.refreshing:
+                return
+            self._last_check = now
+
+        try:
+            version = self.version_fn()
+        except Exception as e:
+            self._last_error = f"Falha ao verificar a versão do banco: {e}"
+            return
+        if version == loaded_version:
+            return
+        failed_version, retry_at, _ = self._failed
+        if version == failed_version and now < retry_at:
+            return
+
+        with self._lock:
+            if self.refreshing:
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._rebuild, args=(version,), name="dashboard-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _rebuild(self, version):
+        """Reconstrói os dados de uma versão e substitui a versão atual."""
+        try:
+            data = self.loader(version)
+            error = None if data else "carga sem resultado"
+        except Exception as e:
+            error = str(e)
+        if error:
+            delay = self._record_failure(version)
+            self._last_error = f"Falha ao atualizar os dados: {error} (nova tentativa em {delay:.0f} s)"
+            return
+        self._current = (version, data, time.time())
+        self._failed = (None, 0.0, 0.0)
+        self._last_error = None
+
+    def _record_failure(self, version):
+        """
+        Registra a falha de uma versão e agenda a próxima tentativa.
+
+        Returns:
+            Espera, em segundos, até a próxima tentativa da versão
+        """
+        failed_version, _, delay = self._failed
+        if version == failed_version:
+            delay = min(delay * 2, self.retry_max)
+        else:
+            delay = min(max(self.check_interval, 1.0) * 2, self.retry_max)
+        self._failed = (version, time.monotonic() + delay, delay)
+        return delay
+
+    @property
+    def refreshing(self):
+        """Indica se há uma reconstrução em andamento."""
+        thread = self._refresh_thread
+        return thread is not None and thread.is_alive()
+
+    def wait(self, timeout=None):
+        """
+        Aguarda a reconstrução em andamento, se houver.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+        """
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def status(self):
+        """
+        Retorna o estado da versão carregada.
+
+        Returns:
+            Dicionário com versão, momento da carga, reconstrução em
+            andamento e último erro
+        """
+        version, _, loaded_at = self._current
+        return {
+            'versao': version,
+            'carregado_em': loaded_at,
+            'atualizando': self.refreshing,
+            'ultimo_erro': self._last_error,
+        }
+
+
+def session_view(data):
+    """
+    Cópia rasa dos dados para uma sessão.
+
+    Os dados do RefreshManager são compartilhados por todas as sessões; as
+    páginas criam e substituem colunas nos DataFrames recebidos, o que em
+    uma cópia rasa não altera o original (os valores não são copiados).
+
+    Args:
+        data: Dicionário de dados compartilhado
+
+    Returns:
+        Novo dicionário com cópias rasas dos DataFrames
+    """
+    if not data:
+        return data
+    return {
+        name: value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+        for name, value in data.items()
+    }
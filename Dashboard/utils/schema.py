@@ -0,0 +1,305 @@
+"""
+Gerenciador de esquema do banco walmart_fraudes.db.
+
+As migrações são versionadas com PRAGMA user_version: cada entrada de
+MIGRATIONS é aplicada uma única vez, em ordem, dentro de uma transação.
+Todas as instruções são idempotentes, o que permite reaplicá-las depois
+que o ETL recria as tabelas com to_sql(if_exists='replace').
+
+Uso pela linha de comando (a partir da pasta Dashboard):
+    python -m utils.schema                  # aplica migrações pendentes e ANALYZE
+    python -m utils.schema --rebuild        # reaplica todas após uma nova carga
+    python -m utils.schema --status         # mostra versão e índices existentes
+"""
+import argparse
+import sqlite3
+
+# Lista de migrações: (versão, descrição, instruções SQL)
+MIGRATIONS = [
+    (1, "Índices de busca e índices de cobertura das consultas do dashboard", [
+        # Consultas do dashboard agrupam por uma chave somando items_missing e
+        # contando order_id. Os índices de orders começam pela coluna de busca
+        # e carregam essas colunas, servindo tanto para buscas pontuais
+        # (drill-down por motorista, cliente, região ou data) quanto para
+        # varreduras cobertas sem acesso à tabela.
+        "CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(date, items_missing, order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_driver ON orders(driver_id, items_missing, order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_id, items_missing, order_id, region)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_region ON orders(region, items_missing, order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_hour ON orders(delivery_hour_only, items_missing, order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_orders_order_id ON orders(order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_missing_items_order ON missing_items(order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_products_product ON products(product_id)",
+        "CREATE INDEX IF NOT EXISTS idx_drivers_driver ON drivers(driver_id)",
+        "CREATE INDEX IF NOT EXISTS idx_customers_customer ON customers(customer_id)",
+    ]),
+    (2, "Tabelas de resumo materializadas particionadas por data", [
+        """CREATE TABLE IF NOT EXISTS summary_daily (
+            date TEXT NOT NULL,
+            total_pedidos INTEGER,
+            itens_faltantes INTEGER,
+            itens_entregues INTEGER,
+            pedidos_com_falta INTEGER,
+            valor_total REAL,
+            PRIMARY KEY (date)
+        )""",
+        """CREATE TABLE IF NOT EXISTS summary_hourly (
+            date TEXT NOT NULL,
+            hour INTEGER,
+            total_pedidos INTEGER,
+            itens_faltantes INTEGER,
+            itens_entregues INTEGER,
+            pedidos_com_falta INTEGER,
+            valor_total REAL
+        )""",
+        """CREATE TABLE IF NOT EXISTS summary_region (
+            date TEXT NOT NULL,
+            region TEXT,
+            total_pedidos INTEGER,
+            itens_faltantes INTEGER,
+            itens_entregues INTEGER,
+            pedidos_com_falta INTEGER,
+            valor_total REAL
+        )""",
+        """CREATE TABLE IF NOT EXISTS summary_driver (
+            date TEXT NOT NULL,
+            driver_id TEXT,
+            total_pedidos INTEGER,
+            itens_faltantes INTEGER,
+            itens_entregues INTEGER,
+            pedidos_com_falta INTEGER,
+            valor_total REAL
+        )""",
+        """CREATE TABLE IF NOT EXISTS summary_customer (
+            date TEXT NOT NULL,
+            customer_id TEXT,
+            primeira_linha INTEGER,
+            region TEXT,
+            total_pedidos INTEGER,
+            itens_faltantes INTEGER,
+            itens_entregues INTEGER,
+            pedidos_com_falta INTEGER,
+            valor_total REAL
+        )""",
+        """CREATE TABLE IF NOT EXISTS summary_product (
+            date TEXT NOT NULL,
+            product_id TEXT,
+            total_relatos INTEGER
+        )""",
+        """CREATE TABLE IF NOT EXISTS summary_state (
+            name TEXT PRIMARY KEY,
+            value TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_summary_hourly_date ON summary_hourly(date)",
+        "CREATE INDEX IF NOT EXISTS idx_summary_region_date ON summary_region(date)",
+        "CREATE INDEX IF NOT EXISTS idx_summary_driver_date ON summary_driver(date)",
+        "CREATE INDEX IF NOT EXISTS idx_summary_driver_key ON summary_driver(driver_id)",
+        "CREATE INDEX IF NOT EXISTS idx_summary_customer_date ON summary_customer(date)",
+        "CREATE INDEX IF NOT EXISTS idx_summary_customer_key ON summary_customer(customer_id)",
+        "CREATE INDEX IF NOT EXISTS idx_summary_product_date ON summary_product(date)",
+    ]),
+    (3, "Tabela longa pedido x produto faltante", [
+        # Uma linha por produto faltante, sem limite de produtos por pedido.
+        # position guarda a ordem original (product_id_1, _2, ...).
+        """CREATE TABLE IF NOT EXISTS order_missing_product (
+            order_id TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            position INTEGER NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_order_missing_product_order ON order_missing_product(order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_order_missing_product_product ON order_missing_product(product_id, order_id)",
+        # Junções por order_id que precisam do motorista ou da data sem acessar a tabela
+        "CREATE INDEX IF NOT EXISTS idx_orders_order_lookup ON orders(order_id, driver_id, date)",
+        "DROP INDEX IF EXISTS idx_orders_order_id",
+    ]),
+    (4, "Resumo de itens faltantes por motorista e produto", [
+        """CREATE TABLE IF NOT EXISTS summary_driver_product (
+            date TEXT NOT NULL,
+            driver_id TEXT,
+            product_id TEXT,
+            itens_faltantes INTEGER
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_summary_driver_product_date ON summary_driver_product(date)",
+    ]),
+    (5, "Resumos no grão do cubo OLAP (data x hora x região, e por categoria)", [
+        """CREATE TABLE IF NOT EXISTS summary_cube (
+            date TEXT NOT NULL,
+            hour INTEGER,
+            region TEXT,
+            total_pedidos INTEGER,
+            itens_faltantes INTEGER,
+            itens_entregues INTEGER,
+            pedidos_com_falta INTEGER,
+            valor_total REAL
+        )""",
+        """CREATE TABLE IF NOT EXISTS summary_cube_category (
+            date TEXT NOT NULL,
+            hour INTEGER,
+            region TEXT,
+            category TEXT,
+            total_relatos INTEGER
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_summary_cube_date ON summary_cube(date)",
+        "CREATE INDEX IF NOT EXISTS idx_summary_cube_category_date ON summary_cube_category(date)",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    """
+    Retorna a versão de esquema registrada no banco.
+
+    Args:
+        conn: Conexão com o banco SQLite
+
+    Returns:
+        Número inteiro da versão (0 se nenhuma migração foi aplicada)
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def table_exists(conn, table):
+    """
+    Verifica se uma tabela existe no banco.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        table: Nome da tabela
+
+    Returns:
+        True se a tabela existe
+    """
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def max_rowid(conn, table):
+    """Retorna o maior rowid de uma tabela (0 se vazia)."""
+    return conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+
+
+def get_state(conn, name, default=None):
+    """Lê um valor de summary_state (default se a tabela ou a chave não existir)."""
+    if not table_exists(conn, 'summary_state'):
+        return default
+    row = conn.execute("SELECT value FROM summary_state WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else default
+
+
+def set_state(conn, name, value):
+    """Grava um valor em summary_state."""
+    conn.execute(
+        "INSERT OR REPLACE INTO summary_state (name, value) VALUES (?, ?)",
+        (name, str(value))
+    )
+
+
+def migrate(conn, rebuild=False):
+    """
+    Aplica as migrações pendentes.
+
+    Args:
+        conn: Conexão com o banco SQLite (com permissão de escrita)
+        rebuild: Se True, reaplica todas as migrações. Usar após o ETL
+                 recriar as tabelas, pois isso remove os índices sem
+                 alterar a versão registrada.
+
+    Returns:
+        Lista com as versões aplicadas
+    """
+    current = 0 if rebuild else get_version(conn)
+    applied = []
+
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        with conn:
+            for statement in statements:
+                conn.execute(statement)
+            # PRAGMA não aceita parâmetros; a versão vem da lista acima
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+        applied.append(version)
+
+    return applied
+
+
+def analyze(conn):
+    """
+    Atualiza as estatísticas usadas pelo planejador de consultas.
+
+    Deve ser chamada após cada carga de dados para que o SQLite escolha
+    os índices corretos.
+
+    Args:
+        conn: Conexão com o banco SQLite (com permissão de escrita)
+    """
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+
+def ensure_schema(conn, rebuild=False):
+    """
+    Aplica as migrações e executa ANALYZE quando algo mudou.
+
+    Args:
+        conn: Conexão com o banco SQLite (com permissão de escrita)
+        rebuild: Repassado para migrate()
+
+    Returns:
+        Lista com as versões aplicadas
+    """
+    applied = migrate(conn, rebuild=rebuild)
+    if applied:
+        analyze(conn)
+    return applied
+
+
+def list_indexes(conn):
+    """
+    Lista os índices criados explicitamente no banco.
+
+    Args:
+        conn: Conexão com o banco SQLite
+
+    Returns:
+        Lista de tuplas (tabela, índice)
+    """
+    return conn.execute("""
+        SELECT tbl_name, name FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL
+        ORDER BY tbl_name, name
+    """).fetchall()
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    from config.settings import DB_PATH
+
+    parser = argparse.ArgumentParser(description="Migrações do banco walmart_fraudes.db")
+    parser.add_argument('--db', default=DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Reaplica todas as migrações (após recriar as tabelas)")
+    parser.add_argument('--status', action='store_true',
+                        help="Apenas mostra a versão e os índices existentes")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if not args.status:
+            applied = migrate(conn, rebuild=args.rebuild)
+            analyze(conn)
+            print(f"Migrações aplicadas: {applied or 'nenhuma'}")
+        print(f"Versão do esquema: {get_version(conn)} (mais recente: {LATEST_VERSION})")
+        for table, index in list_indexes(conn):
+            print(f"  {table}: {index}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Snapshots colunares (Arrow IPC) dos DataFrames do dashboard.
+
+Cada snapshot fica em uma pasta nomeada pela versão de conteúdo do banco e
+guarda apenas os DataFrames derivados (agregados e cubo), cujo tamanho não
+depende da quantidade de pedidos. Os arquivos são gravados sem compressão e
+lidos por memory-map; a conversão para pandas copia os dados para a memória
+do processo, mas dispensa refazer as agregações no SQLite.
+"""
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from config.settings import SNAPSHOT_DIR
+from utils.dtypes import ARROW_STRING_TYPES
+
+# Incrementar quando o formato ou o conteúdo dos DataFrames derivados mudar
+SNAPSHOT_FORMAT = 5
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def db_content_version(db_path, extra=None):
+    """
+    Calcula um identificador da versão de conteúdo do banco.
+
+    Usa tamanho e data de modificação do arquivo do banco e do arquivo WAL,
+    o que dispensa abrir o banco.
+
+    Args:
+        db_path: Caminho do banco SQLite
+        extra: Texto opcional adicionado à chave (ex.: modo de carregamento)
+
+    Returns:
+        String hexadecimal curta identificando a versão
+    """
+    parts = [f"format={SNAPSHOT_FORMAT}", f"extra={extra}"]
+    for suffix in ('', '-wal'):
+        path = db_path + suffix
+        if os.path.exists(path):
+            stat = os.stat(path)
+            parts.append(f"{suffix}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def _snapshot_dir(version, snapshot_dir=None):
+    """Retorna a pasta de um snapshot."""
+    return os.path.join(snapshot_dir or SNAPSHOT_DIR, version)
+
+
+def _write_arrow(path, batches, schema):
+    """Grava lotes Arrow em um arquivo IPC sem compressão."""
+    with pa.OSFile(path, 'wb') as sink:
+        with ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write(batch)
+
+
+def _read_arrow(path):
+    """
+    Lê um arquivo IPC por memory-map.
+
+    A tabela Arrow aponta para o mapeamento, que permanece aberto enquanto
+    ela existir.
+    """
+    source = pa.memory_map(path, 'r')
+    return ipc.open_file(source).read_all()
+
+
+def _write_frame(path, df):
+    """Grava um DataFrame como arquivo Arrow IPC."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    _write_arrow(path, table.to_batches(), table.schema)
+
+
+def write_snapshot(version, frames, snapshot_dir=None):
+    """
+    Grava um snapshot com os DataFrames derivados.
+
+    A gravação acontece em uma pasta temporária renomeada ao final, de modo
+    que leitores nunca veem um snapshot incompleto.
+
+    Args:
+        version: Versão de conteúdo (ver db_content_version)
+        frames: Dicionário com os DataFrames do dashboard
+        snapshot_dir: Pasta raiz dos snapshots (padrão: settings.SNAPSHOT_DIR)
+
+    Returns:
+        Caminho da pasta do snapshot
+    """
+    final_dir = _snapshot_dir(version, snapshot_dir)
+    if os.path.exists(os.path.join(final_dir, MANIFEST_FILE)):
+        return final_dir
+
+    tmp_dir = f"{final_dir}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(os.path.join(tmp_dir, 'frames'))
+
+    try:
+        for name, df in frames.items():
+            _write_frame(os.path.join(tmp_dir, 'frames', f"{name}.arrow"), df)
+
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+            json.dump({
+                'version': version,
+                'format': SNAPSHOT_FORMAT,
+                'frames': list(frames.keys()),
+                'created_at': pd.Timestamp.now().isoformat()
+            }, f, indent=2)
+
+        os.rename(tmp_dir, final_dir)
+    except OSError:
+        # Outro processo gravou o mesmo snapshot primeiro
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.exists(os.path.join(final_dir, MANIFEST_FILE)):
+            raise
+
+    return final_dir
+
+
+def _read_manifest(version, snapshot_dir=None):
+    """Lê o manifesto de um snapshot (None se não existir)."""
+    path = os.path.join(_snapshot_dir(version, snapshot_dir), MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_snapshot(version, snapshot_dir=None):
+    """
+    Carrega os DataFrames derivados de um snapshot.
+
+    Os arquivos são lidos por memory-map e convertidos para pandas, o que
+    copia os dados para a memória do processo.
+
+    Args:
+        version: Versão de conteúdo do banco
+        snapshot_dir: Pasta raiz dos snapshots
+
+    Returns:
+        Dicionário com os DataFrames do dashboard ou None se não houver snapshot
+    """
+    manifest = _read_manifest(version, snapshot_dir)
+    if manifest is None:
+        return None
+
+    frames_dir = os.path.join(_snapshot_dir(version, snapshot_dir), 'frames')
+    return {
+        name: _read_arrow(os.path.join(frames_dir, f"{name}.arrow")).to_pandas(
+            types_mapper=ARROW_STRING_TYPES.get
+        )
+        for name in manifest['frames']
+    }
+
+
+def prune_snapshots(keep_version, snapshot_dir=None):
+    """
+    Remove snapshots de versões antigas.
+
+    Em sistemas POSIX, processos que ainda mapeiam os arquivos removidos
+    continuam lendo normalmente até liberá-los.
+
+    Args:
+        keep_version: Versão que deve ser mantida
+        snapshot_dir: Pasta raiz dos snapshots
+    """
+    root = snapshot_dir or SNAPSHOT_DIR
+    if not os.path.isdir(root):
+        return
+    for entry in os.listdir(root):
+        # Pastas .tmp-* pertencem a gravações em andamento de outros processos
+        if entry != keep_version and '.tmp-' not in entry:
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
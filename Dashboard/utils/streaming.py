@@ -0,0 +1,254 @@
+import pandas as pd
+
+from utils.aggregations import (DEFAULT_PARAMS, query_driver_products, query_drivers,
+                                query_missing_categories)
+from utils.cube import percent
+from utils.dtypes import apply_schema
+from utils.engine import ORDER_SCAN_SQL, OrderScan
+from utils.normalization import missing_products_relation
+
+# {relation}: tabela longa order_missing_product ou equivalente
+MISSING_PRODUCTS_CHUNK_SQL = """
+    SELECT product_id
+    FROM {relation}
+"""
+
+# Máximo de linhas parciais de contagem de produtos mantidas antes de consolidar
+DEFAULT_COMPACT_ROWS = 500_000
+
+
+class StreamingAggregator:
+    """
+    Acumula métricas de pedidos e itens faltantes bloco a bloco.
+
+    Os pedidos vão para um OrderScan (utils/engine.py), que soma todas as
+    dimensões em uma passada por bloco; cada bloco é descartado em seguida,
+    de modo que a memória fica limitada pelo tamanho do bloco e pela
+    quantidade de chaves distintas.
+    """
+
+    def __init__(self, compact_rows=DEFAULT_COMPACT_ROWS):
+        self.compact_rows = compact_rows
+        self.orders = OrderScan()
+        self._products = []
+
+    @property
+    def rows_read(self):
+        """Quantidade de pedidos lidos."""
+        return self.orders.rows_read
+
+    def add_orders(self, chunk):
+        """
+        Incorpora um bloco da tabela orders aos acumuladores.
+
+        Args:
+            chunk: DataFrame com as colunas de ORDER_SCAN_SQL
+        """
+        self.orders.add_chunk(chunk)
+
+    def add_missing_products(self, chunk):
+        """
+        Incorpora um bloco de produtos faltantes (formato longo) à contagem.
+
+        Args:
+            chunk: DataFrame com a coluna product_id
+        """
+        self._products.append(chunk['product_id'].value_counts())
+        if sum(len(part) for part in self._products) > self.compact_rows:
+            self._products = [self._combine_products()]
+
+    def _combine_products(self):
+        """Soma as contagens parciais de produtos."""
+        if not self._products:
+            return pd.Series(dtype='int64')
+        return pd.concat(self._products).groupby(level=0, sort=False).sum()
+
+    def totals(self, dim):
+        """
+        Retorna o acumulado final de uma dimensão.
+
+        Args:
+            dim: Uma das dimensões de SCAN_DIMENSIONS
+
+        Returns:
+            DataFrame indexado pela chave com as colunas itens, pedidos e
+            as demais métricas de OrderScan.totals
+        """
+        return self.orders.totals(dim)
+
+    def product_counts(self):
+        """
+        Retorna a contagem total de relatos por produto.
+
+        Returns:
+            Series indexada por product_id, em ordem decrescente (empates
+            em ordem de product_id, como nas consultas SQL)
+        """
+        return self._combine_products().sort_index().sort_values(ascending=False, kind='stable')
+
+
+def _fraud_rate(totals):
+    """Calcula o percentual de itens faltantes por pedido (arredondado como o ROUND do SQLite)."""
+    return percent(totals['itens'], totals['pedidos'])
+
+
+def _lookup(conn, table, key, columns, ids, batch_size=500):
+    """
+    Busca atributos de uma tabela de dimensão apenas para os IDs informados.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        table: Nome da tabela de dimensão
+        key: Coluna de chave
+        columns: Colunas a retornar além da chave
+        ids: Lista de IDs a buscar
+
+    Returns:
+        DataFrame com a chave e as colunas pedidas
+    """
+    frames = [pd.DataFrame(columns=[key] + columns)]
+    ids = list(ids)
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        placeholders = ', '.join('?' * len(batch))
+        sql = f"SELECT {key}, {', '.join(columns)} FROM {table} WHERE {key} IN ({placeholders})"
+        frames.append(pd.read_sql_query(sql, conn, params=batch))
+    return pd.concat(frames, ignore_index=True)
+
+
+def stream_aggregates(conn, chunk_size):
+    """
+    Lê orders e os produtos faltantes em blocos e devolve os acumuladores preenchidos.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        chunk_size: Quantidade de linhas por bloco
+
+    Returns:
+        Instância de StreamingAggregator
+    """
+    aggregator = StreamingAggregator()
+    for chunk in pd.read_sql_query(ORDER_SCAN_SQL, conn, chunksize=chunk_size):
+        aggregator.add_orders(apply_schema(chunk, 'orders'))
+    missing_sql = MISSING_PRODUCTS_CHUNK_SQL.format(relation=missing_products_relation(conn))
+    for chunk in pd.read_sql_query(missing_sql, conn, chunksize=chunk_size):
+        aggregator.add_missing_products(apply_schema(chunk, 'order_missing_product'))
+    return aggregator
+
+
+def stream_dashboard_frames(conn, chunk_size, params=None):
+    """
+    Monta os DataFrames do dashboard com leitura em blocos da tabela orders.
+
+    Produz os mesmos DataFrames de build_dashboard_frames, com números exatos
+    sobre toda a base e memória limitada pelo tamanho do bloco.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        chunk_size: Quantidade de linhas por bloco
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        Dicionário com os DataFrames do dashboard
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    aggregator = stream_aggregates(conn, chunk_size)
+
+    # 1. fraud_trend
+    daily = aggregator.totals('day')
+    fraud_trend = pd.DataFrame({
+        'date': pd.to_datetime(daily.index),
+        'itens_faltantes': daily['itens'].values,
+        'total_pedidos': daily['pedidos'].values,
+        'casos_fraude': daily['itens'].values,
+        'percentual_fraude': _fraud_rate(daily).values
+    })
+
+    # 2. fraud_region
+    regional = aggregator.totals('region')
+    rate = _fraud_rate(regional).values
+    fraud_region = pd.DataFrame({
+        'region': regional.index,
+        'casos_fraude': regional['itens'].values,
+        'total_pedidos': regional['pedidos'].values,
+        'taxa_fraude': rate,
+        'percentual_fraude': rate,
+        'total_itens_faltantes': regional['itens'].values
+    })
+
+    # 3. missing_products
+    counts = aggregator.product_counts().head(params['top_products'])
+    missing_products = pd.DataFrame({
+        'product_id': counts.index,
+        'itens_faltantes': counts.values
+    }).merge(
+        _lookup(conn, 'products', 'product_id', ['product_name', 'category'], counts.index),
+        on='product_id',
+        how='left'
+    )
+    missing_products['total_relatos'] = missing_products['itens_faltantes']
+
+    # 4. drivers, categorias e motorista x produto (consultas agrupadas,
+    # com resultado limitado pelo número de chaves)
+    drivers = query_drivers(conn, params)
+    missing_categories = query_missing_categories(conn, params)
+    driver_products = query_driver_products(conn, params)
+
+    # 5. suspicious_drivers
+    per_driver = aggregator.totals('driver_id')
+    per_driver['taxa_fraude'] = _fraud_rate(per_driver)
+    per_driver = per_driver[
+        (per_driver['taxa_fraude'] > params['driver_rate_threshold']) &
+        (per_driver['pedidos'] > params['driver_min_deliveries'])
+    ].head(params['top_suspects'])
+    suspicious_drivers = pd.DataFrame({
+        'driver_id': per_driver.index,
+        'relatos_fraude': per_driver['itens'].values,
+        'total_entregas': per_driver['pedidos'].values,
+        'taxa_fraude': per_driver['taxa_fraude'].values,
+        'percentual_fraude': per_driver['taxa_fraude'].values
+    }).merge(
+        _lookup(conn, 'drivers', 'driver_id', ['driver_name'], per_driver.index),
+        on='driver_id',
+        how='left'
+    )
+
+    # 6. fraud_time
+    hourly = aggregator.totals('hour')
+    fraud_time = pd.DataFrame({
+        'hour': hourly.index.astype('int64'),
+        'casos_fraude': hourly['itens'].values,
+        'total_entregas': hourly['pedidos'].values
+    })
+
+    # 7. suspicious_customers
+    per_customer = aggregator.totals('customer_id')
+    per_customer['taxa_fraude'] = _fraud_rate(per_customer)
+    per_customer = per_customer[
+        (per_customer['taxa_fraude'] > params['customer_rate_threshold']) &
+        (per_customer['pedidos'] > params['customer_min_orders'])
+    ].head(params['top_suspects'])
+    suspicious_customers = pd.DataFrame({
+        'customer_id': per_customer.index,
+        'relatos_fraude': per_customer['itens'].values,
+        'total_pedidos': per_customer['pedidos'].values,
+        'region': per_customer['region'].values,
+        'taxa_fraude': per_customer['taxa_fraude'].values,
+        'percentual_fraude': per_customer['taxa_fraude'].values
+    }).merge(
+        _lookup(conn, 'customers', 'customer_id', ['customer_name'], per_customer.index),
+        on='customer_id',
+        how='left'
+    )
+
+    return {
+        'fraud_trend': fraud_trend,
+        'fraud_region': fraud_region,
+        'missing_products': missing_products,
+        'missing_categories': missing_categories,
+        'driver_products': driver_products,
+        'drivers': drivers,
+        'suspicious_drivers': suspicious_drivers,
+        'fraud_time': fraud_time,
+        'suspicious_customers': suspicious_customers
+    }
@@ -0,0 +1,524 @@
+"""
+Tabelas de resumo materializadas dentro de walmart_fraudes.db.
+
+Cada tabela summary_* guarda métricas pré-agregadas por data e por uma
+dimensão (hora, região, motorista, cliente, produto ou motorista x
+produto). summary_cube e summary_cube_category guardam o grão do cubo OLAP
+(data x hora x região, e por categoria; ver utils/cube.py). A atualização
+reconstrói apenas as partições (datas) afetadas por pedidos ou relatos
+novos, identificados por marcas d'água de rowid em summary_state.
+
+Pedidos sem data ficam na partição NULL_DATE_PARTITION: contam nos resumos
+por hora, região, motorista, cliente e produto, como nas consultas sobre
+orders (utils/aggregations.py), e ficam fora de summary_daily e dos
+resumos do cubo, como na tendência diária e no cubo.
+
+Uso pela linha de comando (a partir da pasta Dashboard):
+    python -m utils.summaries                        # atualização incremental
+    python -m utils.summaries --full                 # reconstrução completa
+    python -m utils.summaries --dates 2023-01-01 2023-01-02
+"""
+import argparse
+import sqlite3
+from datetime import date, timedelta
+
+import pandas as pd
+
+from utils.aggregations import DEFAULT_PARAMS, query_drivers
+from utils.cube import compact_cube_frames
+from utils.normalization import LONG_TABLE, long_table_is_current, sync_order_missing_product
+from utils.perf import timed
+from utils.schema import get_state, max_rowid, migrate, set_state, table_exists
+
+# Versão do conteúdo das tabelas de resumo; resumos gravados com outra
+# versão são ignorados pelo dashboard e reconstruídos na próxima atualização
+SUMMARY_FORMAT = 4
+
+# Partição dos pedidos sem data
+NULL_DATE_PARTITION = 'sem-data'
+
+# Chave de partição de cada pedido
+PARTITION_KEY = f"COALESCE(DATE(date), '{NULL_DATE_PARTITION}')"
+
+SUMMARY_TABLES = [
+    'summary_daily', 'summary_hourly', 'summary_region',
+    'summary_driver', 'summary_customer', 'summary_product',
+    'summary_driver_product', 'summary_cube', 'summary_cube_category'
+]
+
+# Medidas comuns às tabelas de resumo de pedidos
+_ORDER_MEASURES = """
+    COUNT(order_id),
+    SUM(items_missing),
+    SUM(items_delivered),
+    SUM(CASE WHEN items_missing > 0 THEN 1 ELSE 0 END),
+    SUM(order_amount)
+"""
+
+_MEASURE_COLUMNS = "total_pedidos, itens_faltantes, itens_entregues, pedidos_com_falta, valor_total"
+
+# {partition} é substituído por um filtro de datas na atualização incremental
+SUMMARY_INSERT_SQL = {
+    'summary_daily': f"""
+        INSERT INTO summary_daily (date, {_MEASURE_COLUMNS})
+        SELECT DATE(date), {_ORDER_MEASURES}
+        FROM orders
+        WHERE date IS NOT NULL {{partition}}
+        GROUP BY DATE(date)
+    """,
+    'summary_hourly': f"""
+        INSERT INTO summary_hourly (date, hour, {_MEASURE_COLUMNS})
+        SELECT {PARTITION_KEY}, delivery_hour_only, {_ORDER_MEASURES}
+        FROM orders
+        WHERE delivery_hour_only IS NOT NULL {{partition}}
+        GROUP BY {PARTITION_KEY}, delivery_hour_only
+    """,
+    'summary_region': f"""
+        INSERT INTO summary_region (date, region, {_MEASURE_COLUMNS})
+        SELECT {PARTITION_KEY}, region, {_ORDER_MEASURES}
+        FROM orders
+        WHERE region IS NOT NULL {{partition}}
+        GROUP BY {PARTITION_KEY}, region
+    """,
+    'summary_driver': f"""
+        INSERT INTO summary_driver (date, driver_id, {_MEASURE_COLUMNS})
+        SELECT {PARTITION_KEY}, driver_id, {_ORDER_MEASURES}
+        FROM orders
+        WHERE driver_id IS NOT NULL {{partition}}
+        GROUP BY {PARTITION_KEY}, driver_id
+    """,
+    # region sem agregação vem da linha de MIN(rowid): a primeira do cliente no dia
+    'summary_customer': f"""
+        INSERT INTO summary_customer (date, customer_id, primeira_linha, region, {_MEASURE_COLUMNS})
+        SELECT {PARTITION_KEY}, customer_id, MIN(rowid), region, {_ORDER_MEASURES}
+        FROM orders
+        WHERE customer_id IS NOT NULL {{partition}}
+        GROUP BY {PARTITION_KEY}, customer_id
+    """,
+    'summary_product': f"""
+        INSERT INTO summary_product (date, product_id, total_relatos)
+        SELECT {PARTITION_KEY}, r.product_id, COUNT(*)
+        FROM {LONG_TABLE} r
+        JOIN orders o ON o.order_id = r.order_id
+        WHERE 1 = 1 {{partition}}
+        GROUP BY {PARTITION_KEY}, r.product_id
+    """,
+    # Motorista x produto: evita a junção com orders na leitura de driver_products
+    'summary_driver_product': f"""
+        INSERT INTO summary_driver_product (date, driver_id, product_id, itens_faltantes)
+        SELECT {PARTITION_KEY}, o.driver_id, r.product_id, COUNT(*)
+        FROM {LONG_TABLE} r
+        JOIN orders o ON o.order_id = r.order_id
+        WHERE o.driver_id IS NOT NULL {{partition}}
+        GROUP BY {PARTITION_KEY}, o.driver_id, r.product_id
+    """,
+    # Grão do cubo, com as mesmas colunas de CUBE_ORDERS_SQL e CUBE_CATEGORIES_SQL
+    'summary_cube': f"""
+        INSERT INTO summary_cube (date, hour, region, {_MEASURE_COLUMNS})
+        SELECT DATE(date), delivery_hour_only, region, {_ORDER_MEASURES}
+        FROM orders
+        WHERE date IS NOT NULL {{partition}}
+        GROUP BY DATE(date), delivery_hour_only, region
+    """,
+    'summary_cube_category': f"""
+        INSERT INTO summary_cube_category (date, hour, region, category, total_relatos)
+        SELECT DATE(o.date), o.delivery_hour_only, o.region, p.category, COUNT(*)
+        FROM {LONG_TABLE} r
+        JOIN orders o ON o.order_id = r.order_id
+        LEFT JOIN products p ON p.product_id = r.product_id
+        WHERE o.date IS NOT NULL {{partition}}
+        GROUP BY DATE(o.date), o.delivery_hour_only, o.region, p.category
+    """,
+}
+
+# O intervalo [:inicio, :fim) (e date IS NULL, para NULL_DATE_PARTITION)
+# permite usar o índice de orders(date); a lista exata de partições fica
+# na tabela temporária summary_partitions.
+PARTITION_FILTER = f"""
+    AND ({{ranges}})
+    AND {PARTITION_KEY} IN (SELECT date FROM temp.summary_partitions)
+"""
+DATE_RANGE_FILTER = "date >= :inicio AND date < :fim"
+NULL_DATE_FILTER = "date IS NULL"
+
+AFFECTED_PARTITIONS_SQL = f"""
+    SELECT {PARTITION_KEY} FROM orders
+    WHERE rowid > :orders_mark
+    UNION
+    SELECT {PARTITION_KEY} FROM {LONG_TABLE} r
+    JOIN orders o ON o.order_id = r.order_id
+    WHERE r.rowid > :missing_mark
+"""
+
+# Consultas do dashboard sobre as tabelas de resumo
+SUMMARY_FRAUD_TREND_SQL = """
+    SELECT date,
+           itens_faltantes,
+           total_pedidos,
+           itens_faltantes AS casos_fraude,
+           ROUND(itens_faltantes * 100.0 / total_pedidos, 2) AS percentual_fraude
+    FROM summary_daily
+    ORDER BY date
+"""
+
+SUMMARY_FRAUD_REGION_SQL = """
+    SELECT region,
+           SUM(itens_faltantes) AS casos_fraude,
+           SUM(total_pedidos) AS total_pedidos,
+           ROUND(SUM(itens_faltantes) * 100.0 / SUM(total_pedidos), 2) AS taxa_fraude,
+           ROUND(SUM(itens_faltantes) * 100.0 / SUM(total_pedidos), 2) AS percentual_fraude,
+           SUM(itens_faltantes) AS total_itens_faltantes
+    FROM summary_region
+    GROUP BY region
+    ORDER BY region
+"""
+
+SUMMARY_MISSING_PRODUCTS_SQL = """
+    WITH contagem AS (
+        SELECT product_id, SUM(total_relatos) AS itens_faltantes
+        FROM summary_product
+        GROUP BY product_id
+        ORDER BY itens_faltantes DESC, product_id
+        LIMIT :top_products
+    )
+    SELECT c.product_id,
+           c.itens_faltantes,
+           p.product_name,
+           p.category,
+           c.itens_faltantes AS total_relatos
+    FROM contagem c
+    LEFT JOIN products p ON p.product_id = c.product_id
+    ORDER BY c.itens_faltantes DESC, c.product_id
+"""
+
+SUMMARY_MISSING_CATEGORIES_SQL = """
+    SELECT p.category,
+           SUM(s.total_relatos) AS total_relatos,
+           COUNT(DISTINCT s.product_id) AS produtos_distintos
+    FROM summary_product s
+    LEFT JOIN products p ON p.product_id = s.product_id
+    GROUP BY p.category
+    ORDER BY total_relatos DESC
+"""
+
+# Cuboides lidos das tabelas de resumo: cada partição já está no grão do cubo
+SUMMARY_CUBE_ORDERS_SQL = f"""
+    SELECT date, hour, region, {_MEASURE_COLUMNS}
+    FROM summary_cube
+"""
+
+SUMMARY_CUBE_CATEGORIES_SQL = """
+    SELECT date, hour, region, category, total_relatos
+    FROM summary_cube_category
+"""
+
+# Mesmo resultado de DRIVER_PRODUCTS_SQL (utils/aggregations.py)
+SUMMARY_DRIVER_PRODUCTS_SQL = """
+    WITH contagem AS (
+        SELECT driver_id, product_id, SUM(itens_faltantes) AS itens_faltantes
+        FROM summary_driver_product
+        GROUP BY driver_id, product_id
+    ),
+    motoristas AS (
+        SELECT driver_id, SUM(itens_faltantes) AS total_motorista
+        FROM contagem
+        GROUP BY driver_id
+        ORDER BY total_motorista DESC, driver_id
+        LIMIT :top_driver_products
+    )
+    SELECT c.driver_id,
+           d.driver_name,
+           c.product_id,
+           p.product_name,
+           p.category,
+           c.itens_faltantes
+    FROM contagem c
+    JOIN motoristas m ON m.driver_id = c.driver_id
+    LEFT JOIN drivers d ON d.driver_id = c.driver_id
+    LEFT JOIN products p ON p.product_id = c.product_id
+    ORDER BY m.total_motorista DESC, c.driver_id, c.itens_faltantes DESC, c.product_id
+"""
+
+SUMMARY_SUSPICIOUS_DRIVERS_SQL = """
+    WITH stats AS (
+        SELECT driver_id,
+               SUM(itens_faltantes) AS relatos_fraude,
+               SUM(total_pedidos) AS total_entregas,
+               ROUND(SUM(itens_faltantes) * 100.0 / SUM(total_pedidos), 2) AS taxa_fraude
+        FROM summary_driver
+        GROUP BY driver_id
+        HAVING taxa_fraude > :driver_rate_threshold
+           AND total_entregas > :driver_min_deliveries
+        ORDER BY driver_id
+        LIMIT :top_suspects
+    )
+    SELECT s.driver_id,
+           s.relatos_fraude,
+           s.total_entregas,
+           s.taxa_fraude,
+           s.taxa_fraude AS percentual_fraude,
+           d.driver_name
+    FROM stats s
+    LEFT JOIN drivers d ON d.driver_id = s.driver_id
+    ORDER BY s.driver_id
+"""
+
+SUMMARY_FRAUD_TIME_SQL = """
+    SELECT hour,
+           SUM(itens_faltantes) AS casos_fraude,
+           SUM(total_pedidos) AS total_entregas
+    FROM summary_hourly
+    GROUP BY hour
+    ORDER BY hour
+"""
+
+SUMMARY_SUSPICIOUS_CUSTOMERS_SQL = """
+    WITH stats AS (
+        SELECT customer_id,
+               SUM(itens_faltantes) AS relatos_fraude,
+               SUM(total_pedidos) AS total_pedidos,
+               MIN(primeira_linha) AS primeira_linha,
+               region,
+               ROUND(SUM(itens_faltantes) * 100.0 / SUM(total_pedidos), 2) AS taxa_fraude
+        FROM summary_customer
+        GROUP BY customer_id
+        HAVING taxa_fraude > :customer_rate_threshold
+           AND SUM(total_pedidos) > :customer_min_orders
+        ORDER BY customer_id
+        LIMIT :top_suspects
+    )
+    SELECT s.customer_id,
+           s.relatos_fraude,
+           s.total_pedidos,
+           s.region,
+           s.taxa_fraude,
+           s.taxa_fraude AS percentual_fraude,
+           c.customer_name
+    FROM stats s
+    LEFT JOIN customers c ON c.customer_id = s.customer_id
+    ORDER BY s.customer_id
+"""
+
+
+def summaries_available(conn):
+    """
+    Verifica se as tabelas de resumo existem e já foram preenchidas.
+
+    Args:
+        conn: Conexão com o banco SQLite
+
+    Returns:
+        True se as tabelas de resumo podem ser lidas (preenchidas na
+        versão SUMMARY_FORMAT)
+    """
+    if not all(table_exists(conn, table) for table in SUMMARY_TABLES + ['summary_state', LONG_TABLE]):
+        return False
+    return (
+        get_state(conn, 'orders_mark') is not None and
+        get_state(conn, 'summary_format') == str(SUMMARY_FORMAT)
+    )
+
+
+def summaries_are_current(conn):
+    """
+    Verifica se as tabelas de resumo refletem todos os pedidos e relatos.
+
+    A comparação usa apenas MAX(rowid), que o SQLite resolve sem varrer a tabela.
+
+    Args:
+        conn: Conexão com o banco SQLite
+
+    Returns:
+        True se nenhuma linha nova foi inserida desde a última atualização
+    """
+    if not summaries_available(conn) or not long_table_is_current(conn):
+        return False
+    missing_mark = get_state(conn, 'missing_products_mark')
+    return (
+        missing_mark is not None and
+        int(get_state(conn, 'orders_mark')) == max_rowid(conn, 'orders') and
+        int(missing_mark) == max_rowid(conn, LONG_TABLE)
+    )
+
+
+def find_affected_partitions(conn):
+    """
+    Lista as datas com pedidos ou relatos inseridos após a última atualização.
+
+    Args:
+        conn: Conexão com o banco SQLite
+
+    Returns:
+        Lista de datas (texto AAAA-MM-DD, ou NULL_DATE_PARTITION) ou None
+        se for necessária uma reconstrução completa (resumos vazios, em
+        outra versão de SUMMARY_FORMAT ou tabelas recriadas)
+    """
+    orders_mark = get_state(conn, 'orders_mark')
+    missing_mark = get_state(conn, 'missing_products_mark')
+    if orders_mark is None or missing_mark is None:
+        return None
+    if get_state(conn, 'summary_format') != str(SUMMARY_FORMAT):
+        return None
+
+    orders_mark, missing_mark = int(orders_mark), int(missing_mark)
+    # Se o maior rowid diminuiu, a tabela foi recriada pelo ETL
+    if max_rowid(conn, 'orders') < orders_mark or max_rowid(conn, LONG_TABLE) < missing_mark:
+        return None
+
+    rows = conn.execute(
+        AFFECTED_PARTITIONS_SQL,
+        {'orders_mark': orders_mark, 'missing_mark': missing_mark}
+    ).fetchall()
+    return sorted(row[0] for row in rows)
+
+
+def refresh_summaries(conn, full=False, dates=None):
+    """
+    Atualiza as tabelas de resumo.
+
+    Por padrão reconstrói apenas as partições afetadas por linhas novas.
+    Alterações em linhas existentes não são detectadas pelas marcas
+    d'água; nesse caso informe as datas em `dates` ou use `full=True`.
+
+    Args:
+        conn: Conexão com o banco SQLite (com permissão de escrita)
+        full: Se True, reconstrói todas as partições
+        dates: Lista opcional de datas (AAAA-MM-DD, ou NULL_DATE_PARTITION)
+               a reconstruir
+
+    Returns:
+        Lista das partições reconstruídas, ou None em uma reconstrução completa
+    """
+    migrate(conn)
+
+    # Produtos faltantes são lidos da tabela longa; uma reconstrução dela
+    # renumera os rowids e invalida as marcas d'água
+    if sync_order_missing_product(conn, full=full):
+        full = True
+
+    if not full and dates is None:
+        dates = find_affected_partitions(conn)
+        if dates is None:
+            full = True
+
+    orders_mark = max_rowid(conn, 'orders')
+    missing_mark = max_rowid(conn, LONG_TABLE)
+
+    with conn:
+        if full:
+            for table in SUMMARY_TABLES:
+                conn.execute(f"DELETE FROM {table}")
+            for sql in SUMMARY_INSERT_SQL.values():
+                conn.execute(sql.format(partition=''))
+        elif dates:
+            dates = sorted(set(dates))
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS summary_partitions (date TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.summary_partitions")
+            conn.executemany(
+                "INSERT INTO temp.summary_partitions (date) VALUES (?)",
+                [(d,) for d in dates]
+            )
+            days = [d for d in dates if d != NULL_DATE_PARTITION]
+            ranges, params = [], {}
+            if days:
+                ranges.append(DATE_RANGE_FILTER)
+                params = {
+                    'inicio': days[0],
+                    'fim': (date.fromisoformat(days[-1]) + timedelta(days=1)).isoformat()
+                }
+            if len(days) < len(dates):
+                ranges.append(NULL_DATE_FILTER)
+            partition = PARTITION_FILTER.format(ranges=' OR '.join(ranges))
+            for table in SUMMARY_TABLES:
+                conn.execute(
+                    f"DELETE FROM {table} WHERE date IN (SELECT date FROM temp.summary_partitions)"
+                )
+            for sql in SUMMARY_INSERT_SQL.values():
+                conn.execute(sql.format(partition=partition), params)
+
+        set_state(conn, 'orders_mark', orders_mark)
+        set_state(conn, 'missing_products_mark', missing_mark)
+        set_state(conn, 'summary_format', SUMMARY_FORMAT)
+        set_state(conn, 'refreshed_at', pd.Timestamp.now().isoformat())
+
+    return None if full else dates
+
+
+def build_dashboard_frames_from_summaries(conn, params=None):
+    """
+    Monta os DataFrames do dashboard lendo apenas as tabelas de resumo.
+
+    O custo é proporcional ao número de linhas de resumo, não de pedidos;
+    das tabelas base, apenas os cadastros (motoristas, produtos e clientes)
+    são lidos.
+
+    Args:
+        conn: Conexão com o banco SQLite
+        params: Dicionário opcional sobrescrevendo DEFAULT_PARAMS
+
+    Returns:
+        Dicionário com os DataFrames do dashboard
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+
+    fraud_trend = pd.read_sql_query(SUMMARY_FRAUD_TREND_SQL, conn)
+    fraud_trend['date'] = pd.to_datetime(fraud_trend['date'])
+
+    return {
+        'fraud_trend': fraud_trend,
+        'fraud_region': pd.read_sql_query(SUMMARY_FRAUD_REGION_SQL, conn),
+        'missing_products': pd.read_sql_query(SUMMARY_MISSING_PRODUCTS_SQL, conn, params=params),
+        'missing_categories': pd.read_sql_query(SUMMARY_MISSING_CATEGORIES_SQL, conn),
+        'driver_products': pd.read_sql_query(SUMMARY_DRIVER_PRODUCTS_SQL, conn, params=params),
+        'drivers': query_drivers(conn, params),
+        'suspicious_drivers': pd.read_sql_query(SUMMARY_SUSPICIOUS_DRIVERS_SQL, conn, params=params),
+        'fraud_time': pd.read_sql_query(SUMMARY_FRAUD_TIME_SQL, conn),
+        'suspicious_customers': pd.read_sql_query(SUMMARY_SUSPICIOUS_CUSTOMERS_SQL, conn, params=params)
+    }
+
+
+@timed
+def build_cube_frames_from_summaries(conn):
+    """
+    Monta os cuboides do cubo OLAP a partir de summary_cube e summary_cube_category.
+
+    Mesmo resultado de utils.cube.build_cube_frames, sem varrer orders.
+
+    Args:
+        conn: Conexão com o banco SQLite
+
+    Returns:
+        Dicionário com os DataFrames de CUBE_FRAMES
+    """
+    return compact_cube_frames(
+        pd.read_sql_query(SUMMARY_CUBE_ORDERS_SQL, conn),
+        pd.read_sql_query(SUMMARY_CUBE_CATEGORIES_SQL, conn)
+    )
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    from config.settings import DB_PATH
+
+    parser = argparse.ArgumentParser(description="Atualiza as tabelas de resumo do dashboard")
+    parser.add_argument('--db', default=DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--full', action='store_true', help="Reconstrói todas as partições")
+    parser.add_argument('--dates', nargs='+', help="Datas (AAAA-MM-DD) a reconstruir")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        rebuilt = refresh_summaries(conn, full=args.full, dates=args.dates)
+        if rebuilt is None:
+            print("Tabelas de resumo reconstruídas por completo.")
+        else:
+            print(f"Partições reconstruídas: {len(rebuilt)}")
+        for table in SUMMARY_TABLES:
+            total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            print(f"  {table}: {total} linhas")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+"""
+Gerador de dados sintéticos em escala para testes de carga e benchmarks.
+
+Produz as tabelas do banco walmart_fraudes.db (orders, drivers, customers,
+products e missing_items) com o mesmo esquema do ETL, em qualquer escala
+(de dezenas de milhares a dezenas de milhões de pedidos). Os pedidos são
+gerados em blocos com operações vetorizadas do numpy a partir de um
+np.random.Generator com semente, então a mesma semente e a mesma escala
+produzem sempre os mesmos dados, e a memória fica limitada pelo bloco.
+
+Padrões de fraude injetados (itens faltantes):
+- uma fração dos motoristas (FRAUD_DRIVER_SHARE) com alta taxa de pedidos
+  com falta e preferência por produtos caros (Electronics);
+- uma fração dos clientes (FRAUD_CUSTOMER_SHARE) que reclamam com frequência;
+- taxa maior à noite (NIGHT_HOURS) e em uma região (HOTSPOT_REGION).
+
+Saídas:
+- banco SQLite, com inserção em lote dentro de uma transação por bloco;
+- pasta Parquet no formato lido pelo backend DuckDB (utils/backends.py):
+  orders com rowid, dimensões e a tabela longa order_missing_product.
+
+Uso pela linha de comando (a partir da pasta Dashboard):
+    python -m utils.synthetic --orders 1000000 --db ../Database/sintetico.db --migrate
+    python -m utils.synthetic --orders 50000000 --parquet ../Database/parquet_sintetico
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.ingestion import ETL_DAY_PERIODS, period_of_day
+from utils.normalization import LONG_TABLE, melt_missing_items
+
+REGIONS = ['Altamonte Springs', 'Apopka', 'Clermont', 'Kissimmee', 'Orlando', 'Sanford', 'Winter Park']
+
+# Categoria: (participação no catálogo, preço mediano, peso como item faltante)
+CATEGORIES = {
+    'Supermarket': (0.36, 8.0, 1.0),
+    'Electronics': (0.10, 180.0, 4.0),
+    'Bakery': (0.07, 5.0, 0.6),
+    'Beverages': (0.05, 4.0, 0.8),
+    'Dairy': (0.06, 5.0, 0.7),
+    'Frozen': (0.06, 7.0, 0.7),
+    'Household': (0.07, 10.0, 1.0),
+    'Pantry': (0.06, 6.0, 0.8),
+    'Personal Care': (0.04, 12.0, 1.5),
+    'Produce': (0.06, 3.0, 0.5),
+    'Snacks': (0.07, 4.0, 1.2),
+}
+
+PRODUCT_WORDS = {
+    'Supermarket': ['Cereal', 'Bacon', 'Whole Milk', 'Rice', 'Pasta', 'Coffee'],
+    'Electronics': ['Headphones', 'Tablet', 'Smartwatch', 'Speaker', 'Charger', 'Camera'],
+    'Bakery': ['Bread', 'Bagels', 'Muffins', 'Croissants'],
+    'Beverages': ['Orange Juice', 'Soda', 'Sparkling Water', 'Iced Tea'],
+    'Dairy': ['Yogurt', 'Cheddar', 'Butter', 'Cream Cheese'],
+    'Frozen': ['Pizza', 'Ice Cream', 'Vegetables', 'Waffles'],
+    'Household': ['Detergent', 'Paper Towels', 'Trash Bags', 'Sponges'],
+    'Pantry': ['Olive Oil', 'Flour', 'Peanut Butter', 'Canned Beans'],
+    'Personal Care': ['Shampoo', 'Toothpaste', 'Razor', 'Body Lotion'],
+    'Produce': ['Bananas', 'Apples', 'Avocados', 'Tomatoes'],
+    'Snacks': ['Chips', 'Cookies', 'Granola Bars', 'Popcorn'],
+}
+PRODUCT_BRANDS = ['Great Value', 'Marketside', 'Equate', 'Mainstays', 'Onn', 'Freshness Guaranteed',
+                  'Sam\'s Choice', 'Parent\'s Choice']
+
+FIRST_NAMES = ['James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda',
+               'David', 'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica',
+               'Thomas', 'Sarah', 'Carlos', 'Karen', 'Daniel', 'Lisa', 'Matthew', 'Nancy']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+              'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas',
+              'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Perez', 'Thompson', 'White', 'Harris']
+
+# Distribuição das entregas por hora (pico no fim da tarde e à noite)
+HOUR_WEIGHTS = np.array([
+    2.0, 1.2, 0.8, 0.6, 0.6, 1.5, 3.0, 4.5, 5.5, 5.5, 5.5, 5.0,
+    4.5, 4.5, 4.0, 4.0, 4.5, 5.5, 6.5, 7.0, 7.0, 6.0, 4.5, 3.0,
+])
+
+# Padrões de fraude
+BASE_MISSING_RATE = 0.11
+NIGHT_HOURS = [21, 22, 23, 0, 1, 2, 3, 4]
+NIGHT_FACTOR = 1.6
+HOTSPOT_REGION = 'Kissimmee'
+HOTSPOT_FACTOR = 1.4
+FRAUD_DRIVER_SHARE = 0.03
+FRAUD_DRIVER_RATE = 0.55
+FRAUD_CUSTOMER_SHARE = 0.02
+FRAUD_CUSTOMER_RATE = 0.45
+# Quantidade de itens faltantes (1, 2 ou 3) em um pedido com falta
+MISSING_COUNT_WEIGHTS = [0.9, 0.09, 0.01]
+
+# Esquema das tabelas, igual ao criado pelo ETL (pandas.to_sql)
+TABLE_COLUMNS = {
+    'orders': [('date', 'TIMESTAMP'), ('order_id', 'TEXT'), ('order_amount', 'REAL'),
+               ('region', 'TEXT'), ('items_delivered', 'INTEGER'), ('items_missing', 'INTEGER'),
+               ('delivery_hour', 'TEXT'), ('driver_id', 'TEXT'), ('customer_id', 'TEXT'),
+               ('delivery_hour_only', 'INTEGER'), ('delivery_minute', 'INTEGER'),
+               ('delivery_second', 'INTEGER'), ('period_of_day', 'TEXT')],
+    'drivers': [('driver_id', 'TEXT'), ('driver_name', 'TEXT'), ('age', 'INTEGER'), ('Trips', 'INTEGER')],
+    'customers': [('customer_id', 'TEXT'), ('customer_name', 'TEXT'), ('customer_age', 'INTEGER')],
+    'missing_items': [('order_id', 'TEXT'), ('product_id_1', 'TEXT'), ('product_id_2', 'TEXT'),
+                      ('product_id_3', 'TEXT')],
+    'products': [('product_id', 'TEXT'), ('product_name', 'TEXT'), ('category', 'TEXT'), ('price', 'REAL')],
+}
+
+_HEX = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+
+def _ids(prefix, start, count, width):
+    """Identificadores sequenciais com prefixo (ex.: WDID09873)."""
+    numbers = pd.Series(np.arange(start, start + count)).astype(str).str.zfill(width)
+    return (prefix + numbers).to_numpy(dtype=object)
+
+
+def _names(rng, count):
+    """Nomes completos a partir de listas de nomes e sobrenomes."""
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), count)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), count)]
+    return first + ' ' + last
+
+
+def _uuids(rng, count):
+    """
+    Identificadores no formato UUID4, gerados sem laço em Python.
+
+    Os 16 bytes aleatórios de cada linha viram 32 dígitos hexadecimais por
+    tabela de consulta; os hífens são inseridos nas posições do UUID.
+    """
+    raw = rng.integers(0, 256, size=(count, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    digits = np.empty((count, 32), dtype=np.uint8)
+    digits[:, 0::2] = _HEX[raw >> 4]
+    digits[:, 1::2] = _HEX[raw & 0x0F]
+    text = np.full((count, 36), ord('-'), dtype=np.uint8)
+    for start, end, offset in ((0, 8, 0), (8, 12, 1), (12, 16, 2), (16, 20, 3), (20, 32, 4)):
+        text[:, start + offset:end + offset] = digits[:, start:end]
+    return text.view('S36').ravel().astype('U36').astype(object)
+
+
+def _activity_weights(rng, count):
+    """Pesos de atividade heterogêneos (alguns muito ativos, muitos pouco ativos)."""
+    weights = rng.gamma(shape=1.5, scale=1.0, size=count)
+    return weights / weights.sum()
+
+
+class SyntheticDataset:
+    """
+    Dimensões e parâmetros de uma base sintética.
+
+    As dimensões (motoristas, clientes e produtos) são geradas na criação;
+    os pedidos são gerados sob demanda, bloco a bloco, por order_chunks().
+    """
+
+    def __init__(self, orders, seed=42, start_date='2023-01-01', days=365,
+                 drivers=None, customers=None, products=None):
+        """
+        Args:
+            orders: Quantidade total de pedidos
+            seed: Semente do gerador
+            start_date: Data do primeiro dia
+            days: Quantidade de dias cobertos pelos pedidos
+            drivers: Quantidade de motoristas (padrão: 1 para cada 8 pedidos)
+            customers: Quantidade de clientes (padrão: 1 para cada 8 pedidos)
+            products: Quantidade de produtos (padrão: 314, como a base real)
+        """
+        self.orders = int(orders)
+        self.seed = seed
+        self.days = int(days)
+        self.dates = pd.date_range(start_date, periods=self.days, freq='D')
+        rng = np.random.default_rng(seed)
+
+        n_drivers = drivers or max(50, self.orders // 8)
+        n_customers = customers or max(50, self.orders // 8)
+        n_products = products or 314
+
+        self.drivers = pd.DataFrame({
+            'driver_id': _ids('WDID', 9873, n_drivers, 5),
+            'driver_name': _names(rng, n_drivers),
+            'age': rng.integers(18, 66, n_drivers),
+            'Trips': rng.integers(10, 120, n_drivers),
+        })
+        self.customers = pd.DataFrame({
+            'customer_id': _ids('WCID', 5000, n_customers, 4),
+            'customer_name': _names(rng, n_customers),
+            'customer_age': rng.integers(18, 80, n_customers),
+        })
+
+        names = list(CATEGORIES)
+        share = np.array([CATEGORIES[name][0] for name in names])
+        category_codes = rng.choice(len(names), n_products, p=share / share.sum())
+        categories = np.array(names, dtype=object)[category_codes]
+        median_price = np.array([CATEGORIES[name][1] for name in names])[category_codes]
+        brands = np.array(PRODUCT_BRANDS, dtype=object)[rng.integers(0, len(PRODUCT_BRANDS), n_products)]
+        nouns = np.array([
+            rng.choice(PRODUCT_WORDS[names[code]]) for code in category_codes
+        ], dtype=object)
+        self.products = pd.DataFrame({
+            'product_id': _ids('PWPX', 982761090982, n_products, 13),
+            'product_name': brands + ' ' + nouns,
+            'category': categories,
+            'price': np.round(median_price * rng.lognormal(0.0, 0.35, n_products), 2),
+        })
+
+        # Pesos de escolha e marcação dos fraudadores
+        self._driver_weights = _activity_weights(rng, n_drivers)
+        self._customer_weights = _activity_weights(rng, n_customers)
+        self.fraud_drivers = rng.random(n_drivers) < FRAUD_DRIVER_SHARE
+        self.fraud_customers = rng.random(n_customers) < FRAUD_CUSTOMER_SHARE
+
+        target = np.array([CATEGORIES[name][2] for name in names])[category_codes]
+        self._product_weights = target / target.sum()
+        # Motoristas fraudadores preferem produtos caros
+        expensive = target * np.sqrt(self.products['price'].to_numpy())
+        self._fraud_product_weights = expensive / expensive.sum()
+
+        self._times = self._time_strings()
+        self._periods = period_of_day(np.arange(24), ETL_DAY_PERIODS).astype(object).to_numpy()
+        self._date_text = self.dates.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+
+    @staticmethod
+    def _time_strings():
+        """Textos 'H:MM:SS' de todos os segundos do dia, indexados por segundo."""
+        seconds = np.arange(24 * 3600)
+        hours = pd.Series(seconds // 3600).astype(str)
+        minutes = pd.Series(seconds // 60 % 60).astype(str).str.zfill(2)
+        secs = pd.Series(seconds % 60).astype(str).str.zfill(2)
+        return (hours + ':' + minutes + ':' + secs).to_numpy(dtype=object)
+
+    def order_chunks(self, chunk_size=1_000_000):
+        """
+        Gera os pedidos em blocos, em ordem de data.
+
+        Cada bloco usa um gerador próprio derivado da semente e do número
+        do bloco: com a mesma semente e o mesmo chunk_size, os pedidos são
+        os mesmos em qualquer saída (SQLite ou Parquet).
+
+        Args:
+            chunk_size: Quantidade de pedidos por bloco
+
+        Yields:
+            Tupla (orders, missing_items) com os DataFrames do bloco
+        """
+        for block, start in enumerate(range(0, self.orders, chunk_size)):
+            count = min(chunk_size, self.orders - start)
+            rng = np.random.default_rng([self.seed, block])
+            yield self._order_block(rng, start, count)
+
+    def _order_block(self, rng, start, count):
+        """Gera um bloco de pedidos e os itens faltantes correspondentes."""
+        # Dias em ordem crescente ao longo de toda a base
+        position = np.arange(start, start + count) + rng.random(count)
+        day = np.minimum((position * self.days / self.orders).astype(np.int64), self.days - 1)
+
+        hour = rng.choice(24, count, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+        minute = rng.integers(0, 60, count)
+        second = rng.integers(0, 60, count)
+        region = rng.integers(0, len(REGIONS), count)
+        driver = rng.choice(len(self.drivers), count, p=self._driver_weights)
+        customer = rng.choice(len(self.customers), count, p=self._customer_weights)
+
+        # Probabilidade de itens faltantes com os padrões de fraude
+        rate = np.full(count, BASE_MISSING_RATE)
+        rate[np.isin(hour, NIGHT_HOURS)] *= NIGHT_FACTOR
+        rate[region == REGIONS.index(HOTSPOT_REGION)] *= HOTSPOT_FACTOR
+        fraud_driver = self.fraud_drivers[driver]
+        rate = np.where(fraud_driver, np.maximum(rate, FRAUD_DRIVER_RATE), rate)
+        rate = np.where(self.fraud_customers[customer], np.maximum(rate, FRAUD_CUSTOMER_RATE), rate)
+        has_missing = rng.random(count) < rate
+
+        items_missing = np.where(has_missing, rng.choice([1, 2, 3], count, p=MISSING_COUNT_WEIGHTS), 0)
+        items_delivered = np.maximum(rng.poisson(10, count) - items_missing // 2, 1)
+        amount = (items_delivered + items_missing) * rng.lognormal(np.log(45), 0.6, count)
+
+        orders = pd.DataFrame({
+            'date': self._date_text[day],
+            'order_id': _uuids(rng, count),
+            'order_amount': np.round(amount, 2),
+            'region': np.array(REGIONS, dtype=object)[region],
+            'items_delivered': items_delivered,
+            'items_missing': items_missing,
+            'delivery_hour': self._times[hour * 3600 + minute * 60 + second],
+            'driver_id': self.drivers['driver_id'].to_numpy()[driver],
+            'customer_id': self.customers['customer_id'].to_numpy()[customer],
+            'delivery_hour_only': hour,
+            'delivery_minute': minute,
+            'delivery_second': second,
+            'period_of_day': self._periods[hour],
+        })
+
+        # Um registro por pedido com falta; product_id_N preenchido até items_missing
+        rows = np.flatnonzero(has_missing)
+        product_ids = self.products['product_id'].to_numpy()
+        missing = {'order_id': orders['order_id'].to_numpy()[rows]}
+        for slot in range(1, 4):
+            normal = rng.choice(len(product_ids), len(rows), p=self._product_weights)
+            targeted = rng.choice(len(product_ids), len(rows), p=self._fraud_product_weights)
+            chosen = product_ids[np.where(fraud_driver[rows], targeted, normal)]
+            missing[f'product_id_{slot}'] = np.where(items_missing[rows] >= slot, chosen, None)
+        return orders, pd.DataFrame(missing)
+
+
+def _create_tables(conn):
+    """Recria as tabelas com o esquema do ETL."""
+    for table, columns in TABLE_COLUMNS.items():
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        definition = ",\n  ".join(f'"{name}" {sql_type}' for name, sql_type in columns)
+        conn.execute(f'CREATE TABLE "{table}" (\n{definition}\n)')
+
+
+def _insert(conn, table, df):
+    """Insere um DataFrame em lote (executemany) na tabela."""
+    columns = [name for name, _ in TABLE_COLUMNS[table]]
+    placeholders = ", ".join("?" for _ in columns)
+    values = df[columns].astype(object).where(df[columns].notna(), None)
+    conn.executemany(f'INSERT INTO "{table}" VALUES ({placeholders})', values.itertuples(index=False, name=None))
+
+
+def write_sqlite(dataset, db_path, chunk_size=1_000_000, progress=None):
+    """
+    Grava a base sintética em um banco SQLite (tabelas recriadas).
+
+    Args:
+        dataset: SyntheticDataset
+        db_path: Caminho do banco
+        chunk_size: Pedidos por bloco (uma transação por bloco)
+        progress: Função opcional chamada com a quantidade de pedidos gravados
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        # Carga em lote: sem journal e sem fsync (o arquivo é recriado em caso de falha)
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        with conn:
+            _create_tables(conn)
+            for table in ('drivers', 'customers', 'products'):
+                _insert(conn, table, getattr(dataset, table))
+        written = 0
+        for orders, missing in dataset.order_chunks(chunk_size):
+            with conn:
+                _insert(conn, 'orders', orders)
+                _insert(conn, 'missing_items', missing)
+            written += len(orders)
+            if progress:
+                progress(written)
+    finally:
+        conn.close()
+
+
+def _arrow_table(df, table):
+    """Converte um bloco para Arrow com tipos estáveis entre blocos."""
+    schema = {
+        'TEXT': pa.string(), 'INTEGER': pa.int64(), 'REAL': pa.float64(), 'TIMESTAMP': pa.timestamp('us'),
+    }
+    fields = [pa.field(name, schema[sql_type]) for name, sql_type in TABLE_COLUMNS[table]]
+    arrays = []
+    for field in fields:
+        values = df[field.name]
+        if pa.types.is_timestamp(field.type):
+            values = pd.to_datetime(values)
+        arrays.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_parquet(dataset, out_dir, chunk_size=1_000_000, progress=None):
+    """
+    Grava a base sintética em Parquet, no formato do backend DuckDB.
+
+    orders leva a coluna rowid (ordem de gravação) e os itens faltantes são
+    gravados na tabela longa (order_id, product_id, position), como em
+    'python -m utils.backends --export-parquet'.
+
+    Args:
+        dataset: SyntheticDataset
+        out_dir: Pasta de destino
+        chunk_size: Pedidos por bloco (um row group por bloco)
+        progress: Função opcional chamada com a quantidade de pedidos gravados
+
+    Returns:
+        Lista de arquivos gravados
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    written_files = []
+    for table in ('drivers', 'customers', 'products'):
+        path = os.path.join(out_dir, f"{table}.parquet")
+        pq.write_table(_arrow_table(getattr(dataset, table), table), path)
+        written_files.append(path)
+
+    orders_path = os.path.join(out_dir, "orders.parquet")
+    long_path = os.path.join(out_dir, f"{LONG_TABLE}.parquet")
+    orders_writer = long_writer = None
+    written = 0
+    try:
+        for orders, missing in dataset.order_chunks(chunk_size):
+            table = _arrow_table(orders, 'orders')
+            rowid = pa.array(np.arange(written + 1, written + len(orders) + 1), type=pa.int64())
+            table = table.add_column(0, 'rowid', rowid)
+            long = pa.Table.from_pandas(melt_missing_items(missing), preserve_index=False)
+            long = long.cast(pa.schema([('order_id', pa.string()), ('product_id', pa.string()),
+                                        ('position', pa.int64())]))
+            if orders_writer is None:
+                orders_writer = pq.ParquetWriter(orders_path, table.schema)
+                long_writer = pq.ParquetWriter(long_path, long.schema)
+            orders_writer.write_table(table)
+            long_writer.write_table(long)
+            written += len(orders)
+            if progress:
+                progress(written)
+    finally:
+        for writer in (orders_writer, long_writer):
+            if writer is not None:
+                writer.close()
+    return written_files + [orders_path, long_path]
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos para testes de carga")
+    parser.add_argument('--orders', type=int, default=100_000, help="Quantidade de pedidos")
+    parser.add_argument('--seed', type=int, default=42, help="Semente do gerador")
+    parser.add_argument('--days', type=int, default=365, help="Dias cobertos pelos pedidos")
+    parser.add_argument('--start-date', default='2023-01-01', help="Primeiro dia (AAAA-MM-DD)")
+    parser.add_argument('--drivers', type=int, help="Quantidade de motoristas (padrão: pedidos/8)")
+    parser.add_argument('--customers', type=int, help="Quantidade de clientes (padrão: pedidos/8)")
+    parser.add_argument('--products', type=int, help="Quantidade de produtos (padrão: 314)")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help="Pedidos por bloco")
+    parser.add_argument('--db', help="Banco SQLite de destino (tabelas recriadas)")
+    parser.add_argument('--parquet', metavar='PASTA', help="Pasta Parquet de destino")
+    parser.add_argument('--migrate', action='store_true',
+                        help="Aplica as migrações de utils/schema.py no banco gerado")
+    args = parser.parse_args(argv)
+
+    if not args.db and not args.parquet:
+        parser.error("informe --db e/ou --parquet")
+
+    start = time.perf_counter()
+    dataset = SyntheticDataset(
+        args.orders, seed=args.seed, start_date=args.start_date, days=args.days,
+        drivers=args.drivers, customers=args.customers, products=args.products
+    )
+    print(f"Dimensões: {len(dataset.drivers):,} motoristas "
+          f"({int(dataset.fraud_drivers.sum()):,} fraudadores), "
+          f"{len(dataset.customers):,} clientes, {len(dataset.products):,} produtos")
+
+    def reporter():
+        phase_start = time.perf_counter()
+
+        def progress(written):
+            elapsed = time.perf_counter() - phase_start
+            print(f"  {written:,} pedidos ({written / elapsed:,.0f} pedidos/s)", flush=True)
+        return progress
+
+    if args.db:
+        write_sqlite(dataset, args.db, args.chunk_size, reporter())
+        if args.migrate:
+            from utils.schema import analyze, migrate
+            conn = sqlite3.connect(args.db)
+            try:
+                migrate(conn, rebuild=True)
+                analyze(conn)
+            finally:
+                conn.close()
+        print(f"Banco gravado: {args.db}")
+    if args.parquet:
+        for path in write_parquet(dataset, args.parquet, args.chunk_size, reporter()):
+            print(f"Gravado: {path}")
+    print(f"Tempo total: {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Aquecimento dos caches do dashboard na partida do servidor.
+
+O primeiro visitante após uma implantação ou reinício pagaria pela carga
+dos dados (carregar_dados), pelas funções prepare_* de utils/loaders.py,
+pela clusterização (K-Means) e pela montagem das figuras. O aquecimento
+carrega os dados pelo RefreshManager e executa cada página de pages.PAGES
+uma vez, no estado padrão dos filtros, em um pool de threads. Fora de uma
+sessão os comandos de exibição do Streamlit são descartados, mas os
+cálculos acontecem e preenchem os caches compartilhados (st.cache_data,
+cache de figuras de utils/figure_cache.py e snapshot Arrow dos dados).
+
+No servidor, start_warmup é chamado por app.py na primeira execução do
+script e roda em segundo plano. Pela linha de comando (a partir da pasta
+Dashboard), grava o snapshot Arrow usado na partida e mostra os tempos:
+    python -m utils.warmup
+"""
+import argparse
+import importlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from config.settings import WARMUP_ENABLED, WARMUP_WORKERS
+from pages import PAGES
+from utils.refresh import session_view
+
+# Prefixo do nome das threads do aquecimento
+WARMUP_THREAD_PREFIX = 'dashboard-warmup'
+
+
+class _WarmupThreadFilter(logging.Filter):
+    """Descarta o aviso de 'missing ScriptRunContext' das threads do aquecimento."""
+
+    def filter(self, record):
+        return not threading.current_thread().name.startswith(WARMUP_THREAD_PREFIX)
+
+
+logging.getLogger('streamlit.runtime.scriptrunner.script_run_context').addFilter(_WarmupThreadFilter())
+
+
+def _timed(func, *args):
+    """Executa a função e retorna (resultado, segundos)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def warm_page(module_name, data):
+    """
+    Executa uma página com os dados padrão, sem sessão.
+
+    Args:
+        module_name: Módulo da página em pages/
+        data: Dicionário de dados compartilhado
+    """
+    page = importlib.import_module(f"pages.{module_name}")
+    page.show(session_view(data))
+
+
+def warm_caches(manager, max_workers=WARMUP_WORKERS):
+    """
+    Carrega os dados e executa todas as páginas para preencher os caches.
+
+    Args:
+        manager: RefreshManager dos dados do dashboard
+        max_workers: Threads usadas para as páginas
+
+    Returns:
+        Lista de tuplas (etapa, segundos, erro ou None), na ordem de pages.PAGES
+    """
+    report = []
+    try:
+        data, elapsed = _timed(manager.current)
+    except Exception as e:
+        return [("Dados", 0.0, str(e))]
+    if not data:
+        return [("Dados", elapsed, "carga sem resultado")]
+    report.append(("Dados", elapsed, None))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=WARMUP_THREAD_PREFIX) as pool:
+        futures = [
+            (label, pool.submit(_timed, warm_page, module_name, data))
+            for label, module_name, _ in PAGES
+        ]
+        for label, future in futures:
+            try:
+                _, elapsed = future.result()
+                report.append((label, elapsed, None))
+            except Exception as e:
+                report.append((label, 0.0, str(e)))
+    return report
+
+
+def format_report(report, total):
+    """
+    Formata os tempos do aquecimento.
+
+    Args:
+        report: Resultado de warm_caches
+        total: Duração total em segundos
+
+    Returns:
+        Texto com uma linha por etapa
+    """
+    lines = ["Aquecimento dos caches do dashboard:"]
+    for step, elapsed, error in report:
+        status = f"ERRO: {error}" if error else f"{elapsed * 1000:8.0f} ms"
+        lines.append(f"  {step:<26}{status}")
+    lines.append(f"  {'Total':<26}{total * 1000:8.0f} ms")
+    return "\n".join(lines)
+
+
+def _run_warmup(manager, max_workers):
+    """Executa o aquecimento e mostra os tempos na saída do servidor."""
+    report, total = _timed(warm_caches, manager, max_workers)
+    print(format_report(report, total), flush=True)
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup(_manager, max_workers=WARMUP_WORKERS):
+    """
+    Inicia o aquecimento em segundo plano (uma vez por processo do servidor).
+
+    Args:
+        _manager: RefreshManager dos dados (não entra na chave do cache)
+        max_workers: Threads usadas para as páginas
+
+    Returns:
+        Thread do aquecimento, ou None se desativado em WARMUP_ENABLED
+    """
+    if not WARMUP_ENABLED:
+        return None
+    thread = threading.Thread(
+        target=_run_warmup,
+        args=(_manager, max_workers),
+        name=f"{WARMUP_THREAD_PREFIX}-main",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Aquece os caches do dashboard")
+    parser.add_argument('--workers', type=int, default=WARMUP_WORKERS,
+                        help="Threads usadas para as páginas")
+    args = parser.parse_args(argv)
+
+    # Fora de 'streamlit run' o Streamlit avisa a cada chamada em cache
+    logging.disable(logging.WARNING)
+
+    # O carregamento dos dados é definido em app.py
+    import app
+
+    report, total = _timed(warm_caches, app.get_data_manager(), args.workers)
+    print(format_report(report, total))
+
+
+if __name__ == "__main__":
+    main()